@@ -0,0 +1,55 @@
+from pathlib import Path
+
+import geopandas as gpd
+import pandas as pd
+from shapely.geometry import mapping
+
+
+RTC_S1_TS_DIR = Path(__file__).parents[1] / 'tests' / 'data' / 'rtc_s1_ts_metadata'
+RTC_S1_TS_STACKS = sorted(path.stem for path in RTC_S1_TS_DIR.glob('*.parquet'))
+
+
+def read_rtc_s1_ts(stack: str) -> gpd.GeoDataFrame:
+    df_rtc_ts = gpd.read_parquet(RTC_S1_TS_DIR / f'{stack}.parquet')
+    return df_rtc_ts.drop_duplicates(subset=['opera_id', 'mgrs_tile_id']).reset_index(drop=True)
+
+
+def scale_rtc_s1_ts(df_rtc_ts: gpd.GeoDataFrame, factor: int) -> gpd.GeoDataFrame:
+    """Make a stack `factor` times larger with copies of the MGRS tiles (e.g. 11SLT -> 11SLT_0, 11SLT_1, ...)."""
+    if factor == 1:
+        return df_rtc_ts
+    dfs = []
+    for k in range(factor):
+        df_copy = df_rtc_ts.copy()
+        df_copy['mgrs_tile_id'] = df_copy['mgrs_tile_id'] + f'_{k}'
+        dfs.append(df_copy)
+    return pd.concat(dfs, axis=0).reset_index(drop=True)
+
+
+class FakeASFProduct:
+    def __init__(self, properties: dict, geometry: dict) -> None:
+        self.properties = properties
+        self.geometry = geometry
+
+    def geojson(self) -> dict:
+        """Return the product as a GeoJSON feature."""
+        return {'type': 'Feature', 'geometry': self.geometry, 'properties': self.properties}
+
+
+def get_fake_asf_products(df_rtc_ts: gpd.GeoDataFrame) -> list[FakeASFProduct]:
+    """Record the search response that would have produced the RTC-S1 rows."""
+    df_rtc_ts = df_rtc_ts.drop_duplicates(subset=['opera_id']).reset_index(drop=True)
+    return [
+        FakeASFProduct(
+            {
+                'sceneName': row.opera_id,
+                'startTime': row.acq_dt.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'pathNumber': row.track_number,
+                'polarization': row.polarizations.split('+'),
+                'url': row.url_copol,
+                'additionalUrls': [row.url_crosspol, row.url_copol.replace('.tif', '.h5')],
+            },
+            mapping(row.geometry),
+        )
+        for row in df_rtc_ts.itertuples()
+    ]
@@ -0,0 +1,52 @@
+import sys
+import tracemalloc
+from collections.abc import Callable, Generator
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+
+# The local HTTP stand-in for the ASF datapool (`file_server.FileServer`) is shared with the tests
+sys.path.append(str(Path(__file__).parents[1] / 'tests'))
+
+from file_server import FileServer  # noqa: E402
+
+
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    # Benchmarks are excluded from the test runs with `-m 'not benchmarks'`
+    benchmarks_dir = Path(__file__).parent
+    for item in items:
+        if benchmarks_dir in Path(item.fspath).parents:
+            item.add_marker(pytest.mark.benchmarks)
+
+
+@pytest.fixture
+def benchmark_with_memory(benchmark: BenchmarkFixture) -> Callable:
+    """Benchmark a function and record its peak memory.
+
+    The peak of the memory allocated through Python (which includes numpy arrays) during one call is measured with
+    `tracemalloc` and stored as `peak_memory_mib` in the `extra_info` of the benchmark (saved with
+    `--benchmark-autosave` or `--benchmark-json`). Slow functions can be run a fixed number of `rounds` instead of a
+    calibrated number.
+    """
+
+    def run(fn: Callable, *args: object, rounds: int | None = None, **kwargs: object) -> object:
+        tracemalloc.start()
+        try:
+            fn(*args, **kwargs)
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info['peak_memory_mib'] = round(peak_memory / 2**20, 2)
+        if rounds is not None:
+            return benchmark.pedantic(fn, args=args, kwargs=kwargs, rounds=rounds, iterations=1)
+        return benchmark(fn, *args, **kwargs)
+
+    return run
+
+
+@pytest.fixture
+def file_server() -> Generator[FileServer, None, None]:
+    with FileServer() as server:
+        yield server
@@ -0,0 +1,65 @@
+from collections.abc import Callable
+from pathlib import Path
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+from asf_search import ASFSearchResults
+from bench_data import RTC_S1_TS_STACKS, get_fake_asf_products, read_rtc_s1_ts
+from pytest_mock import MockerFixture
+
+from dist_s1_enumerator.asf import append_pass_data, get_rtc_s1_ts_metadata_by_burst_ids
+from dist_s1_enumerator.search_backends import FakeSearchBackend, ParquetDatasetBackend
+from dist_s1_enumerator.tabular_models import rtc_s1_resp_schema
+
+
+@pytest.mark.parametrize('stack', RTC_S1_TS_STACKS)
+def test_bench_append_pass_data(benchmark_with_memory: Callable, stack: str) -> None:
+    df_rtc_ts = read_rtc_s1_ts(stack)
+    mgrs_tile_ids = df_rtc_ts.mgrs_tile_id.unique().tolist()
+    df_resp = df_rtc_ts.drop_duplicates(subset=['opera_id'])[list(rtc_s1_resp_schema.columns.keys())]
+    df_rtc = benchmark_with_memory(append_pass_data, df_resp, mgrs_tile_ids)
+    assert not df_rtc.empty
+
+
+def test_bench_parse_rtc_s1_search_response(benchmark_with_memory: Callable, mocker: MockerFixture) -> None:
+    # A single search returning the (recorded) products of all the bundled stacks
+    df_rtc_ts = pd.concat([read_rtc_s1_ts(stack) for stack in RTC_S1_TS_STACKS], axis=0)
+    resp = ASFSearchResults(get_fake_asf_products(df_rtc_ts))
+    resp.searchComplete = True
+    mocker.patch('dist_s1_enumerator.asf.asf.geo_search', return_value=resp)
+    burst_ids = df_rtc_ts.jpl_burst_id.unique().tolist()
+
+    df_rtc = benchmark_with_memory(get_rtc_s1_ts_metadata_by_burst_ids, burst_ids, max_bursts_per_search=None)
+    assert df_rtc.shape[0] == len(resp)
+
+
+@pytest.mark.parametrize('max_workers', [1, 4, 16])
+def test_bench_chunked_searches_with_latency(benchmark_with_memory: Callable, max_workers: int) -> None:
+    # 50 ms per search and 10 ms per page of 250 results as a stand-in for the ASF API
+    df_rtc_ts = pd.concat([read_rtc_s1_ts(stack) for stack in RTC_S1_TS_STACKS], axis=0)
+    backend = FakeSearchBackend(df_rtc_ts, latency_seconds=0.05, page_latency_seconds=0.01)
+    burst_ids = df_rtc_ts.jpl_burst_id.unique().tolist()
+
+    df_rtc = benchmark_with_memory(
+        get_rtc_s1_ts_metadata_by_burst_ids,
+        burst_ids,
+        max_bursts_per_search=10,
+        max_workers=max_workers,
+        backend=backend,
+        rounds=3,
+    )
+    assert df_rtc.shape[0] == df_rtc_ts.opera_id.nunique()
+
+
+def test_bench_read_parquet_dataset(benchmark_with_memory: Callable, tmp_path: Path) -> None:
+    # All the bundled stacks in a dataset partitioned by track number
+    df_rtc_ts = pd.concat([read_rtc_s1_ts(stack) for stack in RTC_S1_TS_STACKS], axis=0)
+    df_resp = df_rtc_ts.drop_duplicates(subset=['opera_id'])[list(rtc_s1_resp_schema.columns.keys())]
+    df_resp.sort_values(by=['jpl_burst_id', 'acq_dt']).to_parquet(tmp_path / 'rtc_s1.parquet')
+    pq.write_to_dataset(pq.read_table(tmp_path / 'rtc_s1.parquet'), tmp_path / 'dataset', ['track_number'])
+    backend = ParquetDatasetBackend(tmp_path / 'dataset')
+    burst_ids = df_rtc_ts.jpl_burst_id.unique().tolist()
+
+    df_rtc = benchmark_with_memory(get_rtc_s1_ts_metadata_by_burst_ids, burst_ids, backend=backend)
+    assert df_rtc.shape[0] == df_resp.shape[0]
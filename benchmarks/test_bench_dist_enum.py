@@ -0,0 +1,24 @@
+from collections.abc import Callable
+
+import pytest
+from bench_data import RTC_S1_TS_STACKS, read_rtc_s1_ts, scale_rtc_s1_ts
+
+from dist_s1_enumerator.dist_enum import enumerate_dist_s1_products
+
+
+@pytest.mark.parametrize('stack', RTC_S1_TS_STACKS)
+def test_bench_enumerate_dist_s1_products(benchmark_with_memory: Callable, stack: str) -> None:
+    df_rtc_ts = read_rtc_s1_ts(stack)
+    mgrs_tile_ids = df_rtc_ts.mgrs_tile_id.unique().tolist()
+    df_products = benchmark_with_memory(enumerate_dist_s1_products, df_rtc_ts, mgrs_tile_ids, tqdm_enabled=False)
+    assert not df_products.empty
+
+
+@pytest.mark.parametrize('factor', [10, 100])
+def test_bench_enumerate_dist_s1_products_scaled(benchmark_with_memory: Callable, factor: int) -> None:
+    df_rtc_ts = scale_rtc_s1_ts(read_rtc_s1_ts('mgrs11SLT_11SLU_11SMT'), factor)
+    mgrs_tile_ids = df_rtc_ts.mgrs_tile_id.unique().tolist()
+    df_products = benchmark_with_memory(
+        enumerate_dist_s1_products, df_rtc_ts, mgrs_tile_ids, tqdm_enabled=False, rounds=3
+    )
+    assert df_products.mgrs_tile_id.nunique() == 3 * factor
@@ -0,0 +1,39 @@
+from collections.abc import Callable
+
+import pytest
+from shapely.geometry import box
+
+from dist_s1_enumerator.mgrs_burst_data import (
+    get_burst_ids_by_mgrs_tile,
+    get_burst_ids_in_mgrs_tiles,
+    get_mgrs_burst_lut,
+    get_mgrs_tiles_overlapping_geometry,
+)
+
+
+@pytest.mark.parametrize('n_tiles', [1, 100, 1_000])
+def test_bench_get_burst_ids_in_mgrs_tiles(benchmark_with_memory: Callable, n_tiles: int) -> None:
+    mgrs_tile_ids = sorted(get_mgrs_burst_lut().mgrs_tile_id.unique())[:n_tiles]
+    burst_ids = benchmark_with_memory(get_burst_ids_in_mgrs_tiles, mgrs_tile_ids)
+    assert len(burst_ids) > 0
+
+
+@pytest.mark.parametrize('n_tiles', [1, 100, 1_000])
+def test_bench_get_burst_ids_by_mgrs_tile(benchmark_with_memory: Callable, n_tiles: int) -> None:
+    mgrs_tile_ids = sorted(get_mgrs_burst_lut().mgrs_tile_id.unique())[:n_tiles]
+    burst_ids_by_tile = benchmark_with_memory(get_burst_ids_by_mgrs_tile, mgrs_tile_ids)
+    assert len(burst_ids_by_tile) == n_tiles
+
+
+@pytest.mark.parametrize(
+    'geometry',
+    [
+        box(-90.5, 29.0, -90.0, 29.5),  # Waxlake delta
+        box(-120.0, 32.0, -110.0, 42.0),  # Southwestern US
+        box(-180.0, -90.0, 180.0, 90.0),  # the globe
+    ],
+    ids=['small', 'region', 'globe'],
+)
+def test_bench_get_mgrs_tiles_overlapping_geometry(benchmark_with_memory: Callable, geometry: box) -> None:
+    df_mgrs = benchmark_with_memory(get_mgrs_tiles_overlapping_geometry, geometry)
+    assert not df_mgrs.empty
@@ -0,0 +1,28 @@
+import itertools
+from collections.abc import Callable
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from bench_data import RTC_S1_TS_STACKS, read_rtc_s1_ts
+
+from dist_s1_enumerator.rtc_s1_io import localize_rtc_s1_ts
+from file_server import FileServer, serve_rtc_files
+
+
+@pytest.mark.parametrize('engine', ['threads', 'asyncio'])
+def test_bench_localize_rtc_s1_ts_with_latency(
+    benchmark_with_memory: Callable, engine: str, file_server: FileServer, tmp_path: Path
+) -> None:
+    # 400 small files (copol and crosspol of 200 products) served with 50 ms latency as a stand-in for the datapool
+    df_rtc_ts = pd.concat([read_rtc_s1_ts(stack) for stack in RTC_S1_TS_STACKS], axis=0)
+    df_rtc = serve_rtc_files(df_rtc_ts.drop_duplicates(subset=['opera_id']).head(200), file_server)
+    file_server.latency = 0.05
+    # Each round downloads into a new directory
+    data_dirs = (tmp_path / f'round_{k}' for k in itertools.count())
+
+    def localize() -> pd.DataFrame:
+        return localize_rtc_s1_ts(df_rtc, next(data_dirs), tqdm_enabled=False, engine=engine)
+
+    df_loc = benchmark_with_memory(localize, rounds=3)
+    assert df_loc.loc_path_copol.map(lambda path: Path(path).exists()).all()
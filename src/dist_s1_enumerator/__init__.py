@@ -1,26 +1,120 @@
+import importlib
 import warnings
 from importlib.metadata import PackageNotFoundError, version
+from typing import TYPE_CHECKING
 
-import asf_search
-
-from dist_s1_enumerator.asf import (
-    agg_rtc_metadata_by_burst_id,
-    get_rtc_s1_metadata_from_acq_group,
-    get_rtc_s1_ts_metadata_from_mgrs_tiles,
-)
-from dist_s1_enumerator.dist_enum import enumerate_dist_s1_products, enumerate_one_dist_s1_product
-from dist_s1_enumerator.dist_enum_inputs import enumerate_dist_s1_workflow_inputs
-from dist_s1_enumerator.mgrs_burst_data import (
-    get_burst_ids_in_mgrs_tiles,
-    get_burst_table,
-    get_burst_table_from_mgrs_tiles,
-    get_lut_by_mgrs_tile_ids,
-    get_mgrs_burst_lut,
-    get_mgrs_burst_lut_path,
-    get_mgrs_table,
-    get_mgrs_tiles_overlapping_geometry,
-)
-from dist_s1_enumerator.rtc_s1_io import localize_rtc_s1_ts
+
+if TYPE_CHECKING:
+    from dist_s1_enumerator.asf import (
+        agg_rtc_metadata_by_burst_id,
+        get_rtc_s1_metadata_from_acq_group,
+        get_rtc_s1_ts_metadata_from_mgrs_tiles,
+    )
+    from dist_s1_enumerator.dist_enum import (
+        DistS1ProductIndex,
+        enumerate_dist_s1_products,
+        enumerate_dist_s1_products_from_requests,
+        enumerate_one_dist_s1_product,
+        get_last_pass_ids,
+        iter_dist_s1_products,
+    )
+    from dist_s1_enumerator.dist_enum_inputs import enumerate_dist_s1_workflow_inputs
+    from dist_s1_enumerator.metrics import (
+        MetricsRegistry,
+        add_metrics_hook,
+        collect_metrics,
+        disable_metrics,
+        enable_metrics,
+        get_metrics,
+        remove_metrics_hook,
+    )
+    from dist_s1_enumerator.mgrs_burst_data import (
+        MgrsBurstLut,
+        build_burst_table,
+        get_burst_ids_by_mgrs_tile,
+        get_burst_ids_in_mgrs_tiles,
+        get_burst_table,
+        get_burst_table_from_mgrs_tiles,
+        get_lut_by_mgrs_tile_ids,
+        get_mgrs_burst_lut,
+        get_mgrs_burst_lut_index,
+        get_mgrs_burst_lut_path,
+        get_mgrs_table,
+        get_mgrs_tile_ids_overlapping_geometries,
+        get_mgrs_tiles_overlapping_geometry,
+    )
+    from dist_s1_enumerator.rtc_s1_catalog import RtcS1MetadataCatalog
+    from dist_s1_enumerator.rtc_s1_io import localize_rtc_s1_ts
+    from dist_s1_enumerator.search_backends import (
+        ASFSearchBackend,
+        FakeSearchBackend,
+        ParquetDatasetBackend,
+        SearchBackend,
+        get_search_backend,
+        search_backend,
+        set_search_backend,
+    )
+    from dist_s1_enumerator.tabular_models import get_validation_mode, set_validation_mode, validation_mode
+
+# The public API is imported from its submodule on first access so that e.g. `get_mgrs_table` does not pay for
+# importing asf_search, rasterio, etc.
+_LAZY_ATTRS = {
+    'agg_rtc_metadata_by_burst_id': 'dist_s1_enumerator.asf',
+    'get_rtc_s1_metadata_from_acq_group': 'dist_s1_enumerator.asf',
+    'get_rtc_s1_ts_metadata_from_mgrs_tiles': 'dist_s1_enumerator.asf',
+    'DistS1ProductIndex': 'dist_s1_enumerator.dist_enum',
+    'enumerate_dist_s1_products': 'dist_s1_enumerator.dist_enum',
+    'enumerate_dist_s1_products_from_requests': 'dist_s1_enumerator.dist_enum',
+    'enumerate_one_dist_s1_product': 'dist_s1_enumerator.dist_enum',
+    'get_last_pass_ids': 'dist_s1_enumerator.dist_enum',
+    'iter_dist_s1_products': 'dist_s1_enumerator.dist_enum',
+    'enumerate_dist_s1_workflow_inputs': 'dist_s1_enumerator.dist_enum_inputs',
+    'MetricsRegistry': 'dist_s1_enumerator.metrics',
+    'add_metrics_hook': 'dist_s1_enumerator.metrics',
+    'collect_metrics': 'dist_s1_enumerator.metrics',
+    'disable_metrics': 'dist_s1_enumerator.metrics',
+    'enable_metrics': 'dist_s1_enumerator.metrics',
+    'get_metrics': 'dist_s1_enumerator.metrics',
+    'remove_metrics_hook': 'dist_s1_enumerator.metrics',
+    'MgrsBurstLut': 'dist_s1_enumerator.mgrs_burst_data',
+    'build_burst_table': 'dist_s1_enumerator.mgrs_burst_data',
+    'get_burst_ids_by_mgrs_tile': 'dist_s1_enumerator.mgrs_burst_data',
+    'get_burst_ids_in_mgrs_tiles': 'dist_s1_enumerator.mgrs_burst_data',
+    'get_burst_table': 'dist_s1_enumerator.mgrs_burst_data',
+    'get_burst_table_from_mgrs_tiles': 'dist_s1_enumerator.mgrs_burst_data',
+    'get_lut_by_mgrs_tile_ids': 'dist_s1_enumerator.mgrs_burst_data',
+    'get_mgrs_burst_lut': 'dist_s1_enumerator.mgrs_burst_data',
+    'get_mgrs_burst_lut_index': 'dist_s1_enumerator.mgrs_burst_data',
+    'get_mgrs_burst_lut_path': 'dist_s1_enumerator.mgrs_burst_data',
+    'get_mgrs_table': 'dist_s1_enumerator.mgrs_burst_data',
+    'get_mgrs_tile_ids_overlapping_geometries': 'dist_s1_enumerator.mgrs_burst_data',
+    'get_mgrs_tiles_overlapping_geometry': 'dist_s1_enumerator.mgrs_burst_data',
+    'RtcS1MetadataCatalog': 'dist_s1_enumerator.rtc_s1_catalog',
+    'localize_rtc_s1_ts': 'dist_s1_enumerator.rtc_s1_io',
+    'ASFSearchBackend': 'dist_s1_enumerator.search_backends',
+    'FakeSearchBackend': 'dist_s1_enumerator.search_backends',
+    'ParquetDatasetBackend': 'dist_s1_enumerator.search_backends',
+    'SearchBackend': 'dist_s1_enumerator.search_backends',
+    'get_search_backend': 'dist_s1_enumerator.search_backends',
+    'search_backend': 'dist_s1_enumerator.search_backends',
+    'set_search_backend': 'dist_s1_enumerator.search_backends',
+    'get_validation_mode': 'dist_s1_enumerator.tabular_models',
+    'set_validation_mode': 'dist_s1_enumerator.tabular_models',
+    'validation_mode': 'dist_s1_enumerator.tabular_models',
+}
+
+
+def __getattr__(name: str) -> object:
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(_LAZY_ATTRS[name]), name)
+    # Cache so that __getattr__ is only called once per name
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
 
 
 try:
@@ -33,25 +127,50 @@ except PackageNotFoundError:
         '   python -m pip install -e .\n',
         RuntimeWarning,
     )
-# Increase CMR timeout to 2 minutes
-asf_search.constants.INTERNAL.CMR_TIMEOUT = 120
 
 __all__ = [
+    'ASFSearchBackend',
+    'DistS1ProductIndex',
+    'FakeSearchBackend',
+    'MetricsRegistry',
+    'MgrsBurstLut',
+    'ParquetDatasetBackend',
+    'RtcS1MetadataCatalog',
+    'SearchBackend',
+    'add_metrics_hook',
     'agg_rtc_metadata_by_burst_id',
     'agg_rtc_metadata_by_burst_id',
+    'build_burst_table',
+    'collect_metrics',
+    'disable_metrics',
+    'enable_metrics',
     'enumerate_dist_s1_products',
     'enumerate_dist_s1_products',
+    'enumerate_dist_s1_products_from_requests',
     'enumerate_dist_s1_workflow_inputs',
     'enumerate_one_dist_s1_product',
+    'get_burst_ids_by_mgrs_tile',
     'get_burst_ids_in_mgrs_tiles',
     'get_burst_table_from_mgrs_tiles',
     'get_burst_table',
+    'get_last_pass_ids',
     'get_lut_by_mgrs_tile_ids',
+    'get_metrics',
     'get_mgrs_burst_lut',
+    'get_mgrs_burst_lut_index',
     'get_mgrs_burst_lut_path',
     'get_mgrs_table',
+    'get_mgrs_tile_ids_overlapping_geometries',
     'get_mgrs_tiles_overlapping_geometry',
     'get_rtc_s1_metadata_from_acq_group',
     'get_rtc_s1_ts_metadata_from_mgrs_tiles',
+    'get_search_backend',
+    'get_validation_mode',
+    'iter_dist_s1_products',
     'localize_rtc_s1_ts',
+    'remove_metrics_hook',
+    'search_backend',
+    'set_search_backend',
+    'set_validation_mode',
+    'validation_mode',
 ]
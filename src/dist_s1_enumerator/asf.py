@@ -1,15 +1,33 @@
+import concurrent.futures
 from datetime import datetime
+from itertools import chain
 from warnings import warn
 
 import asf_search as asf
 import geopandas as gpd
+import numpy as np
 import pandas as pd
-from pandera.pandas import check_input
-from rasterio.crs import CRS
+import shapely
+from asf_search.exceptions import ASFSearchError, CMRError
+from requests.exceptions import RequestException
 from shapely.geometry import shape
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
+from dist_s1_enumerator.metrics import increment, record_retry, timer
 from dist_s1_enumerator.mgrs_burst_data import get_burst_ids_in_mgrs_tiles, get_lut_by_mgrs_tile_ids
-from dist_s1_enumerator.tabular_models import reorder_columns, rtc_s1_resp_schema, rtc_s1_schema
+from dist_s1_enumerator.rtc_s1_catalog import RtcS1MetadataCatalog
+from dist_s1_enumerator.search_backends import ParquetDatasetBackend, SearchBackend, get_search_backend
+from dist_s1_enumerator.tabular_models import (
+    reorder_columns,
+    rtc_s1_resp_schema,
+    rtc_s1_schema,
+    validate_df,
+    validate_input,
+)
+
+
+# Increase CMR timeout to 2 minutes
+asf.constants.INTERNAL.CMR_TIMEOUT = 120
 
 
 def convert_asf_url_to_cumulus(url: str) -> str:
@@ -33,6 +51,30 @@ def convert_asf_url_to_cumulus(url: str) -> str:
     return new_url
 
 
+def convert_asf_urls_to_cumulus(urls: pd.Series) -> pd.Series:
+    """Vectorized version of `convert_asf_url_to_cumulus`.
+
+    Datapool urls of the form `<asf_base><granule_name>_<pol>.tif` are converted with string slicing; any other url is
+    passed to `convert_asf_url_to_cumulus`.
+    """
+    asf_base = 'https://datapool.asf.alaska.edu/RTC/OPERA-S1/'
+    cumulus_base = 'https://cumulus.asf.earthdatacloud.nasa.gov/OPERA/OPERA_L2_RTC-S1/'
+
+    filenames = urls.str.slice(len(asf_base))
+    ind_fast = (
+        urls.str.startswith(asf_base)
+        & ~filenames.str.contains('/', regex=False)
+        & filenames.str.slice(-7, -6).eq('_')
+        & filenames.str.endswith('.tif')
+    )
+    ind_slow = ~(ind_fast | urls.str.startswith(cumulus_base))
+
+    urls = urls.copy()
+    urls[ind_fast] = cumulus_base + filenames[ind_fast].str.slice(stop=-7) + '/' + filenames[ind_fast]
+    urls[ind_slow] = urls[ind_slow].map(convert_asf_url_to_cumulus)
+    return urls
+
+
 def format_polarization(pol: list | str) -> str:
     if isinstance(pol, list):
         if ('VV' in pol) and len(pol) == 2:
@@ -47,11 +89,51 @@ def format_polarization(pol: list | str) -> str:
         raise TypeError(f'Invalid polarization: {pol}.')
 
 
+def format_polarizations(pols: pd.Series) -> pd.Series:
+    """Vectorized version of `format_polarization` - only the distinct polarization lists are formatted."""
+    ind_list = pols.map(type).eq(list)
+    pols_joined = pols[ind_list].str.join('+')
+    lookup = {pol_token: format_polarization(pol_token.split('+')) for pol_token in pols_joined.unique()}
+    pols = pols.copy()
+    pols[ind_list] = pols_joined.map(lookup)
+    ind_invalid = ~pols.map(type).eq(str)
+    if ind_invalid.any():
+        raise TypeError(f'Invalid polarization: {pols[ind_invalid].iloc[0]}.')
+    return pols
+
+
 def extract_pass_id(acq_dt: pd.Timestamp) -> int:
     reference_date = pd.Timestamp('2014-01-01', tz='UTC')
     return int((acq_dt - reference_date).total_seconds() / 86400 / 6)
 
 
+def extract_pass_ids(acq_dts: pd.Series) -> pd.Series:
+    """Vectorized version of `extract_pass_id`."""
+    reference_date = pd.Timestamp('2014-01-01', tz='UTC')
+    return ((acq_dts - reference_date).dt.total_seconds() / 86400 / 6).astype(int)
+
+
+def get_geometries_from_geojson(geojson_geometries: list[dict]) -> np.ndarray:
+    """Build shapely geometries from GeoJSON geometries.
+
+    Polygons without holes (the footprint of an RTC-S1 burst) are built in bulk with the shapely 2 array
+    constructors; any other geometry falls back to `shapely.geometry.shape`.
+    """
+    geometries = np.empty(len(geojson_geometries), dtype=object)
+    ind_simple = np.array(
+        [g['type'] == 'Polygon' and len(g['coordinates']) == 1 for g in geojson_geometries], dtype=bool
+    )
+    rings = [geojson_geometries[k]['coordinates'][0] for k in np.flatnonzero(ind_simple)]
+    if rings:
+        ring_lengths = np.fromiter(map(len, rings), dtype=np.int64, count=len(rings))
+        coords = np.array(list(chain.from_iterable(rings)), dtype=np.float64)
+        ring_indices = np.repeat(np.arange(len(rings)), ring_lengths)
+        geometries[ind_simple] = shapely.polygons(shapely.linearrings(coords, indices=ring_indices))
+    for k in np.flatnonzero(~ind_simple):
+        geometries[k] = shape(geojson_geometries[k])
+    return geometries
+
+
 def append_pass_data(df_rtc: gpd.GeoDataFrame, mgrs_tile_ids: list[str]) -> gpd.GeoDataFrame:
     """Format the RTC S1 metadata for easier lookups."""
     # Extract the LUT acquisition info
@@ -88,12 +170,84 @@ def append_pass_data(df_rtc: gpd.GeoDataFrame, mgrs_tile_ids: list[str]) -> gpd.
     return df_rtc
 
 
+# Earliest date used when chunking searches without a start date (same as the pass_id reference date)
+EARLIEST_SEARCH_DT = datetime(2014, 1, 1)
+
+
+def get_search_chunks(
+    burst_ids: list[str],
+    start_acq_dt: datetime | None,
+    stop_acq_dt: datetime | None,
+    max_bursts_per_search: int | None = None,
+    max_days_per_search: int | None = None,
+) -> list[tuple[list[str], datetime | None, datetime | None]]:
+    """Split a search into (burst_ids, start_acq_dt, stop_acq_dt) chunks by burst count and time range.
+
+    Time chunks share their boundaries (searches are inclusive) so results must be deduplicated after merging.
+    """
+    if max_bursts_per_search is None:
+        max_bursts_per_search = len(burst_ids)
+    if max_bursts_per_search < 1:
+        raise ValueError('max_bursts_per_search must be a positive integer.')
+    burst_id_chunks = [
+        burst_ids[k : k + max_bursts_per_search] for k in range(0, len(burst_ids), max_bursts_per_search)
+    ]
+
+    if max_days_per_search is None:
+        time_chunks = [(start_acq_dt, stop_acq_dt)]
+    else:
+        if max_days_per_search < 1:
+            raise ValueError('max_days_per_search must be a positive integer.')
+        start = pd.Timestamp(EARLIEST_SEARCH_DT if start_acq_dt is None else start_acq_dt)
+        stop = pd.Timestamp.now(tz='UTC') if stop_acq_dt is None else pd.Timestamp(stop_acq_dt)
+        start = start.tz_localize('UTC') if start.tz is None else start
+        stop = stop.tz_localize('UTC') if stop.tz is None else stop
+        # ASF accepts swapped start and stop dates
+        start, stop = min(start, stop), max(start, stop)
+        edges = pd.date_range(start, stop, freq=pd.Timedelta(days=max_days_per_search)).tolist()
+        if len(edges) == 1 or edges[-1] < stop:
+            edges.append(stop)
+        time_chunks = [(t0.to_pydatetime(), t1.to_pydatetime()) for (t0, t1) in zip(edges[:-1], edges[1:])]
+
+    return [(chunk, t0, t1) for chunk in burst_id_chunks for (t0, t1) in time_chunks]
+
+
+@retry(
+    retry=retry_if_exception_type((ASFSearchError, CMRError, RequestException)),
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=1, max=10),
+    before_sleep=record_retry('asf_search_retries_total'),
+    reraise=True,
+)
+def search_rtc_s1_products(
+    burst_ids: list[str],
+    start_acq_dt: datetime | None = None,
+    stop_acq_dt: datetime | None = None,
+    backend: SearchBackend | None = None,
+) -> list:
+    """Search the RTC-S1 products of burst ids (in ASF syntax) with retries on incomplete searches.
+
+    Searches are made with `backend` (by default the backend of `get_search_backend`, i.e. ASF).
+    """
+    if backend is None:
+        backend = get_search_backend()
+    increment('asf_searches_total')
+    with timer('asf_search_seconds'):
+        resp = backend.search(burst_ids, start_acq_dt, stop_acq_dt)
+    increment('asf_search_results_total', len(resp))
+    return resp
+
+
 def get_rtc_s1_ts_metadata_by_burst_ids(
     burst_ids: str | list[str],
     start_acq_dt: str | datetime | None | pd.Timestamp = None,
     stop_acq_dt: str | datetime | None | pd.Timestamp = None,
     polarizations: str | None = None,
     include_single_polarization: bool = False,
+    max_bursts_per_search: int | None = 100,
+    max_days_per_search: int | None = None,
+    max_workers: int = 4,
+    backend: SearchBackend | None = None,
 ) -> gpd.GeoDataFrame:
     """Wrap/format the ASF search API for RTC-S1 metadata search. All searches go through this function.
 
@@ -101,6 +255,11 @@ def get_rtc_s1_ts_metadata_by_burst_ids(
     of the available type).
 
     If dual polarized data is mixed (that is there are HH+HV and VV+VH), will raise an error.
+
+    Large searches are split into chunks of at most `max_bursts_per_search` burst ids and (if provided)
+    `max_days_per_search` days. The chunks are searched concurrently with `max_workers` threads, each with its own
+    retries, and the results are merged and deduplicated. Searches are made with `backend` (by default the backend of
+    `get_search_backend`, i.e. ASF). A `ParquetDatasetBackend` is read in a single filtered read instead.
     """
     if isinstance(burst_ids, str):
         burst_ids = [burst_ids]
@@ -108,6 +267,11 @@ def get_rtc_s1_ts_metadata_by_burst_ids(
     if (polarizations is not None) and (polarizations not in ['HH+HV', 'VV+VH']):
         raise ValueError(f'Invalid polarization: {polarizations}. Must be one of: HH+HV, VV+VH, None.')
 
+    # No search (and no chunks) without burst ids
+    if not burst_ids:
+        warn('No results - please check burst id and availability.', category=UserWarning)
+        return gpd.GeoDataFrame(columns=rtc_s1_resp_schema.columns.keys())
+
     # Convert all date inputs to datetime objects using pandas for flexibility
     start_acq_dt_obj = None
     stop_acq_dt_obj = None
@@ -118,46 +282,117 @@ def get_rtc_s1_ts_metadata_by_burst_ids(
     if stop_acq_dt is not None:
         stop_acq_dt_obj = pd.to_datetime(stop_acq_dt, utc=True).to_pydatetime()
 
+    if backend is None:
+        backend = get_search_backend()
+    # Datasets are read with the filters of the full search rather than in chunks
+    if isinstance(backend, ParquetDatasetBackend):
+        return read_rtc_s1_ts_metadata_from_dataset(
+            backend, burst_ids, start_acq_dt_obj, stop_acq_dt_obj, polarizations, include_single_polarization
+        )
+
     # Make sure JPL syntax is transformed to asf syntax
     burst_ids = [burst_id.upper().replace('-', '_') for burst_id in burst_ids]
-    resp = asf.geo_search(
-        operaBurstID=burst_ids,
-        processingLevel='RTC',
-        start=start_acq_dt_obj,
-        end=stop_acq_dt_obj,
+    search_chunks = get_search_chunks(
+        burst_ids,
+        start_acq_dt_obj,
+        stop_acq_dt_obj,
+        max_bursts_per_search=max_bursts_per_search,
+        max_days_per_search=max_days_per_search,
     )
+    if len(search_chunks) == 1:
+        chunk_resps = [search_rtc_s1_products(*search_chunks[0], backend=backend)]
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(search_chunks))) as executor:
+            chunk_resps = list(
+                executor.map(lambda chunk: search_rtc_s1_products(*chunk, backend=backend), search_chunks)
+            )
+    # Products on the shared boundary of time chunks appear in both chunks - keep the first
+    resp = {}
+    for r in (r for chunk_resp in chunk_resps for r in chunk_resp):
+        resp.setdefault(r.properties['sceneName'], r)
+    resp = list(resp.values())
     if not resp:
         warn('No results - please check burst id and availability.', category=UserWarning)
         return gpd.GeoDataFrame(columns=rtc_s1_resp_schema.columns.keys())
 
     properties = [r.properties for r in resp]
-    geometry = [shape(r.geojson()['geometry']) for r in resp]
-    properties_f = [
+    geometry = get_geometries_from_geojson([r.geojson()['geometry'] for r in resp])
+    df_rtc = gpd.GeoDataFrame(
         {
-            'opera_id': p['sceneName'],
-            'acq_dt': pd.Timestamp(p['startTime'], tz='UTC'),
-            'track_number': p['pathNumber'],
-            'polarizations': p['polarization'],
-            'all_urls': [p['url']] + p['additionalUrls'],
-        }
-        for p in properties
-    ]
-
-    df_rtc = gpd.GeoDataFrame(properties_f, geometry=geometry, crs=CRS.from_epsg(4326))
-    # Extract the burst_id from the opera_id
-    df_rtc['jpl_burst_id'] = df_rtc['opera_id'].map(lambda bid: bid.split('_')[3])
+            'opera_id': [p['sceneName'] for p in properties],
+            'acq_dt': pd.to_datetime([p['startTime'] for p in properties], utc=True, format='ISO8601'),
+            'track_number': [p['pathNumber'] for p in properties],
+            'polarizations': [p['polarization'] for p in properties],
+            'all_urls': [[p['url']] + p['additionalUrls'] for p in properties],
+        },
+        geometry=geometry,
+        crs='EPSG:4326',
+    )
+    # OPERA ids are OPERA_L2_RTC-S1_<jpl_burst_id>_<acq_time>_<production_time>_<sensor>_<spacing>_<version>
+    # with fixed width fields up to the production time - other ids are split on '_'
+    opera_ids = df_rtc['opera_id']
+    ind_fixed = opera_ids.str.startswith('OPERA_L2_RTC-S1_') & opera_ids.str.slice(31, 32).eq('_')
+    ind_fixed &= opera_ids.str.slice(48, 49).eq('_')
+    jpl_burst_ids = opera_ids.str.slice(16, 31)
+    dedup_ids = opera_ids.str.slice(stop=48)
+    if not ind_fixed.all():
+        jpl_burst_ids[~ind_fixed] = opera_ids[~ind_fixed].map(lambda id_: id_.split('_')[3])
+        dedup_ids[~ind_fixed] = opera_ids[~ind_fixed].map(lambda id_: '_'.join(id_.split('_')[:5]))
+    df_rtc['jpl_burst_id'] = jpl_burst_ids
 
     # pass_id is the integer number of 6 day periods since 2014-01-01
-    df_rtc['pass_id'] = df_rtc.acq_dt.map(extract_pass_id)
+    df_rtc['pass_id'] = extract_pass_ids(df_rtc['acq_dt'])
 
     # Remove duplicates from time series
-    df_rtc['dedup_id'] = df_rtc.opera_id.map(lambda id_: '_'.join(id_.split('_')[:5]))
-    df_rtc = df_rtc.drop_duplicates(subset=['dedup_id']).reset_index(drop=True)
-    df_rtc = df_rtc.drop(columns=['dedup_id'])
+    df_rtc = df_rtc[~dedup_ids.duplicated()].reset_index(drop=True)
 
     # polarizations - ensure dual polarization
     # asf metadata can be ['HH', 'HV'] or 'HH+HV' - reformat to the latter
-    df_rtc['polarizations'] = df_rtc['polarizations'].map(format_polarization)
+    df_rtc['polarizations'] = format_polarizations(df_rtc['polarizations'])
+    # First get all the dual-polarizations images
+    df_rtc = select_polarizations(df_rtc, burst_ids, polarizations, include_single_polarization)
+
+    # One row per (product, url) - each product must have exactly one copol and one crosspol GeoTIFF
+    all_urls = df_rtc['all_urls'].explode().dropna()
+    pol_suffixes = all_urls.str[-7:]
+    for polarization_token, suffixes in [('copol', ['_VV.tif', '_HH.tif']), ('crosspol', ['_HV.tif', '_VH.tif'])]:
+        pol_urls = all_urls[pol_suffixes.isin(suffixes)]
+        n_urls = pol_urls.groupby(level=0).size().reindex(df_rtc.index, fill_value=0)
+        if (n_urls == 0).any():
+            polarizations_allowed = [suffix[1:3] for suffix in suffixes]
+            raise ValueError(f'No {polarizations_allowed} urls found')
+        if (n_urls > 1).any():
+            multiple_urls = pol_urls[n_urls[n_urls > 1].index[0]]
+            raise ValueError(f'Multiple {polarization_token} urls found: {", ".join(multiple_urls)}')
+        df_rtc[f'url_{polarization_token}'] = convert_asf_urls_to_cumulus(pol_urls)
+    df_rtc = df_rtc.drop(columns=['all_urls'])
+
+    return format_rtc_s1_resp(df_rtc)
+
+
+def read_rtc_s1_ts_metadata_from_dataset(
+    backend: ParquetDatasetBackend,
+    burst_ids: list[str],
+    start_acq_dt: datetime | None,
+    stop_acq_dt: datetime | None,
+    polarizations: str | None,
+    include_single_polarization: bool,
+) -> gpd.GeoDataFrame:
+    """Read RTC-S1 metadata from a parquet dataset in the same format as `get_rtc_s1_ts_metadata_by_burst_ids`."""
+    df_rtc = backend.read(burst_ids, start_acq_dt, stop_acq_dt)
+    if df_rtc.empty:
+        warn('No results - please check burst id and availability.', category=UserWarning)
+        return gpd.GeoDataFrame(columns=rtc_s1_resp_schema.columns.keys())
+    df_rtc = select_polarizations(df_rtc, burst_ids, polarizations, include_single_polarization)
+    for column in ['url_copol', 'url_crosspol']:
+        df_rtc[column] = convert_asf_urls_to_cumulus(df_rtc[column])
+    return format_rtc_s1_resp(df_rtc)
+
+
+def select_polarizations(
+    df_rtc: gpd.GeoDataFrame, burst_ids: list[str], polarizations: str | None, include_single_polarization: bool
+) -> gpd.GeoDataFrame:
+    """Select the rows of `polarizations` (by default, of either dual polarization)."""
     if polarizations is not None:
         ind_pol = df_rtc['polarizations'] == polarizations
     elif not include_single_polarization:
@@ -166,36 +401,15 @@ def get_rtc_s1_ts_metadata_by_burst_ids(
         ind_pol = df_rtc['polarizations'].isin(['HH+HV', 'VV+VH', 'HH', 'HV', 'VV', 'VH'])
     if not ind_pol.any():
         warn(f'No valid dual polarization images found for {burst_ids}.')
-    # First get all the dual-polarizations images
-    df_rtc = df_rtc[ind_pol].reset_index(drop=True)
+    return df_rtc[ind_pol].reset_index(drop=True)
 
-    def get_url_by_polarization(prod_urls: list[str], polarization_token: str) -> list[str]:
-        if polarization_token == 'copol':
-            polarizations_allowed = ['VV', 'HH']
-        elif polarization_token == 'crosspol':
-            polarizations_allowed = ['HV', 'VH']
-        else:
-            raise ValueError(f'Invalid polarization token: {polarization_token}. Must be one of: copol, crosspol.')
-        possible_urls = [url for pol in polarizations_allowed for url in prod_urls if f'_{pol}.tif' == url[-7:]]
-        if len(possible_urls) == 0:
-            raise ValueError(f'No {polarizations_allowed} urls found')
-        if len(possible_urls) > 1:
-            raise ValueError(f'Multiple {polarization_token} urls found: {", ".join(possible_urls)}')
-        return possible_urls[0]
-
-    url_copol = df_rtc.all_urls.map(lambda urls_for_prod: get_url_by_polarization(urls_for_prod, 'copol'))
-    url_crosspol = df_rtc.all_urls.map(lambda urls_for_prod: get_url_by_polarization(urls_for_prod, 'crosspol'))
-
-    df_rtc['url_copol'] = url_copol
-    df_rtc['url_crosspol'] = url_crosspol
-    df_rtc['url_copol'] = df_rtc['url_copol'].map(convert_asf_url_to_cumulus)
-    df_rtc['url_crosspol'] = df_rtc['url_crosspol'].map(convert_asf_url_to_cumulus)
-    df_rtc = df_rtc.drop(columns=['all_urls'])
 
+def format_rtc_s1_resp(df_rtc: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    """Sort RTC-S1 metadata by jpl_burst_id and acq_dt and validate it against `rtc_s1_resp_schema`."""
     # Ensure the data is sorted by jpl_burst_id and acq_dt
     df_rtc = df_rtc.sort_values(by=['jpl_burst_id', 'acq_dt'], ascending=True).reset_index(drop=True)
 
-    rtc_s1_resp_schema.validate(df_rtc)
+    validate_df(df_rtc, rtc_s1_resp_schema)
     df_rtc = reorder_columns(df_rtc, rtc_s1_resp_schema)
 
     return df_rtc
@@ -209,6 +423,7 @@ def get_rtc_s1_metadata_from_acq_group(
     stop_acq_dt: datetime | str | None = None,
     max_variation_seconds: float | None = None,
     polarizations: str | None = None,
+    backend: SearchBackend | None = None,
 ) -> gpd.GeoDataFrame:
     """
     Meant for acquiring a pre-image or post-image set from MGRS tiles for a given S1 pass.
@@ -235,11 +450,39 @@ def get_rtc_s1_metadata_from_acq_group(
     stop_acq_dt : datetime
     max_variation_seconds : float, optional
     n_images_per_burst : int, optional
+    polarizations : str, optional
+    backend : SearchBackend, optional
+        Backend of the search, by default the backend of `get_search_backend`.
 
     Returns
     -------
     gpd.GeoDataFrame
     """
+    df_rtc_resp = get_rtc_s1_resp_from_acq_group(
+        mgrs_tile_ids,
+        track_numbers,
+        start_acq_dt=start_acq_dt,
+        stop_acq_dt=stop_acq_dt,
+        polarizations=polarizations,
+        backend=backend,
+    )
+    return select_rtc_s1_metadata_from_acq_group(
+        df_rtc_resp,
+        mgrs_tile_ids,
+        n_images_per_burst=n_images_per_burst,
+        max_variation_seconds=max_variation_seconds,
+    )
+
+
+def get_rtc_s1_resp_from_acq_group(
+    mgrs_tile_ids: list[str],
+    track_numbers: list[int],
+    start_acq_dt: datetime | str | None = None,
+    stop_acq_dt: datetime | str | None = None,
+    polarizations: str | None = None,
+    backend: SearchBackend | None = None,
+) -> gpd.GeoDataFrame:
+    """Search the RTC-S1 metadata (in `rtc_s1_resp_schema`) of the bursts of an S1 pass over MGRS tiles."""
     if len(track_numbers) > 2:
         raise ValueError('Cannot handle more than 2 track numbers.')
     if (len(track_numbers) == 2) and (abs(track_numbers[0] - track_numbers[1]) > 1):
@@ -251,7 +494,29 @@ def get_rtc_s1_metadata_from_acq_group(
         raise ValueError(
             f'No burst ids found for the provided MGRS tile {mgrs_tiles_str} and track numbers {track_numbers_str}.'
         )
+    return get_rtc_s1_ts_metadata_by_burst_ids(
+        burst_ids,
+        start_acq_dt=start_acq_dt,
+        stop_acq_dt=stop_acq_dt,
+        polarizations=polarizations,
+        backend=backend,
+    )
 
+
+def select_rtc_s1_metadata_from_acq_group(
+    df_rtc_resp: gpd.GeoDataFrame,
+    mgrs_tile_ids: list[str],
+    n_images_per_burst: int = 1,
+    start_acq_dt: datetime | pd.Timestamp | None = None,
+    stop_acq_dt: datetime | pd.Timestamp | None = None,
+    max_variation_seconds: float | None = None,
+) -> gpd.GeoDataFrame:
+    """Select the most recent burst image set from searched RTC-S1 metadata.
+
+    This is the local part of `get_rtc_s1_metadata_from_acq_group` so one search over a long date range can be reused
+    for several date ranges. The date range is inclusive and the dates can be swapped as in the ASF search; naive
+    datetimes are interpreted as UTC.
+    """
     if (n_images_per_burst == 1) and (max_variation_seconds is None):
         warn(
             'No maximum variation in acq dts provided although n_images_per_burst is 1. '
@@ -259,12 +524,16 @@ def get_rtc_s1_metadata_from_acq_group(
             'different dates for the burst_ids provided.',
             category=UserWarning,
         )
-    df_rtc = get_rtc_s1_ts_metadata_by_burst_ids(
-        burst_ids,
-        start_acq_dt=start_acq_dt,
-        stop_acq_dt=stop_acq_dt,
-        polarizations=polarizations,
-    )
+    start_acq_dt = pd.to_datetime(start_acq_dt, utc=True) if start_acq_dt is not None else None
+    stop_acq_dt = pd.to_datetime(stop_acq_dt, utc=True) if stop_acq_dt is not None else None
+    if (start_acq_dt is not None) and (stop_acq_dt is not None) and (start_acq_dt > stop_acq_dt):
+        start_acq_dt, stop_acq_dt = stop_acq_dt, start_acq_dt
+    df_rtc = df_rtc_resp
+    if start_acq_dt is not None:
+        df_rtc = df_rtc[df_rtc['acq_dt'] >= start_acq_dt].reset_index(drop=True)
+    if stop_acq_dt is not None:
+        df_rtc = df_rtc[df_rtc['acq_dt'] <= stop_acq_dt].reset_index(drop=True)
+
     # Assumes that each group is ordered by date (earliest first and most recent last)
     columns = df_rtc.columns
     df_rtc = df_rtc.groupby('jpl_burst_id').tail(n_images_per_burst).reset_index(drop=False)
@@ -278,7 +547,7 @@ def get_rtc_s1_metadata_from_acq_group(
 
     if not df_rtc.empty:
         df_rtc = append_pass_data(df_rtc, mgrs_tile_ids)
-        rtc_s1_schema.validate(df_rtc)
+        validate_df(df_rtc, rtc_s1_schema)
     df_rtc = reorder_columns(df_rtc, rtc_s1_schema)
 
     return df_rtc
@@ -290,17 +559,28 @@ def get_rtc_s1_ts_metadata_from_mgrs_tiles(
     start_acq_dt: str | datetime | None = None,
     stop_acq_dt: str | datetime | None = None,
     polarizations: str | None = None,
+    catalog: RtcS1MetadataCatalog | None = None,
 ) -> gpd.GeoDataFrame:
-    """Get the RTC S1 time series for a given MGRS tile and track number."""
+    """Get the RTC S1 time series for a given MGRS tile and track number.
+
+    If a catalog is provided, it is first synced with the acquisitions newer than each burst's latest acquisition in
+    the catalog and the time series is then read from the catalog.
+    """
     if isinstance(start_acq_dt, str):
         start_acq_dt = datetime.strptime(start_acq_dt, '%Y-%m-%d')
     if isinstance(stop_acq_dt, str):
         stop_acq_dt = datetime.strptime(stop_acq_dt, '%Y-%m-%d')
 
     burst_ids = get_burst_ids_in_mgrs_tiles(mgrs_tile_ids, track_numbers=track_numbers)
-    df_rtc_ts = get_rtc_s1_ts_metadata_by_burst_ids(
-        burst_ids, start_acq_dt=start_acq_dt, stop_acq_dt=stop_acq_dt, polarizations=polarizations
-    )
+    if catalog is not None:
+        catalog.sync(burst_ids, search_fn=get_rtc_s1_ts_metadata_by_burst_ids)
+        df_rtc_ts = catalog.read(
+            burst_ids, start_acq_dt=start_acq_dt, stop_acq_dt=stop_acq_dt, polarizations=polarizations
+        )
+    else:
+        df_rtc_ts = get_rtc_s1_ts_metadata_by_burst_ids(
+            burst_ids, start_acq_dt=start_acq_dt, stop_acq_dt=stop_acq_dt, polarizations=polarizations
+        )
     if df_rtc_ts.empty:
         mgrs_tiles_str = ','.join(mgrs_tile_ids)
         msg = f'No RTC S1 metadata found for  MGRS tile {mgrs_tiles_str}.'
@@ -311,13 +591,13 @@ def get_rtc_s1_ts_metadata_from_mgrs_tiles(
         return gpd.GeoDataFrame(columns=rtc_s1_schema.columns.keys())
 
     df_rtc_ts = append_pass_data(df_rtc_ts, mgrs_tile_ids)
-    rtc_s1_schema.validate(df_rtc_ts)
+    validate_df(df_rtc_ts, rtc_s1_schema)
     df_rtc_ts = reorder_columns(df_rtc_ts, rtc_s1_schema)
 
     return df_rtc_ts
 
 
-@check_input(rtc_s1_schema, 0)
+@validate_input(rtc_s1_schema)
 def agg_rtc_metadata_by_burst_id(df_rtc_ts: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     df_agg = (
         df_rtc_ts.groupby('jpl_burst_id')
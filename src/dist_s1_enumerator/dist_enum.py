@@ -1,13 +1,27 @@
+import concurrent.futures
+import contextvars
+import time
+from collections.abc import Callable, Iterator
 from datetime import datetime, timedelta
+from functools import partial
+from itertools import groupby
+from operator import itemgetter
+from warnings import warn
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
-from pandera.pandas import check_input
 from tqdm.auto import tqdm
 
-from dist_s1_enumerator.asf import get_rtc_s1_metadata_from_acq_group
+from dist_s1_enumerator.metrics import increment, observe
 from dist_s1_enumerator.param_models import LookbackStrategyParams
-from dist_s1_enumerator.tabular_models import dist_s1_input_schema, reorder_columns, rtc_s1_schema
+from dist_s1_enumerator.tabular_models import (
+    dist_s1_input_schema,
+    reorder_columns,
+    rtc_s1_schema,
+    validate_df,
+    validate_input,
+)
 
 
 def enumerate_one_dist_s1_product(
@@ -21,6 +35,7 @@ def enumerate_one_dist_s1_product(
     delta_lookback_days: int | list[int] | tuple[int, ...] = 365,
     min_pre_imgs_per_burst: int = 1,
     tqdm_enabled: bool = True,
+    single_search: bool = False,
 ) -> gpd.GeoDataFrame:
     """Enumerate a single product using unique DIST-S1 identifiers.
 
@@ -72,6 +87,12 @@ def enumerate_one_dist_s1_product(
         If lookback strategy is 'immediate_lookback', this must be set to 0.
     min_pre_imgs_per_burst : int, optional
         Minimum number of pre-images per burst to include, by default 1. This is for *all* the pre-images.
+    tqdm_enabled : bool, optional
+        Whether to show a progress bar over the lookback windows, by default True.
+    single_search : bool, optional
+        If True, makes a single ASF search from the start of the earliest pre-image window to the end of the post-image
+        buffer and selects the post-images and the pre-images of each window from it locally. Otherwise (the default)
+        makes one search for the post-images and one per pre-image window. The selected inputs are the same.
 
     Returns
     -------
@@ -80,6 +101,13 @@ def enumerate_one_dist_s1_product(
         This is used within some of the DIST-S1 workflows to enumerate the requisited pre- and post-image inputs.
         The metadata includes polarization, url, burst_id, etc.
     """
+    # Only needed (and imported) when searching - enumerating from a local time series does not import asf_search
+    from dist_s1_enumerator.asf import (
+        get_rtc_s1_metadata_from_acq_group,
+        get_rtc_s1_resp_from_acq_group,
+        select_rtc_s1_metadata_from_acq_group,
+    )
+
     params = LookbackStrategyParams(
         lookback_strategy=lookback_strategy,
         max_pre_imgs_per_burst=max_pre_imgs_per_burst,
@@ -107,10 +135,228 @@ def enumerate_one_dist_s1_product(
     if isinstance(post_date, pd.Timestamp):
         post_date = post_date.to_pydatetime()
 
-    print(f'Searching for post-images for track {track_number} in MGRS tile {mgrs_tile_id}')
-    df_rtc_post = get_rtc_s1_metadata_from_acq_group(
-        [mgrs_tile_id],
-        track_numbers=track_numbers,
+    if single_search:
+        # Pre-image windows are relative to the earliest post-image acquisition (minus the 5 minute buffer below)
+        if lookback_strategy == 'immediate_lookback':
+            max_lookback_days = params.delta_lookback_days + params.delta_window_days
+        else:
+            max_lookback_days = max(params.delta_lookback_days) + params.delta_window_days
+        search_start_acq_dt = post_date - timedelta(days=post_date_buffer_days + max_lookback_days, seconds=300)
+        print(f'Searching for pre- and post-images for track {track_number} in MGRS tile {mgrs_tile_id}')
+        df_rtc_resp = get_rtc_s1_resp_from_acq_group(
+            [mgrs_tile_id],
+            track_numbers=track_numbers,
+            start_acq_dt=search_start_acq_dt,
+            stop_acq_dt=post_date + timedelta(days=post_date_buffer_days),
+        )
+
+    def get_rtc_s1_metadata(**kwargs: object) -> gpd.GeoDataFrame:
+        if single_search:
+            return select_rtc_s1_metadata_from_acq_group(df_rtc_resp, [mgrs_tile_id], **kwargs)
+        return get_rtc_s1_metadata_from_acq_group([mgrs_tile_id], track_numbers=track_numbers, **kwargs)
+
+    return _select_dist_s1_product_inputs(
+        mgrs_tile_id,
+        track_number,
+        post_date,
+        params,
+        post_date_buffer_days,
+        get_rtc_s1_metadata,
+        tqdm_enabled=tqdm_enabled,
+    )
+
+
+def _get_product_requests(
+    product_requests: pd.DataFrame | list[tuple[str, int, datetime | pd.Timestamp | str]],
+) -> pd.DataFrame:
+    """Get the (mgrs_tile_id, track_number, post_date) requests as a frame with UTC post dates."""
+    columns = ['mgrs_tile_id', 'track_number', 'post_date']
+    if isinstance(product_requests, pd.DataFrame):
+        missing_columns = [column for column in columns if column not in product_requests.columns]
+        if missing_columns:
+            raise ValueError(f'Product requests are missing the columns: {missing_columns}.')
+        df_requests = product_requests[columns].reset_index(drop=True)
+    else:
+        df_requests = pd.DataFrame(list(product_requests), columns=columns)
+    df_requests = df_requests.assign(
+        track_number=df_requests.track_number.astype(int),
+        post_date=pd.to_datetime(df_requests.post_date, utc=True),
+    )
+    return df_requests
+
+
+def get_merged_searches(
+    df_requests: pd.DataFrame, params: LookbackStrategyParams, post_date_buffer_days: int = 1
+) -> tuple[pd.DataFrame, np.ndarray]:
+    """Merge the searches of product requests by MGRS tile and track number.
+
+    Each request needs the RTC-S1 metadata from the start of its earliest pre-image window to the end of its post-image
+    buffer (as with `single_search=True` in `enumerate_one_dist_s1_product`). The requests of an MGRS tile and track
+    number with overlapping date ranges share one search over the union of their date ranges.
+
+    Returns
+    -------
+    tuple[pd.DataFrame, np.ndarray]
+        The searches (mgrs_tile_id, track_number, start_acq_dt, stop_acq_dt) and the index of the search of each
+        request.
+    """
+    # Pre-image windows are relative to the earliest post-image acquisition (minus a 5 minute buffer)
+    buffer = pd.Timedelta(days=post_date_buffer_days)
+    starts = df_requests.post_date - buffer - get_max_lookback(params) - pd.Timedelta(seconds=300)
+    stops = df_requests.post_date + buffer
+
+    searches = []
+    search_indices = np.empty(len(df_requests), dtype=np.int64)
+    for (mgrs_tile_id, track_number), df_group in df_requests.groupby(['mgrs_tile_id', 'track_number'], sort=False):
+        for k in starts[df_group.index].sort_values(kind='stable').index:
+            if searches and searches[-1][:2] == [mgrs_tile_id, track_number] and starts[k] <= searches[-1][3]:
+                searches[-1][3] = max(searches[-1][3], stops[k])
+            else:
+                searches.append([mgrs_tile_id, track_number, starts[k], stops[k]])
+            search_indices[k] = len(searches) - 1
+
+    df_searches = pd.DataFrame(searches, columns=['mgrs_tile_id', 'track_number', 'start_acq_dt', 'stop_acq_dt'])
+    return df_searches, search_indices
+
+
+def enumerate_dist_s1_products_from_requests(
+    product_requests: pd.DataFrame | list[tuple[str, int, datetime | pd.Timestamp | str]],
+    lookback_strategy: str = 'multi_window',
+    post_date_buffer_days: int = 1,
+    max_pre_imgs_per_burst: int | list[int] | tuple[int, ...] = (5, 5, 5),
+    delta_window_days: int = 60,
+    delta_lookback_days: int | list[int] | tuple[int, ...] = 365,
+    min_pre_imgs_per_burst: int = 1,
+    max_workers: int = 4,
+    errors: str = 'raise',
+    tqdm_enabled: bool = True,
+) -> gpd.GeoDataFrame:
+    """Enumerate many products from (MGRS tile, track number, post-image date) requests with merged searches.
+
+    Gives the same inputs as `enumerate_one_dist_s1_product` for each request, but the requests of an MGRS tile and
+    track number with overlapping date ranges share one ASF search (see `get_merged_searches`). The searches are made
+    concurrently and the products are then selected locally, so the number of searches is about the number of distinct
+    MGRS tiles and track numbers rather than 4 per request.
+
+    Parameters
+    ----------
+    product_requests : pd.DataFrame | list[tuple[str, int, datetime | pd.Timestamp | str]]
+        Table with the columns `mgrs_tile_id`, `track_number` and `post_date` or list of
+        (mgrs_tile_id, track_number, post_date) tuples. Post dates are as in `enumerate_one_dist_s1_product`
+        (naive dates are interpreted as UTC).
+    lookback_strategy : str, optional
+        See `enumerate_one_dist_s1_product`.
+    post_date_buffer_days : int, optional
+        See `enumerate_one_dist_s1_product`.
+    max_pre_imgs_per_burst : int | list[int] | tuple[int, ...], optional
+        See `enumerate_one_dist_s1_product`.
+    delta_window_days : int, optional
+        See `enumerate_one_dist_s1_product`.
+    delta_lookback_days : int | list[int] | tuple[int, ...], optional
+        See `enumerate_one_dist_s1_product`.
+    min_pre_imgs_per_burst : int, optional
+        See `enumerate_one_dist_s1_product`.
+    max_workers : int, optional
+        Number of searches made concurrently, by default 4.
+    errors : str, optional
+        'raise' (default) to raise the first error of a request (e.g. no post-images found) or 'warn' to warn and
+        leave the request out of the products. Search errors other than ValueError (e.g. network errors after the
+        retries) are always raised.
+    tqdm_enabled : bool, optional
+        Whether to show a progress bar over the requests, by default True.
+
+    Returns
+    -------
+    gpd.GeoDataFrame
+        Inputs of all the products in `dist_s1_input_schema`. The `product_id` of a product is the position of its
+        request in `product_requests`.
+    """
+    from dist_s1_enumerator.asf import get_rtc_s1_resp_from_acq_group, select_rtc_s1_metadata_from_acq_group
+
+    params = LookbackStrategyParams(
+        lookback_strategy=lookback_strategy,
+        max_pre_imgs_per_burst=max_pre_imgs_per_burst,
+        delta_lookback_days=delta_lookback_days,
+        min_pre_imgs_per_burst=min_pre_imgs_per_burst,
+        delta_window_days=delta_window_days,
+    )
+    if post_date_buffer_days >= 6:
+        raise ValueError('post_date_buffer_days must be less than 6 (S1 pass length) - please check available data')
+    if errors not in ('raise', 'warn'):
+        raise ValueError(f"errors must be 'raise' or 'warn', got {errors}.")
+    if max_workers < 1:
+        raise ValueError(f'max_workers must be a positive integer, got {max_workers}.')
+
+    df_requests = _get_product_requests(product_requests)
+    df_searches, search_indices = get_merged_searches(df_requests, params, post_date_buffer_days)
+
+    def search(mgrs_tile_id: str, track_number: int, start_acq_dt: pd.Timestamp, stop_acq_dt: pd.Timestamp) -> object:
+        return get_rtc_s1_resp_from_acq_group(
+            [mgrs_tile_id], track_numbers=[track_number], start_acq_dt=start_acq_dt, stop_acq_dt=stop_acq_dt
+        )
+
+    df_products = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(df_searches)))) as executor:
+        # Searches run in the context of the caller (e.g. its validation mode)
+        futures = [
+            executor.submit(contextvars.copy_context().run, search, *row) for row in df_searches.itertuples(index=False)
+        ]
+        for product_id, request in enumerate(
+            tqdm(
+                df_requests.itertuples(index=False),
+                total=len(df_requests),
+                desc='Products',
+                dynamic_ncols=True,
+                disable=(not tqdm_enabled),
+            )
+        ):
+            try:
+                df_rtc_resp = futures[search_indices[product_id]].result()
+                df_product = _select_dist_s1_product_inputs(
+                    request.mgrs_tile_id,
+                    request.track_number,
+                    request.post_date,
+                    params,
+                    post_date_buffer_days,
+                    partial(select_rtc_s1_metadata_from_acq_group, df_rtc_resp, [request.mgrs_tile_id]),
+                    tqdm_enabled=False,
+                    verbose=False,
+                )
+            except ValueError as e:
+                if errors == 'raise':
+                    raise
+                warn(f'Skipping product request {product_id}: {e}', category=UserWarning)
+                continue
+            if not df_product.empty:
+                df_products.append(df_product.assign(product_id=product_id))
+
+    if df_products:
+        df_products = pd.concat(df_products, axis=0).reset_index(drop=True)
+        validate_df(df_products, dist_s1_input_schema)
+    else:
+        df_products = gpd.GeoDataFrame()
+    return reorder_columns(df_products, dist_s1_input_schema)
+
+
+def _no_log(*args: object) -> None:
+    pass
+
+
+def _select_dist_s1_product_inputs(
+    mgrs_tile_id: str,
+    track_number: int | list[int],
+    post_date: datetime | pd.Timestamp,
+    params: LookbackStrategyParams,
+    post_date_buffer_days: int,
+    get_rtc_s1_metadata: Callable[..., gpd.GeoDataFrame],
+    tqdm_enabled: bool = True,
+    verbose: bool = True,
+) -> gpd.GeoDataFrame:
+    """Select the post-images and pre-images of one product with `get_rtc_s1_metadata` (searching or selecting)."""
+    log = print if verbose else _no_log
+
+    log(f'Searching for post-images for track {track_number} in MGRS tile {mgrs_tile_id}')
+    df_rtc_post = get_rtc_s1_metadata(
         start_acq_dt=post_date + timedelta(days=post_date_buffer_days),
         stop_acq_dt=post_date - timedelta(days=post_date_buffer_days),
         # Should take less than 5 minutes for S1 to pass over MGRS tile
@@ -120,10 +366,10 @@ def enumerate_one_dist_s1_product(
     if df_rtc_post.empty:
         raise ValueError(f'No RTC-S1 post-images found for track {track_number} in MGRS tile {mgrs_tile_id}.')
 
-    if lookback_strategy == 'immediate_lookback':
+    if params.lookback_strategy == 'immediate_lookback':
         # Add 5 minutes buffer to ensure we don't include post-images in pre-image set.
-        print('Searching for pre-images for immediate_lookback products')
-        print(
+        log('Searching for pre-images for immediate_lookback products')
+        log(
             f'Lookback days {params.delta_lookback_days} and window days {params.delta_window_days} '
             f'with max pre-images per burst {params.max_pre_imgs_per_burst}'
         )
@@ -132,12 +378,10 @@ def enumerate_one_dist_s1_product(
         latest_lookback = params.delta_lookback_days
         start_acq_dt = post_date_min - timedelta(days=earliest_lookback)
         stop_acq_dt = post_date_min - timedelta(days=latest_lookback)
-        df_rtc_pre = get_rtc_s1_metadata_from_acq_group(
-            [mgrs_tile_id],
-            track_numbers=track_numbers,
+        df_rtc_pre = get_rtc_s1_metadata(
             start_acq_dt=start_acq_dt,
             stop_acq_dt=stop_acq_dt,
-            n_images_per_burst=max_pre_imgs_per_burst,
+            n_images_per_burst=params.max_pre_imgs_per_burst,
         )
         df_unique_keys = df_rtc_post[['jpl_burst_id', 'polarizations']].drop_duplicates()
 
@@ -145,11 +389,11 @@ def enumerate_one_dist_s1_product(
 
         df_rtc_pre['input_category'] = 'pre'
 
-    elif lookback_strategy == 'multi_window':
+    elif params.lookback_strategy == 'multi_window':
         df_rtc_pre_list = []
         zipped_data = list(zip(params.delta_lookback_days, params.max_pre_imgs_per_burst))
-        print('Searching for pre-images for multi_window baseline')
-        print(
+        log('Searching for pre-images for multi_window baseline')
+        log(
             f'Lookback days {params.delta_lookback_days} and window days {params.delta_window_days} '
             f'with max pre-images per burst {params.max_pre_imgs_per_burst}'
         )
@@ -165,13 +409,10 @@ def enumerate_one_dist_s1_product(
             latest_lookback = delta_lookback_day
             start_acq_dt = post_date_min - timedelta(days=latest_lookback)
             stop_acq_dt = post_date_min - timedelta(days=earliest_lookback)
-            df_rtc_pre_window = get_rtc_s1_metadata_from_acq_group(
-                [mgrs_tile_id],
-                track_numbers=track_numbers,
+            df_rtc_pre_window = get_rtc_s1_metadata(
                 start_acq_dt=start_acq_dt,
                 stop_acq_dt=stop_acq_dt,
                 n_images_per_burst=max_pre_img_per_burst,
-                polarizations=None,
             )
             df_unique_keys = df_rtc_post[['jpl_burst_id', 'polarizations']].drop_duplicates()
 
@@ -186,7 +427,8 @@ def enumerate_one_dist_s1_product(
 
     else:
         raise ValueError(
-            f'Unsupported lookback_strategy: {lookback_strategy}. Expected "multi_window" or "immediate_lookback".'
+            f'Unsupported lookback_strategy: {params.lookback_strategy}. '
+            'Expected "multi_window" or "immediate_lookback".'
         )
 
     if not df_rtc_pre.empty:
@@ -218,7 +460,7 @@ def enumerate_one_dist_s1_product(
         df_rtc_product = pd.concat([df_rtc_pre, df_rtc_post], axis=0).reset_index(drop=True)
 
         # Validation
-        dist_s1_input_schema.validate(df_rtc_product)
+        validate_df(df_rtc_product, dist_s1_input_schema)
     else:
         df_rtc_product = gpd.GeoDataFrame()
     df_rtc_product = reorder_columns(df_rtc_product, dist_s1_input_schema)
@@ -226,7 +468,231 @@ def enumerate_one_dist_s1_product(
     return df_rtc_product
 
 
-@check_input(rtc_s1_schema, 0)
+NS_PER_DAY = 86_400 * 10**9
+
+
+def _get_pre_image_windows(params: LookbackStrategyParams) -> list[tuple[int, int, int]]:
+    """Get (lookback, window length, max pre-images per burst) for each pre-image window with durations in ns."""
+    window_ns = params.delta_window_days * NS_PER_DAY
+    if params.lookback_strategy == 'immediate_lookback':
+        return [(params.delta_lookback_days * NS_PER_DAY, window_ns, params.max_pre_imgs_per_burst)]
+    return [
+        (delta_lookback_day * NS_PER_DAY, window_ns, max_pre_img_per_burst)
+        for delta_lookback_day, max_pre_img_per_burst in zip(params.delta_lookback_days, params.max_pre_imgs_per_burst)
+    ]
+
+
+def _expand_ranges(starts: np.ndarray, stops: np.ndarray) -> np.ndarray:
+    """Concatenate the integer ranges [start, stop) into a single array."""
+    lengths = stops - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return offsets + np.arange(total, dtype=np.int64)
+
+
+def _enumerate_acq_group(
+    acq_dt: np.ndarray,
+    pass_ids: np.ndarray,
+    burst_codes: np.ndarray,
+    pol_codes: np.ndarray,
+    post_candidates: np.ndarray | None,
+    windows: list[tuple[int, int, int]],
+    min_pre_imgs_per_burst: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Select the pre-/post-image rows of every product within a single MGRS tile acquisition group.
+
+    The inputs are row-aligned arrays of the acquisition group with `acq_dt` in integer nanoseconds (UTC). Every pass
+    is a candidate post-image set. The rows are sorted once by (burst, polarization, acq_dt rank) so that the rows of a
+    burst within a pre-image window are a contiguous slice whose bounds are found with `searchsorted` for all passes
+    at once. If the row mask `post_candidates` is provided, only the passes of its rows are candidate post-image sets.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, np.ndarray]
+        Product index, row index and window index (-1 for post-images) of each selected row. Products are numbered
+        from 0 starting with the most recent pass and only non-empty products are numbered. Rows are ordered by
+        product index and acq_dt with ties broken by window (post-images last) and then row order.
+    """
+    n_rows = acq_dt.shape[0]
+    n_windows = len(windows)
+    empty = np.empty(0, dtype=np.int64)
+    if n_rows == 0:
+        return empty, empty, empty
+
+    # Pass index 0 is the most recent pass
+    _, pass_idx = np.unique(-pass_ids, return_inverse=True)
+    n_passes = int(pass_idx.max()) + 1
+    post_dates = np.full(n_passes, np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(post_dates, pass_idx, acq_dt)
+
+    # Pre-images must match the (burst, polarization) keys of the post-image set
+    n_pols = int(pol_codes.max()) + 1
+    unique_keys, key_idx = np.unique(burst_codes.astype(np.int64) * n_pols + pol_codes, return_inverse=True)
+    n_keys = unique_keys.shape[0]
+    key_bursts = unique_keys // n_pols
+
+    # One query per (pass, key) in the post-image set, grouped by (pass, burst)
+    row_query_ids = pass_idx * n_keys + key_idx
+    if post_candidates is not None:
+        row_query_ids = row_query_ids[post_candidates]
+    query_ids = np.unique(row_query_ids)
+    q_pass = query_ids // n_keys
+    q_key = query_ids % n_keys
+    n_bursts = int(key_bursts.max()) + 1
+    pass_burst_ids, q_group, group_sizes = np.unique(
+        q_pass * n_bursts + key_bursts[q_key], return_inverse=True, return_counts=True
+    )
+    n_groups = pass_burst_ids.shape[0]
+    q_single = group_sizes[q_group] == 1
+
+    # Window bounds for every pass as ranks within the combined sorted times
+    lookbacks = np.array([lookback for (lookback, _, _) in windows], dtype=np.int64)
+    window_lengths = np.array([window_length for (_, window_length, _) in windows], dtype=np.int64)
+    window_stops = post_dates[:, None] - lookbacks[None, :]
+    window_starts = window_stops - window_lengths[None, :]
+    all_times = np.unique(np.concatenate([acq_dt, window_starts.ravel(), window_stops.ravel()]))
+    n_ranks = all_times.shape[0] + 1
+    row_ranks = np.searchsorted(all_times, acq_dt)
+    start_ranks = np.searchsorted(all_times, window_starts)
+    stop_ranks = np.searchsorted(all_times, window_stops)
+
+    row_order = np.lexsort((np.arange(n_rows), row_ranks, key_idx))
+    sorted_composite = key_idx[row_order] * n_ranks + row_ranks[row_order]
+
+    pre_counts = np.zeros(n_groups, dtype=np.int64)
+    window_slices = []
+    multi_selections = {}
+    multi_groups = np.unique(q_group[~q_single])
+    for window_index, (_, _, max_pre_imgs) in enumerate(windows):
+        # acq_dt >= window_start and acq_dt < window_stop
+        lo = np.searchsorted(sorted_composite, q_key * n_ranks + start_ranks[q_pass, window_index], side='left')
+        hi = np.searchsorted(sorted_composite, q_key * n_ranks + stop_ranks[q_pass, window_index], side='left')
+        # Keep the most recent pre-images of each burst
+        lo = np.where(q_single, np.maximum(lo, hi - max_pre_imgs), lo)
+        window_slices.append((lo, hi))
+        pre_counts += np.bincount(q_group[q_single], weights=(hi - lo)[q_single], minlength=n_groups).astype(np.int64)
+        # A burst with multiple polarizations in a single pass; the selection spans the polarization keys
+        for group in multi_groups:
+            q_in_group = np.flatnonzero(q_group == group)
+            rows = np.concatenate([row_order[lo[q] : hi[q]] for q in q_in_group])
+            rows = rows[np.lexsort((rows, acq_dt[rows]))][-max_pre_imgs:] if max_pre_imgs > 0 else rows[:0]
+            multi_selections[(group, window_index)] = rows
+            pre_counts[group] += rows.shape[0]
+
+    # Remove bursts that don't have minimum number of pre images
+    group_kept = pre_counts >= max(min_pre_imgs_per_burst, 1)
+    pass_kept = np.zeros(n_passes, dtype=bool)
+    pass_kept[pass_burst_ids[group_kept] // n_bursts] = True
+    product_of_pass = np.cumsum(pass_kept) - 1
+
+    q_kept = group_kept[q_group] & q_single
+    product_parts, row_parts, window_parts = [], [], []
+    for window_index, (lo, hi) in enumerate(window_slices):
+        lengths = (hi - lo)[q_kept]
+        rows = row_order[_expand_ranges(lo[q_kept], hi[q_kept])]
+        product_parts.append(np.repeat(product_of_pass[q_pass[q_kept]], lengths))
+        row_parts.append(rows)
+        window_parts.append(np.full(rows.shape[0], window_index, dtype=np.int64))
+    for (group, window_index), rows in multi_selections.items():
+        if group_kept[group]:
+            product_parts.append(np.full(rows.shape[0], product_of_pass[pass_burst_ids[group] // n_bursts]))
+            row_parts.append(rows)
+            window_parts.append(np.full(rows.shape[0], window_index, dtype=np.int64))
+
+    post_rows = np.flatnonzero(np.isin(pass_idx * n_bursts + key_bursts[key_idx], pass_burst_ids[group_kept]))
+    product_parts.append(product_of_pass[pass_idx[post_rows]])
+    row_parts.append(post_rows)
+    window_parts.append(np.full(post_rows.shape[0], -1, dtype=np.int64))
+
+    product_idx = np.concatenate(product_parts).astype(np.int64)
+    row_idx = np.concatenate(row_parts).astype(np.int64)
+    window_idx = np.concatenate(window_parts)
+    window_key = np.where(window_idx < 0, n_windows, window_idx)
+    order = np.lexsort((row_idx, window_key, acq_dt[row_idx], product_idx))
+    return product_idx[order], row_idx[order], window_idx[order]
+
+
+def _take_product_rows(
+    df_rtc_ts: gpd.GeoDataFrame, positions: np.ndarray, product_ids: np.ndarray, window_idx: np.ndarray
+) -> gpd.GeoDataFrame:
+    df_prods = df_rtc_ts.take(positions).reset_index(drop=True)
+    df_prods['input_category'] = np.where(window_idx < 0, 'post', 'pre').astype(object)
+    df_prods['product_id'] = product_ids
+    validate_df(df_prods, dist_s1_input_schema)
+    return reorder_columns(df_prods, dist_s1_input_schema)
+
+
+class DistS1ProductIndex:
+    """Enumerated DIST-S1 products stored as memberships into a single table of distinct RTC-S1 rows.
+
+    A pre-image is an input of many products (e.g. in every multi-window product of the following year), so rather
+    than copying its row (geometry, urls, etc.) into each product, each product input is a (product_id, row_index,
+    window_index) membership where row_index is a position in `df_rtc`. Memberships are ordered as the rows of
+    `enumerate_dist_s1_products` so the rows of a product are a slice of the membership arrays.
+    """
+
+    def __init__(
+        self, df_rtc: gpd.GeoDataFrame, product_ids: np.ndarray, row_indices: np.ndarray, window_indices: np.ndarray
+    ) -> None:
+        self.df_rtc = df_rtc.reset_index(drop=True)
+        self.product_ids = np.asarray(product_ids, dtype=np.int64)
+        self.row_indices = np.asarray(row_indices, dtype=np.int64)
+        # -1 for post-images
+        self.window_indices = np.asarray(window_indices, dtype=np.int8)
+        n_products = int(self.product_ids[-1]) + 1 if self.product_ids.size else 0
+        self.offsets = np.zeros(n_products + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.product_ids, minlength=n_products), out=self.offsets[1:])
+
+    @classmethod
+    def from_positions(
+        cls, df_rtc_ts: gpd.GeoDataFrame, positions: np.ndarray, product_ids: np.ndarray, window_indices: np.ndarray
+    ) -> 'DistS1ProductIndex':
+        """Keep the rows of df_rtc_ts at the positions (once each) with the memberships pointing to them."""
+        unique_positions, row_indices = np.unique(positions, return_inverse=True)
+        return cls(df_rtc_ts.take(unique_positions), product_ids, row_indices, window_indices)
+
+    @property
+    def n_products(self) -> int:
+        """Number of products."""
+        return self.offsets.shape[0] - 1
+
+    def __len__(self) -> int:
+        return self.n_products
+
+    @property
+    def memberships(self) -> pd.DataFrame:
+        """The (product_id, row_index, input_category, window_index) of every product input."""
+        return pd.DataFrame(
+            {
+                'product_id': self.product_ids,
+                'row_index': self.row_indices,
+                'input_category': np.where(self.window_indices < 0, 'post', 'pre').astype(object),
+                'window_index': self.window_indices,
+            }
+        )
+
+    def get_product(self, product_id: int) -> gpd.GeoDataFrame:
+        """Get the inputs of a product in the format of `enumerate_dist_s1_products`."""
+        if not 0 <= product_id < self.n_products:
+            raise ValueError(f'product_id must be between 0 and {self.n_products - 1}, got {product_id}.')
+        product_slice = slice(self.offsets[product_id], self.offsets[product_id + 1])
+        return _take_product_rows(
+            self.df_rtc,
+            self.row_indices[product_slice],
+            self.product_ids[product_slice],
+            self.window_indices[product_slice],
+        )
+
+    def to_geodataframe(self) -> gpd.GeoDataFrame:
+        """Get the inputs of all products; the same table as `enumerate_dist_s1_products` returns."""
+        if self.n_products == 0:
+            return reorder_columns(gpd.GeoDataFrame(), dist_s1_input_schema)
+        return _take_product_rows(self.df_rtc, self.row_indices, self.product_ids, self.window_indices)
+
+
+@validate_input(rtc_s1_schema)
 def enumerate_dist_s1_products(
     df_rtc_ts: gpd.GeoDataFrame,
     mgrs_tile_ids: list[str],
@@ -236,7 +702,12 @@ def enumerate_dist_s1_products(
     tqdm_enabled: bool = True,
     delta_lookback_days: int = 365,
     delta_window_days: int = 60,
-) -> gpd.GeoDataFrame:
+    n_workers: int = 1,
+    compact: bool = False,
+    last_pass_ids: pd.DataFrame | None = None,
+    start_post_acq_dt: datetime | pd.Timestamp | str | None = None,
+    stop_post_acq_dt: datetime | pd.Timestamp | str | None = None,
+) -> gpd.GeoDataFrame | DistS1ProductIndex:
     """
     Enumerate DIST-S1 products from a stack of RTC-S1 metadata and a list of MGRS tiles.
 
@@ -244,6 +715,10 @@ def enumerate_dist_s1_products(
 
     This enumeration finds all the available post-image dates from a given stack of RTC-S1 inputs.
 
+    The pre-image selections of every (post-image pass, lookback window) pair within an MGRS tile acquisition group are
+    computed at once after sorting the group a single time. Rows with identical acq_dt within a product are kept in the
+    order they appear in `df_rtc_ts`.
+
 
     Parameters
     ----------
@@ -279,12 +754,33 @@ def enumerate_dist_s1_products(
         This amounts to roughly `post_date - lookback_days - delta_window_days` to `post_date - lookback_days`.
         If lookback strategy is 'multi_window', this means the maximum window of time to search for pre-images on each
         anniversary date where `post_date - n * lookback_days` are the anniversary dates for n = 1,....
+    n_workers : int, optional
+        Number of worker processes, by default 1 (no worker processes). The RTC-S1 data is sharded by
+        (mgrs_tile_id, acq_group_id_within_mgrs_tile) and the shards are enumerated in a process pool. Product ids
+        are assigned afterwards in the order of `mgrs_tile_ids` so the output does not depend on `n_workers`.
+    compact : bool, optional
+        If True, returns a `DistS1ProductIndex` that stores each selected RTC-S1 row once instead of once per product
+        that uses it; its `get_product` method gives the rows of a single product. By default False.
+    last_pass_ids : pd.DataFrame, optional
+        State of a previous enumeration (see `get_last_pass_ids`): the last enumerated post-image `pass_id` of each
+        (`mgrs_tile_id`, `acq_group_id_within_mgrs_tile`). If provided, only products whose post-image pass is newer
+        are enumerated, using only the rows of `df_rtc_ts` within the pre-image windows of these passes, so
+        `df_rtc_ts` only needs to cover `max(delta_lookback_days) + delta_window_days` before the new passes. The
+        products are the same as in a full enumeration except for their `product_id`. Groups missing from the state
+        are enumerated in full.
+    start_post_acq_dt : datetime | pd.Timestamp | str, optional
+        If provided, only enumerate products whose post-image pass has acquisitions at or after this time (UTC if not
+        timezone-aware). Only rows within the pre-image windows of these passes are used.
+    stop_post_acq_dt : datetime | pd.Timestamp | str, optional
+        If provided, only enumerate products whose post-image pass has acquisitions at or before this time.
 
     Returns
     -------
-    gpd.GeoDataFrame
+    gpd.GeoDataFrame | DistS1ProductIndex
         DataFrame containing enumerated OPERA RTC-S1 input metadata including polarization, url, burst_id, etc.
     """
+    if n_workers < 1:
+        raise ValueError(f'n_workers must be a positive integer, got {n_workers}.')
     params = LookbackStrategyParams(
         lookback_strategy=lookback_strategy,
         max_pre_imgs_per_burst=max_pre_imgs_per_burst,
@@ -293,133 +789,297 @@ def enumerate_dist_s1_products(
         delta_window_days=delta_window_days,
     )
 
-    products = []
-    product_id = 0
-    for mgrs_tile_id in tqdm(mgrs_tile_ids, desc='Enumerate by MGRS tiles', disable=(not tqdm_enabled)):
-        df_rtc_ts_tile = df_rtc_ts[df_rtc_ts.mgrs_tile_id == mgrs_tile_id].reset_index(drop=True)
-        acq_group_ids_in_tile = df_rtc_ts_tile.acq_group_id_within_mgrs_tile.unique().tolist()
-        # Groups are analogs to tracks (excepted grouped around the equator to ensure a single pass is grouped properly)
-        for group_id in acq_group_ids_in_tile:
-            df_rtc_ts_tile_track = df_rtc_ts_tile[df_rtc_ts_tile.acq_group_id_within_mgrs_tile == group_id].reset_index(
-                drop=True
-            )
-            # Latest pass is now the first to appear in the list of pass_ids
-            pass_ids_unique = sorted(df_rtc_ts_tile_track.pass_id.unique().tolist(), reverse=True)
-            # Now traverse over all the passes
-            for pass_id in pass_ids_unique:
-                # post
-                df_rtc_post = df_rtc_ts_tile_track[df_rtc_ts_tile_track.pass_id == pass_id].reset_index(drop=True)
-                df_rtc_post['input_category'] = 'post'
-
-                if lookback_strategy == 'immediate_lookback':
-                    # pre-image accounting
-                    post_date = df_rtc_post.acq_dt.min()
-                    delta_lookback_timedelta = pd.Timedelta(params.delta_lookback_days, unit='D')
-                    delta_window_timedelta = pd.Timedelta(params.delta_window_days, unit='D')
-                    window_start = post_date - delta_lookback_timedelta - delta_window_timedelta
-                    window_stop = post_date - delta_lookback_timedelta
-
-                    # pre-image filtering
-                    # Select pre-images temporally
-                    ind_time = (df_rtc_ts_tile_track.acq_dt < window_stop) & (
-                        df_rtc_ts_tile_track.acq_dt >= window_start
-                    )
-                    df_rtc_ts_tile_track_filtered = df_rtc_ts_tile_track[ind_time].reset_index(drop=True)
-                    # Select images that are present in the post-image
-                    df_unique_keys = df_rtc_post[['jpl_burst_id', 'polarizations']].drop_duplicates()
-                    df_rtc_pre = pd.merge(
-                        df_rtc_ts_tile_track_filtered,
-                        df_unique_keys,
-                        on=['jpl_burst_id', 'polarizations'],
-                        how='inner',
-                    )
-                    df_rtc_pre['input_category'] = 'pre'
-
-                    # It is unclear how merging when multiple MGRS tiles are provided will impact order so this
-                    # is done to ensure the most recent pre-image set for each burst is selected
-                    df_rtc_pre = df_rtc_pre.sort_values(by='acq_dt', ascending=True).reset_index(drop=True)
-                    # Assume the data is sorted by acquisition date
-                    df_rtc_pre = df_rtc_pre.groupby('jpl_burst_id').tail(max_pre_imgs_per_burst).reset_index(drop=True)
-                    if df_rtc_pre.empty:
-                        continue
-
-                    # product and provenance
-                    df_rtc_product = pd.concat([df_rtc_pre, df_rtc_post]).reset_index(drop=True)
-                    df_rtc_product['product_id'] = product_id
-
-                elif lookback_strategy == 'multi_window':
-                    # pre-image accounting
-                    post_date = df_rtc_post.acq_dt.min()
-                    # Loop over the different lookback days
-                    df_rtc_pre_list = []
-                    zipped_data = list(zip(params.delta_lookback_days, params.max_pre_imgs_per_burst))
-                    for delta_lookback_day, max_pre_img_per_burst_param in zipped_data:
-                        delta_lookback_timedelta = pd.Timedelta(delta_lookback_day, unit='D')
-                        delta_window_timedelta = pd.Timedelta(params.delta_window_days, unit='D')
-                        window_start = post_date - delta_lookback_timedelta - delta_window_timedelta
-                        window_stop = post_date - delta_lookback_timedelta
-
-                        # pre-image filtering
-                        # Select pre-images temporally
-                        ind_time = (df_rtc_ts_tile_track.acq_dt < window_stop) & (
-                            df_rtc_ts_tile_track.acq_dt >= window_start
-                        )
-                        df_rtc_ts_tile_track_filtered = df_rtc_ts_tile_track[ind_time].reset_index(drop=True)
-
-                        df_unique_keys = df_rtc_post[['jpl_burst_id', 'polarizations']].drop_duplicates()
-                        df_rtc_pre = pd.merge(
-                            df_rtc_ts_tile_track_filtered,
-                            df_unique_keys,
-                            on=['jpl_burst_id', 'polarizations'],
-                            how='inner',
-                        )
-                        df_rtc_pre['input_category'] = 'pre'
-
-                        # It is unclear how merging when multiple MGRS tiles are provided will impact order so this
-                        # is done to ensure the most recent pre-image set for each burst is selected
-                        df_rtc_pre = df_rtc_pre.sort_values(by='acq_dt', ascending=True).reset_index(drop=True)
-                        # Assume the data is sorted by acquisition date
-                        df_rtc_pre = (
-                            df_rtc_pre.groupby('jpl_burst_id').tail(max_pre_img_per_burst_param).reset_index(drop=True)
-                        )
-
-                        if df_rtc_pre.empty:
-                            continue
-
-                        if not df_rtc_pre.empty:
-                            df_rtc_pre_list.append(df_rtc_pre)
-
-                    # Concatenate all df_rtc_pre into a single DataFrame
-                    df_rtc_pre_final = (
-                        pd.concat(df_rtc_pre_list, ignore_index=True) if df_rtc_pre_list else pd.DataFrame()
-                    )
-                    df_rtc_product = pd.concat([df_rtc_pre_final, df_rtc_post]).reset_index(drop=True)
-                    df_rtc_product['product_id'] = product_id
-
-                else:
-                    raise ValueError(
-                        f'Unsupported lookback_strategy: {lookback_strategy}. '
-                        'Expected "multi_window" or "immediate_lookback".'
-                    )
-
-                # Remove bursts that don't have minimum number of pre images
-                pre_counts = df_rtc_product[df_rtc_product.input_category == 'pre'].groupby('jpl_burst_id').size()
-                burst_ids_with_min_pre_images = pre_counts[pre_counts >= params.min_pre_imgs_per_burst].index.tolist()
-                df_rtc_product = df_rtc_product[
-                    df_rtc_product.jpl_burst_id.isin(burst_ids_with_min_pre_images)
-                ].reset_index(drop=True)
-
-                # finalize products
-                if not df_rtc_product.empty:
-                    products.append(df_rtc_product)
-                    product_id += 1
-    if products:
-        df_prods = pd.concat(products, axis=0).reset_index(drop=True)
-        dist_s1_input_schema.validate(df_prods)
+    row_positions = []
+    product_ids = []
+    window_indices = []
+    for _, positions, shard_product_ids, window_idx in _iter_enumerated_shards(
+        df_rtc_ts,
+        mgrs_tile_ids,
+        params,
+        tqdm_enabled=tqdm_enabled,
+        n_workers=n_workers,
+        last_pass_ids=last_pass_ids,
+        start_post_acq_dt=_to_utc_timestamp(start_post_acq_dt),
+        stop_post_acq_dt=_to_utc_timestamp(stop_post_acq_dt),
+    ):
+        row_positions.append(positions)
+        product_ids.append(shard_product_ids)
+        window_indices.append(window_idx)
+
+    if compact:
+        empty = np.empty(0, dtype=np.int64)
+        return DistS1ProductIndex.from_positions(
+            df_rtc_ts,
+            np.concatenate(row_positions + [empty]),
+            np.concatenate(product_ids + [empty]),
+            np.concatenate(window_indices + [empty]),
+        )
+    if row_positions:
+        df_prods = _take_product_rows(
+            df_rtc_ts, np.concatenate(row_positions), np.concatenate(product_ids), np.concatenate(window_indices)
+        )
     else:
         df_prods = gpd.GeoDataFrame()
 
+    # Rows are already ordered by product_id and acq_dt (see `_enumerate_acq_group`)
     df_prods = reorder_columns(df_prods, dist_s1_input_schema)
-    df_prods = df_prods.sort_values(by=['product_id', 'acq_dt'], ascending=True).reset_index(drop=True)
 
     return df_prods
+
+
+def _to_utc_timestamp(dt: datetime | pd.Timestamp | str | None) -> pd.Timestamp | None:
+    return None if dt is None else pd.to_datetime(dt, utc=True)
+
+
+def get_max_lookback(params: LookbackStrategyParams) -> pd.Timedelta:
+    """Get the longest time between a post-image pass and the start of one of its pre-image windows."""
+    return pd.Timedelta(
+        max(lookback + window_length for (lookback, window_length, _) in _get_pre_image_windows(params))
+    )
+
+
+def _get_post_candidates(
+    acq_dt: np.ndarray,
+    pass_ids: np.ndarray,
+    last_pass_id: int | None,
+    start_ns: int | None,
+    stop_ns: int | None,
+) -> np.ndarray:
+    """Mask of the rows of passes newer than last_pass_id with acquisitions between start_ns and stop_ns."""
+    post_candidates = np.ones(acq_dt.shape[0], dtype=bool)
+    if last_pass_id is not None:
+        post_candidates &= pass_ids > last_pass_id
+    if (start_ns is not None) or (stop_ns is not None):
+        _, pass_idx = np.unique(pass_ids, return_inverse=True)
+        n_passes = int(pass_idx.max()) + 1 if pass_idx.size else 0
+        if start_ns is not None:
+            pass_stops = np.full(n_passes, np.iinfo(np.int64).min, dtype=np.int64)
+            np.maximum.at(pass_stops, pass_idx, acq_dt)
+            post_candidates &= pass_stops[pass_idx] >= start_ns
+        if stop_ns is not None:
+            pass_starts = np.full(n_passes, np.iinfo(np.int64).max, dtype=np.int64)
+            np.minimum.at(pass_starts, pass_idx, acq_dt)
+            post_candidates &= pass_starts[pass_idx] <= stop_ns
+    return post_candidates
+
+
+def _iter_enumerated_shards(
+    df_rtc_ts: gpd.GeoDataFrame,
+    mgrs_tile_ids: list[str],
+    params: LookbackStrategyParams,
+    tqdm_enabled: bool = True,
+    n_workers: int = 1,
+    last_pass_ids: pd.DataFrame | None = None,
+    start_post_acq_dt: pd.Timestamp | None = None,
+    stop_post_acq_dt: pd.Timestamp | None = None,
+) -> Iterator[tuple[str, np.ndarray, np.ndarray, np.ndarray]]:
+    """Enumerate the (mgrs_tile_id, acq_group_id_within_mgrs_tile) shards of df_rtc_ts in the order of mgrs_tile_ids.
+
+    Passes older than the last enumerated pass of their shard (`last_pass_ids`) or without acquisitions between
+    `start_post_acq_dt` and `stop_post_acq_dt` are not candidate post-image sets. Shards without candidates are skipped
+    and the rows of the other shards are restricted to the candidates and the rows within their pre-image windows.
+
+    Yields
+    ------
+    tuple[str, np.ndarray, np.ndarray, np.ndarray]
+        MGRS tile id, row positions in df_rtc_ts, product id and window index (-1 for post-images) of the selected rows
+        of each shard with at least one product. Product ids are numbered consecutively across shards.
+    """
+    windows = _get_pre_image_windows(params)
+    acq_dt = pd.DatetimeIndex(df_rtc_ts.acq_dt).as_unit('ns').asi8
+    pass_ids = df_rtc_ts.pass_id.to_numpy(dtype=np.int64)
+    burst_codes, _ = pd.factorize(df_rtc_ts.jpl_burst_id)
+    pol_codes, _ = pd.factorize(df_rtc_ts.polarizations)
+    tile_ids = df_rtc_ts.mgrs_tile_id.to_numpy()
+    acq_group_ids = df_rtc_ts.acq_group_id_within_mgrs_tile.to_numpy()
+
+    # Shards are (mgrs_tile_id, acq_group_id_within_mgrs_tile) pairs ordered as they are enumerated
+    # Groups are analogs to tracks (excepted grouped around the equator to ensure a single pass is grouped properly)
+    last_pass_id_lookup = {}
+    if last_pass_ids is not None:
+        last_pass_id_lookup = {
+            (mgrs_tile_id, int(group_id)): int(pass_id)
+            for (mgrs_tile_id, group_id, pass_id) in last_pass_ids[
+                ['mgrs_tile_id', 'acq_group_id_within_mgrs_tile', 'pass_id']
+            ].itertuples(index=False)
+        }
+    max_lookback_ns = get_max_lookback(params).value
+    start_ns = None if start_post_acq_dt is None else pd.Timestamp(start_post_acq_dt).as_unit('ns').value
+    stop_ns = None if stop_post_acq_dt is None else pd.Timestamp(stop_post_acq_dt).as_unit('ns').value
+    filter_rows = bool(last_pass_id_lookup) or (start_ns is not None) or (stop_ns is not None)
+
+    shard_tile_ids = []
+    shard_rows = []
+    shard_post_candidates = []
+    for mgrs_tile_id in mgrs_tile_ids:
+        tile_rows = np.flatnonzero(tile_ids == mgrs_tile_id)
+        for group_id in pd.unique(acq_group_ids[tile_rows]):
+            rows = tile_rows[acq_group_ids[tile_rows] == group_id]
+            post_candidates = None
+            if filter_rows:
+                post_candidates = _get_post_candidates(
+                    acq_dt[rows],
+                    pass_ids[rows],
+                    last_pass_id_lookup.get((mgrs_tile_id, int(group_id))),
+                    start_ns,
+                    stop_ns,
+                )
+                if not post_candidates.any():
+                    continue
+                # Pre-images of the candidates are at most max_lookback_ns before them
+                candidate_acq_dt = acq_dt[rows][post_candidates]
+                ind = (acq_dt[rows] >= candidate_acq_dt.min() - max_lookback_ns) & (
+                    acq_dt[rows] <= candidate_acq_dt.max()
+                )
+                rows = rows[ind]
+                post_candidates = post_candidates[ind]
+            shard_tile_ids.append(mgrs_tile_id)
+            shard_rows.append(rows)
+            shard_post_candidates.append(post_candidates)
+
+    enumerate_shard = partial(
+        _enumerate_acq_group, windows=windows, min_pre_imgs_per_burst=params.min_pre_imgs_per_burst
+    )
+    shard_inputs = (
+        [acq_dt[rows] for rows in shard_rows],
+        [pass_ids[rows] for rows in shard_rows],
+        [burst_codes[rows] for rows in shard_rows],
+        [pol_codes[rows] for rows in shard_rows],
+        shard_post_candidates,
+    )
+    progress = partial(
+        tqdm, total=len(shard_rows), desc='Enumerate by MGRS tile acquisition groups', disable=(not tqdm_enabled)
+    )
+    executor = None
+    if n_workers == 1:
+        shard_results = map(enumerate_shard, *shard_inputs)
+    else:
+        chunksize = max(1, len(shard_rows) // (4 * n_workers))
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=n_workers)
+        shard_results = executor.map(enumerate_shard, *shard_inputs, chunksize=chunksize)
+
+    # Product ids are assigned in shard order so they do not depend on n_workers
+    product_id = 0
+    try:
+        # Time spent computing (or, with workers, waiting for) each shard, excluding the time spent by the consumer
+        start = time.perf_counter()
+        for mgrs_tile_id, rows, (product_idx, row_idx, window_idx) in progress(
+            zip(shard_tile_ids, shard_rows, shard_results)
+        ):
+            observe('enumeration_seconds', time.perf_counter() - start, mgrs_tile_id=mgrs_tile_id)
+            if product_idx.size > 0:
+                n_products = int(product_idx[-1]) + 1
+                increment('products_enumerated_total', n_products)
+                yield mgrs_tile_id, rows[row_idx], product_idx + product_id, window_idx
+                product_id += n_products
+            start = time.perf_counter()
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+@validate_input(rtc_s1_schema)
+def iter_dist_s1_products(
+    df_rtc_ts: gpd.GeoDataFrame,
+    mgrs_tile_ids: list[str],
+    lookback_strategy: str = 'multi_window',
+    max_pre_imgs_per_burst: int = (4, 3, 3),
+    min_pre_imgs_per_burst: int = 1,
+    tqdm_enabled: bool = True,
+    delta_lookback_days: int = 365,
+    delta_window_days: int = 60,
+    n_workers: int = 1,
+    yield_by: str = 'product',
+    last_pass_ids: pd.DataFrame | None = None,
+    start_post_acq_dt: datetime | pd.Timestamp | str | None = None,
+    stop_post_acq_dt: datetime | pd.Timestamp | str | None = None,
+) -> Iterator[gpd.GeoDataFrame]:
+    """Enumerate DIST-S1 products like `enumerate_dist_s1_products`, yielding them as they are enumerated.
+
+    Each MGRS tile is enumerated, validated and split into products before the next tile is enumerated, so the first
+    products are available right away and only the selected inputs of one tile are held in memory (besides
+    `df_rtc_ts`). Concatenating the yielded frames gives the output of `enumerate_dist_s1_products` with the same
+    arguments, including the `product_id` of each product.
+
+    Parameters
+    ----------
+    df_rtc_ts, mgrs_tile_ids, lookback_strategy, max_pre_imgs_per_burst, min_pre_imgs_per_burst, tqdm_enabled,
+    delta_lookback_days, delta_window_days, n_workers, last_pass_ids, start_post_acq_dt, stop_post_acq_dt
+        See `enumerate_dist_s1_products`.
+    yield_by : str, optional
+        'product' (default) yields one frame per product and 'mgrs_tile' one frame per MGRS tile with all its
+        products. MGRS tiles without products are skipped.
+
+    Returns
+    -------
+    Iterator[gpd.GeoDataFrame]
+        Inputs of each product (or of the products of each MGRS tile) in the format of `enumerate_dist_s1_products`.
+    """
+    if yield_by not in ['product', 'mgrs_tile']:
+        raise ValueError(f'Invalid yield_by: {yield_by}. Must be one of: product, mgrs_tile.')
+    if n_workers < 1:
+        raise ValueError(f'n_workers must be a positive integer, got {n_workers}.')
+    params = LookbackStrategyParams(
+        lookback_strategy=lookback_strategy,
+        max_pre_imgs_per_burst=max_pre_imgs_per_burst,
+        delta_lookback_days=delta_lookback_days,
+        min_pre_imgs_per_burst=min_pre_imgs_per_burst,
+        delta_window_days=delta_window_days,
+    )
+    # The arguments are validated when this is called, not when the products are first requested
+    shards = _iter_enumerated_shards(
+        df_rtc_ts,
+        mgrs_tile_ids,
+        params,
+        tqdm_enabled=tqdm_enabled,
+        n_workers=n_workers,
+        last_pass_ids=last_pass_ids,
+        start_post_acq_dt=_to_utc_timestamp(start_post_acq_dt),
+        stop_post_acq_dt=_to_utc_timestamp(stop_post_acq_dt),
+    )
+    return _iter_products_from_shards(df_rtc_ts, shards, yield_by)
+
+
+def _iter_products_from_shards(
+    df_rtc_ts: gpd.GeoDataFrame, shards: Iterator[tuple[str, np.ndarray, np.ndarray, np.ndarray]], yield_by: str
+) -> Iterator[gpd.GeoDataFrame]:
+    # Shards of an MGRS tile are consecutive
+    for _, tile_shards in groupby(shards, key=itemgetter(0)):
+        _, positions, product_ids, window_indices = zip(*tile_shards)
+        product_ids = np.concatenate(product_ids)
+        df_tile = _take_product_rows(df_rtc_ts, np.concatenate(positions), product_ids, np.concatenate(window_indices))
+        if yield_by == 'mgrs_tile':
+            yield df_tile
+            continue
+        # Rows are ordered by product_id
+        boundaries = np.flatnonzero(np.diff(product_ids)) + 1
+        for start, stop in zip(np.r_[0, boundaries], np.r_[boundaries, product_ids.shape[0]]):
+            yield df_tile.iloc[start:stop].reset_index(drop=True)
+
+
+def get_last_pass_ids(df: gpd.GeoDataFrame, last_pass_ids: pd.DataFrame | None = None) -> pd.DataFrame:
+    """Get the state for incremental enumeration: the last pass_id per (mgrs_tile_id, acq_group_id_within_mgrs_tile).
+
+    Parameters
+    ----------
+    df : gpd.GeoDataFrame
+        Output of `enumerate_dist_s1_products` (only post-images are used) or any table of RTC-S1 rows with
+        `mgrs_tile_id`, `acq_group_id_within_mgrs_tile` and `pass_id`, e.g. the time series that was enumerated to
+        also skip the passes that did not have enough pre-images.
+    last_pass_ids : pd.DataFrame, optional
+        Previous state to update.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns `mgrs_tile_id`, `acq_group_id_within_mgrs_tile` and `pass_id`.
+    """
+    columns = ['mgrs_tile_id', 'acq_group_id_within_mgrs_tile', 'pass_id']
+    if 'input_category' in df.columns:
+        df = df[df['input_category'] == 'post']
+    dfs = [pd.DataFrame(df[columns])]
+    if last_pass_ids is not None:
+        dfs.append(last_pass_ids[columns])
+    df_state = pd.concat(dfs, axis=0).astype({'acq_group_id_within_mgrs_tile': int, 'pass_id': int})
+    df_state = df_state.groupby(columns[:2], as_index=False)['pass_id'].max()
+    return df_state.sort_values(by=columns[:2]).reset_index(drop=True)
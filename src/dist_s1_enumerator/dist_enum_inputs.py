@@ -4,8 +4,11 @@ import geopandas as gpd
 import pandas as pd
 
 from dist_s1_enumerator.asf import get_rtc_s1_ts_metadata_from_mgrs_tiles
-from dist_s1_enumerator.dist_enum import enumerate_dist_s1_products
-from dist_s1_enumerator.tabular_models import reorder_columns, rtc_s1_schema
+from dist_s1_enumerator.dist_enum import enumerate_dist_s1_products, get_max_lookback
+from dist_s1_enumerator.mgrs_burst_data import get_lut_by_mgrs_tile_ids
+from dist_s1_enumerator.param_models import LookbackStrategyParams
+from dist_s1_enumerator.rtc_s1_catalog import RtcS1MetadataCatalog
+from dist_s1_enumerator.tabular_models import reorder_columns, rtc_s1_schema, validate_df
 
 
 def update_dist_s1_workflow_dict(data_dict: dict) -> dict:
@@ -26,6 +29,36 @@ def update_dist_s1_workflow_dict(data_dict: dict) -> dict:
     return out_formatted
 
 
+def get_incremental_search_start(
+    last_pass_ids: pd.DataFrame,
+    mgrs_tile_ids: list[str],
+    track_numbers: list[int] | None,
+    params: LookbackStrategyParams,
+) -> pd.Timestamp | None:
+    """Get the start of the search for the products with a post-image pass newer than `last_pass_ids`.
+
+    This is the start of the earliest pre-image window of the first pass after the oldest last pass of the MGRS tile
+    acquisition groups (less a day so that passes are complete), or None if a group has no last pass.
+    """
+    df_lut = get_lut_by_mgrs_tile_ids(mgrs_tile_ids)
+    if track_numbers is not None:
+        df_lut = df_lut[df_lut['track_number'].isin(track_numbers)]
+    group_columns = ['mgrs_tile_id', 'acq_group_id_within_mgrs_tile']
+    df_groups = df_lut[group_columns].drop_duplicates().astype({'acq_group_id_within_mgrs_tile': int})
+    df_groups = df_groups.merge(
+        last_pass_ids[[*group_columns, 'pass_id']].astype({'acq_group_id_within_mgrs_tile': int}),
+        on=group_columns,
+        how='left',
+    )
+    if df_groups.empty or df_groups['pass_id'].isna().any():
+        return None
+    # pass_id is the integer number of 6 day periods since 2014-01-01
+    first_new_pass_start = pd.Timestamp('2014-01-01', tz='UTC') + pd.Timedelta(
+        days=6 * (df_groups['pass_id'].min() + 1)
+    )
+    return first_new_pass_start - get_max_lookback(params) - pd.Timedelta(days=1)
+
+
 def enumerate_dist_s1_workflow_inputs(
     mgrs_tile_ids: list[str] | str,
     track_numbers: list[int] | int | None = None,
@@ -37,6 +70,8 @@ def enumerate_dist_s1_workflow_inputs(
     delta_lookback_days: int | list[int] | tuple[int, ...] = 365,
     delta_window_days: int = 365,
     df_ts: gpd.GeoDataFrame | None = None,
+    catalog: RtcS1MetadataCatalog | None = None,
+    last_pass_ids: pd.DataFrame | None = None,
 ) -> list[dict]:
     """Enumerate the inputs for a DIST-S1 workflow.
 
@@ -51,11 +86,13 @@ def enumerate_dist_s1_workflow_inputs(
     track_numbers : list[int] | int | None
         Track number(s) for RTC-S1 passes. Can be a single integer or list of integers.
     start_acq_dt : pd.Timestamp | str | None, optional
-        Start acquisition datetime for filtering RTC-S1 data. If string, should be in
-        ISO format. If None, no start filtering is applied.
+        Start of the post-image acquisition datetimes of the products. If string, should be in
+        ISO format. If None, no start filtering is applied. Only the RTC-S1 metadata from the
+        longest lookback (plus window) before this time is searched and enumerated.
     stop_acq_dt : pd.Timestamp | str | None, optional
-        Stop acquisition datetime for filtering RTC-S1 data. If string, should be in
-        ISO format. If None, no stop filtering is applied.
+        Stop of the post-image acquisition datetimes of the products. If string, should be in
+        ISO format. If None, no stop filtering is applied. No RTC-S1 metadata after this time
+        (plus a day so that passes are complete) is searched or enumerated.
     lookback_strategy : str, optional
         Lookback strategy to use, by default 'multi_window'. Options are
         'immediate_lookback' or 'multi_window'.
@@ -84,6 +121,15 @@ def enumerate_dist_s1_workflow_inputs(
         anniversary date where `post_date - n * lookback_days` are the anniversary dates for n = 1,....
     df_ts : gpd.GeoDataFrame | None, optional
         RTC-S1 time series data. If None, will be enumerated from MGRS tiles and track numbers.
+    catalog : RtcS1MetadataCatalog | None, optional
+        Local RTC-S1 metadata catalog. If provided (and `df_ts` is None), the catalog is synced with only the new
+        acquisitions and the time series is read from the catalog rather than searched in full.
+    last_pass_ids : pd.DataFrame | None, optional
+        Last enumerated pass_id per (mgrs_tile_id, acq_group_id_within_mgrs_tile) of a previous run (see
+        `get_last_pass_ids`). If provided, only inputs of products whose post-image pass is newer are returned and
+        computed (see `enumerate_dist_s1_products`). Without `start_acq_dt`, the search starts at the earliest
+        pre-image window of the passes after the oldest last pass (see `get_incremental_search_start`) when every MGRS
+        tile acquisition group has a last pass.
 
     Returns
     -------
@@ -102,14 +148,32 @@ def enumerate_dist_s1_workflow_inputs(
     if isinstance(stop_acq_dt, str):
         stop_acq_dt = pd.Timestamp(stop_acq_dt, tz='UTC')
 
+    # Products only need the data within the pre-image windows of their post-image passes
+    params = LookbackStrategyParams(
+        lookback_strategy=lookback_strategy,
+        max_pre_imgs_per_burst=max_pre_imgs_per_burst,
+        delta_lookback_days=delta_lookback_days,
+        min_pre_imgs_per_burst=min_pre_imgs_per_burst,
+        delta_window_days=delta_window_days,
+    )
+    # The buffer ensures that passes over the MGRS tile (a few minutes) at the bounds are complete
+    search_start_acq_dt = (
+        None if start_acq_dt is None else start_acq_dt - get_max_lookback(params) - pd.Timedelta(days=1)
+    )
+    if (search_start_acq_dt is None) and (last_pass_ids is not None):
+        search_start_acq_dt = get_incremental_search_start(last_pass_ids, mgrs_tile_ids, track_numbers, params)
+    search_stop_acq_dt = None if stop_acq_dt is None else stop_acq_dt + pd.Timedelta(days=1)
+
     if df_ts is None:
-        # Note we have to get full time-series to enumerate products! not just start/stop times.
         df_ts = get_rtc_s1_ts_metadata_from_mgrs_tiles(
             mgrs_tile_ids,
             track_numbers,
+            start_acq_dt=search_start_acq_dt,
+            stop_acq_dt=search_stop_acq_dt,
+            catalog=catalog,
         )
     else:
-        rtc_s1_schema.validate(df_ts)
+        validate_df(df_ts, rtc_s1_schema)
         df_ts = reorder_columns(df_ts, rtc_s1_schema)
 
     df_products = enumerate_dist_s1_products(
@@ -120,6 +184,9 @@ def enumerate_dist_s1_workflow_inputs(
         min_pre_imgs_per_burst=min_pre_imgs_per_burst,
         delta_lookback_days=delta_lookback_days,
         delta_window_days=delta_window_days,
+        last_pass_ids=last_pass_ids,
+        start_post_acq_dt=start_acq_dt,
+        stop_post_acq_dt=stop_acq_dt,
     )
 
     df_post = df_products[df_products['input_category'] == 'post'].reset_index(drop=True)
@@ -1,2 +1,9 @@
+from requests.exceptions import RequestException
+
+
 class NoMGRSCoverage(Exception):
     """Exception raised for no MGRS coverage."""
+
+
+class IncompleteDownloadError(RequestException):
+    """Exception raised when a download does not match the size reported by the server."""
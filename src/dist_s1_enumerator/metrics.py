@@ -0,0 +1,212 @@
+import json
+import threading
+import time
+import warnings
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import NamedTuple
+
+
+PROMETHEUS_PREFIX = 'dist_s1_enumerator_'
+
+# Nothing is recorded until metrics are enabled or a hook is added. The registry is process-wide rather than per
+# context because downloads record metrics from worker threads.
+
+
+class MetricEvent(NamedTuple):
+    type: str  # 'counter', 'timer' or 'gauge'
+    name: str
+    value: float
+    labels: dict[str, str]
+
+
+class MetricsRegistry:
+    """Counters, gauges and timers (count, total and max seconds) keyed by name and labels."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.timers = {}
+
+    def record(self, event: MetricEvent) -> None:
+        """Add an event to the registry."""
+        key = (event.name, tuple(sorted(event.labels.items())))
+        with self._lock:
+            if event.type == 'counter':
+                self.counters[key] = self.counters.get(key, 0) + event.value
+            elif event.type == 'gauge':
+                self.gauges[key] = event.value
+            else:
+                count, total, max_value = self.timers.get(key, (0, 0.0, 0.0))
+                self.timers[key] = (count + 1, total + event.value, max(max_value, event.value))
+
+    def get_counter(self, name: str, **labels: str) -> float:
+        """Get the value of a counter (0 if it was never incremented)."""
+        return self.counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def reset(self) -> None:
+        """Remove all the recorded metrics."""
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.timers.clear()
+
+    def to_dict(self) -> dict[str, list[dict]]:
+        """Get the metrics as lists of {'name', 'labels', ...} records by type."""
+        with self._lock:
+            return {
+                'counters': [
+                    {'name': name, 'labels': dict(labels), 'value': value}
+                    for (name, labels), value in sorted(self.counters.items())
+                ],
+                'gauges': [
+                    {'name': name, 'labels': dict(labels), 'value': value}
+                    for (name, labels), value in sorted(self.gauges.items())
+                ],
+                'timers': [
+                    {'name': name, 'labels': dict(labels), 'count': count, 'total_seconds': total, 'max_seconds': max_}
+                    for (name, labels), (count, total, max_) in sorted(self.timers.items())
+                ],
+            }
+
+    def to_json(self, **kwargs: object) -> str:
+        """Serialize `to_dict` with `json.dumps` (keyword arguments are passed on, e.g. `indent=2`)."""
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_prometheus(self) -> str:
+        """Format the metrics in the Prometheus text exposition format (timers are summaries in seconds)."""
+        metrics = self.to_dict()
+        lines = []
+
+        def add_samples(
+            metric_type: str, records: list[dict], samples: Callable[[dict], list[tuple[str, float]]]
+        ) -> None:
+            seen = set()
+            for record in records:
+                name = PROMETHEUS_PREFIX + record['name']
+                if name not in seen:
+                    lines.append(f'# TYPE {name} {metric_type}')
+                    seen.add(name)
+                labels = ','.join(f'{key}="{_escape_label_value(value)}"' for key, value in record['labels'].items())
+                labels = f'{{{labels}}}' if labels else ''
+                for suffix, value in samples(record):
+                    lines.append(f'{name}{suffix}{labels} {value:g}')
+
+        add_samples('counter', metrics['counters'], lambda record: [('', record['value'])])
+        add_samples('gauge', metrics['gauges'], lambda record: [('', record['value'])])
+        add_samples(
+            'summary',
+            metrics['timers'],
+            lambda record: [('_count', record['count']), ('_sum', record['total_seconds'])],
+        )
+        return '\n'.join(lines) + '\n'
+
+
+def _escape_label_value(value: object) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+_registry = None
+_hooks = []
+
+
+def get_metrics() -> MetricsRegistry | None:
+    """Get the registry metrics are recorded in (None if metrics are disabled)."""
+    return _registry
+
+
+def enable_metrics(registry: MetricsRegistry | None = None) -> MetricsRegistry:
+    """Record metrics in `registry` (a new one if None) until `disable_metrics` is called."""
+    global _registry
+    _registry = registry if registry is not None else MetricsRegistry()
+    return _registry
+
+
+def disable_metrics() -> None:
+    """Stop recording metrics (hooks are still called)."""
+    global _registry
+    _registry = None
+
+
+@contextmanager
+def collect_metrics() -> Iterator[MetricsRegistry]:
+    """Record the metrics of a block in a new registry, e.g. `with collect_metrics() as metrics: ...`."""
+    previous_registry = _registry
+    registry = enable_metrics()
+    try:
+        yield registry
+    finally:
+        if previous_registry is None:
+            disable_metrics()
+        else:
+            enable_metrics(previous_registry)
+
+
+def add_metrics_hook(hook: Callable[[MetricEvent], None]) -> None:
+    """Call `hook` with every `MetricEvent` (from the thread recording it) whether metrics are enabled or not.
+
+    Exceptions raised by the hook are turned into a `RuntimeWarning`.
+    """
+    _hooks.append(hook)
+
+
+def remove_metrics_hook(hook: Callable[[MetricEvent], None]) -> None:
+    """Stop calling a hook added with `add_metrics_hook`."""
+    _hooks.remove(hook)
+
+
+def is_recording() -> bool:
+    return _registry is not None or bool(_hooks)
+
+
+def _emit(event: MetricEvent) -> None:
+    registry = _registry
+    if registry is not None:
+        registry.record(event)
+    for hook in list(_hooks):
+        # A failing hook (e.g. an unreachable metrics exporter) must not fail the instrumented code
+        try:
+            hook(event)
+        except Exception as e:
+            warnings.warn(f'Metrics hook {hook!r} failed on {event.name}: {e!r}', RuntimeWarning, stacklevel=2)
+
+
+def increment(name: str, value: float = 1, **labels: str) -> None:
+    """Increment a counter."""
+    if is_recording():
+        _emit(MetricEvent('counter', name, value, labels))
+
+
+def set_gauge(name: str, value: float, **labels: str) -> None:
+    """Set a gauge."""
+    if is_recording():
+        _emit(MetricEvent('gauge', name, value, labels))
+
+
+def observe(name: str, seconds: float, **labels: str) -> None:
+    """Record a duration."""
+    if is_recording():
+        _emit(MetricEvent('timer', name, seconds, labels))
+
+
+@contextmanager
+def timer(name: str, **labels: str) -> Iterator[None]:
+    """Record the duration of a block (including blocks raising an exception)."""
+    if not is_recording():
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+
+def record_retry(name: str) -> Callable:
+    """Make a tenacity `before_sleep` callback incrementing the counter `name` on each retry."""
+
+    def before_sleep(retry_state: object) -> None:
+        increment(name)
+
+    return before_sleep
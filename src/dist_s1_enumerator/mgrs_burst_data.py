@@ -1,15 +1,31 @@
-from functools import lru_cache
+import os
+import tempfile
+from functools import cached_property, lru_cache
 from pathlib import Path
+from warnings import warn
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import shapely
 from shapely.geometry import Point, Polygon
 
-from dist_s1_enumerator.exceptions import NoMGRSCoverage
-from dist_s1_enumerator.tabular_models import burst_mgrs_lut_schema, burst_schema, mgrs_tile_schema, reorder_columns
+from dist_s1_enumerator.metrics import increment, timer
+from dist_s1_enumerator.tabular_models import (
+    burst_mgrs_lut_schema,
+    burst_schema,
+    mgrs_tile_schema,
+    reorder_columns,
+    validate_df,
+)
 
 
 DATA_DIR = Path(__file__).resolve().parent / 'data'
+# Rows per row group of the burst geometry table (there are ~1,800 bursts per track in the lookup table)
+BURST_TABLE_ROW_GROUP_SIZE = 2_048
 
 
 def get_mgrs_burst_lut_path() -> Path:
@@ -23,55 +39,400 @@ def get_mgrs_data_path() -> Path:
 
 
 def get_burst_data_path() -> Path:
+    """Get the burst geometry table: the packaged one if present, otherwise the one built by `build_burst_table`."""
     parquet_path = DATA_DIR / 'jpl_burst_geo.parquet'
-    return parquet_path
+    if parquet_path.exists():
+        return parquet_path
+    return get_cache_dir() / 'jpl_burst_geo.parquet'
+
+
+def build_burst_table(
+    source_path: Path | str, out_path: Path | str | None = None, row_group_size: int = BURST_TABLE_ROW_GROUP_SIZE
+) -> Path:
+    """Build the burst geometry table from burst footprints, e.g. those of the OPERA burst database.
+
+    The source is any file readable by geopandas (parquet or e.g. GeoPackage/GeoJSON) with the JPL burst ids in a
+    `jpl_burst_id` or `burst_id_jpl` column (either `T001-000696-IW1` or `t001_000696_iw1`). Only the bursts in the
+    MGRS/burst lookup table are kept. The rows are sorted by burst id (and so by track number) and written with a
+    `track_number` column in row groups of `row_group_size` rows, so reading the bursts of a few tracks only reads
+    the row groups of these tracks.
+
+    Parameters
+    ----------
+    source_path : Path | str
+    out_path : Path | str, optional
+        By default `jpl_burst_geo.parquet` in the cache directory (where `get_burst_table` reads it).
+    row_group_size : int, optional
+
+    Returns
+    -------
+    Path
+        The path of the table; it is written next to it and renamed into place.
+    """
+    source_path = Path(source_path)
+    out_path = Path(out_path) if out_path is not None else get_cache_dir() / 'jpl_burst_geo.parquet'
+    if source_path.suffix == '.parquet':
+        df = gpd.read_parquet(source_path)
+    else:
+        df = gpd.read_file(source_path)
+    if 'jpl_burst_id' not in df.columns:
+        df = df.rename(columns={'burst_id_jpl': 'jpl_burst_id'})
+    df['jpl_burst_id'] = df.jpl_burst_id.str.upper().str.replace('_', '-')
+    df = df.set_crs(epsg=4326) if df.crs is None else df.to_crs(epsg=4326)
+
+    lut_burst_ids = get_mgrs_burst_lut_index().table.column('jpl_burst_id').chunk(0).dictionary.to_pandas()
+    df = df[df.jpl_burst_id.isin(lut_burst_ids)]
+    df = df.drop_duplicates(subset=['jpl_burst_id']).sort_values('jpl_burst_id').reset_index(drop=True)
+    df['track_number'] = df.jpl_burst_id.str[1:4].astype(int)
+    df = df[['jpl_burst_id', 'track_number', 'geometry']]
+    validate_df(df, burst_schema)
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=out_path.parent, suffix='.parquet.tmp', delete=False) as f:
+        tmp_path = Path(f.name)
+    try:
+        df.to_parquet(tmp_path, index=False, row_group_size=row_group_size)
+        tmp_path.replace(out_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return out_path
+
+
+@lru_cache(maxsize=256)
+def _read_burst_track(parquet_path: Path, mtime_ns: int, track_number: int) -> pa.Table:
+    """Read the burst ids and WKB footprints of a track (only the row groups whose statistics include the track)."""
+    with timer('lut_read_seconds', table='burst'):
+        return pq.read_table(
+            parquet_path, columns=['jpl_burst_id', 'geometry'], filters=[('track_number', '==', track_number)]
+        )
+
+
+@lru_cache
+def _get_burst_table_columns(parquet_path: Path, mtime_ns: int) -> list[str]:
+    return pq.read_schema(parquet_path).names
 
 
 def get_burst_table(burst_ids: list[str] | str | None = None) -> gpd.GeoDataFrame:
+    """Get the geometries of bursts (all of them if `burst_ids` is None) from the burst geometry table.
+
+    With a table built by `build_burst_table`, only the row groups of the tracks of the burst ids are read. The burst
+    ids and (WKB) footprints of each track read are cached for the following lookups and only the footprints of the
+    requested bursts are decoded.
+    """
     parquet_path = get_burst_data_path()
+    if not parquet_path.exists():
+        raise FileNotFoundError(
+            f'No burst geometry table at {parquet_path}; build it from burst footprints with `build_burst_table`.'
+        )
+    mtime_ns = parquet_path.stat().st_mtime_ns
     if burst_ids is None:
-        df = gpd.read_parquet(parquet_path)
+        with timer('lut_read_seconds', table='burst'):
+            df = gpd.read_parquet(parquet_path)
     else:
         if isinstance(burst_ids, str):
             burst_ids = [burst_ids]
-        filters = [('jpl_burst_id', 'in', burst_ids)]
-        df = gpd.read_parquet(parquet_path, filters=filters)
+        if 'track_number' in _get_burst_table_columns(parquet_path, mtime_ns):
+            track_numbers = sorted({int(burst_id[1:4]) for burst_id in burst_ids if burst_id[1:4].isdigit()})
+            tables = [_read_burst_track(parquet_path, mtime_ns, track_number) for track_number in track_numbers]
+            if not tables:
+                # No burst id has a track number
+                tables = [pa.table({'jpl_burst_id': pa.array([], pa.string()), 'geometry': pa.array([], pa.binary())})]
+            table = pa.concat_tables(tables)
+            table = table.filter(pc.is_in(table.column('jpl_burst_id'), pa.array(burst_ids, type=pa.string())))
+            # Only the footprints of the requested bursts are decoded
+            df = gpd.GeoDataFrame(
+                {'jpl_burst_id': table.column('jpl_burst_id').to_pandas()},
+                geometry=shapely.from_wkb(table.column('geometry').to_numpy(zero_copy_only=False)),
+                crs='EPSG:4326',
+            )
+        else:
+            filters = [('jpl_burst_id', 'in', burst_ids)]
+            with timer('lut_read_seconds', table='burst'):
+                df = gpd.read_parquet(parquet_path, filters=filters)
     if df.empty:
         burst_ids_str = ', '.join(map(str, burst_ids))
         raise ValueError(f'No burst data found for {burst_ids_str}.')
-    burst_schema.validate(df)
+    # Track numbers are joined from the MGRS/burst lookup table (see `get_burst_table_from_mgrs_tiles`)
+    df = df.drop(columns=['track_number'], errors='ignore').reset_index(drop=True)
+    validate_df(df, burst_schema)
     df = reorder_columns(df, burst_schema)
-    return df.reset_index(drop=True)
+    return df
 
 
 @lru_cache
 def get_mgrs_burst_lut() -> gpd.GeoDataFrame:
-    parquet_path = get_mgrs_burst_lut_path()
-    df = pd.read_parquet(parquet_path)
-    burst_mgrs_lut_schema.validate(df)
-    df = reorder_columns(df, burst_mgrs_lut_schema)
-    return df.reset_index(drop=True)
+    """Get the MGRS/burst lookup table with string ids (decoded from the memory-mapped Arrow table)."""
+    return get_mgrs_burst_lut_index().df
+
+
+def get_cache_dir() -> Path:
+    """Get the directory of the files derived from the package data (`DIST_S1_ENUMERATOR_CACHE_DIR` if set)."""
+    cache_dir = os.environ.get('DIST_S1_ENUMERATOR_CACHE_DIR')
+    return Path(cache_dir) if cache_dir else Path.home() / '.cache' / 'dist_s1_enumerator'
+
+
+def get_mgrs_burst_lut_arrow_path() -> Path:
+    """Get the path of the Arrow version of the MGRS/burst lookup table, which is specific to the parquet file."""
+    stat = get_mgrs_burst_lut_path().stat()
+    return get_cache_dir() / f'mgrs_burst_lookup_table_{stat.st_size}_{stat.st_mtime_ns}.arrow'
+
+
+def _get_int_type(values: np.ndarray) -> pa.DataType:
+    for int_type in [pa.int8(), pa.int16(), pa.int32()]:
+        info = np.iinfo(int_type.to_pandas_dtype())
+        if values.size == 0 or (values.min() >= info.min and values.max() <= info.max):
+            return int_type
+    return pa.int64()
+
+
+def encode_mgrs_burst_lut(df_lut: pd.DataFrame) -> pa.Table:
+    """Encode the MGRS/burst lookup table compactly for Arrow.
+
+    Columns are ordered as in `burst_mgrs_lut_schema`. String columns are dictionary encoded with sorted dictionaries
+    (so a code orders like its string) and integer columns use the smallest integer type holding their values.
+    """
+    columns = {}
+    for column, values in reorder_columns(df_lut, burst_mgrs_lut_schema).items():
+        if pd.api.types.is_integer_dtype(values):
+            values = values.to_numpy()
+            columns[column] = pa.array(values, type=_get_int_type(values))
+        else:
+            categorical = pd.Categorical(values)
+            columns[column] = pa.DictionaryArray.from_arrays(
+                categorical.codes, pa.array(categorical.categories.to_numpy(dtype=object), type=pa.string())
+            )
+    return pa.table(columns)
+
+
+def build_mgrs_burst_lut_arrow(out_path: Path) -> Path:
+    """Write the validated and encoded MGRS/burst lookup table to an (uncompressed) Arrow IPC file.
+
+    The file is written next to out_path and renamed into place, so concurrent builds by several processes are safe.
+    """
+    df = pd.read_parquet(get_mgrs_burst_lut_path())
+    validate_df(df, burst_mgrs_lut_schema)
+    table = encode_mgrs_burst_lut(df)
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=out_path.parent, suffix='.arrow.tmp', delete=False) as f:
+        tmp_path = Path(f.name)
+    try:
+        with pa.OSFile(str(tmp_path), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        tmp_path.replace(out_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return out_path
+
+
+@lru_cache
+def read_mgrs_burst_lut_table() -> pa.Table:
+    """Get the encoded MGRS/burst lookup table memory-mapped from its Arrow file (built on first use).
+
+    The columns are views of the mapped file, so the processes of a worker pool share a single copy of the table in
+    the page cache. If the cache directory is not writable, the table is encoded in memory instead.
+    """
+    arrow_path = get_mgrs_burst_lut_arrow_path()
+    with timer('lut_read_seconds', table='mgrs_burst_lut'):
+        if not arrow_path.exists():
+            try:
+                build_mgrs_burst_lut_arrow(arrow_path)
+            except OSError as e:
+                warn(f'Could not write {arrow_path} ({e}); the MGRS/burst lookup table is not memory-mapped.')
+                df = pd.read_parquet(get_mgrs_burst_lut_path())
+                validate_df(df, burst_mgrs_lut_schema)
+                return encode_mgrs_burst_lut(df)
+        return pa.ipc.open_file(pa.memory_map(str(arrow_path), 'r')).read_all()
+
+
+class HashIndex:
+    """Map each distinct value of a column to the (increasing) positions of its rows.
+
+    Positions are stored grouped by value so the rows of one value are a slice of a single array.
+    """
+
+    def __init__(self, values: np.ndarray | pd.Series) -> None:
+        row_codes, uniques = pd.factorize(values)
+        self._set_positions(row_codes, uniques)
+
+    @classmethod
+    def from_codes(cls, row_codes: np.ndarray, uniques: np.ndarray | list) -> 'HashIndex':
+        """Index already encoded values, e.g. dictionary codes with row_codes[i] the code of uniques for row i."""
+        index = cls.__new__(cls)
+        index._set_positions(row_codes, uniques)
+        return index
+
+    def _set_positions(self, row_codes: np.ndarray, uniques: np.ndarray | list) -> None:
+        self.row_codes = row_codes
+        # Positions fit in 32 bits (the MGRS/burst table has ~1M rows)
+        self.positions = np.argsort(row_codes, kind='stable').astype(np.int32 if row_codes.size < 2**31 else np.int64)
+        self.positions.flags.writeable = False
+        self.offsets = np.zeros(len(uniques) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(row_codes, minlength=len(uniques)), out=self.offsets[1:])
+        self.codes = dict(zip(list(uniques), range(len(uniques))))
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.codes
+
+    def get(self, key: object) -> np.ndarray:
+        """Get the row positions of a value (empty if the value is not in the index)."""
+        code = self.codes.get(key)
+        if code is None:
+            return self.positions[:0]
+        return self.positions[self.offsets[code] : self.offsets[code + 1]]
+
+    def get_many(self, keys: list) -> np.ndarray:
+        """Get the row positions of several values in increasing order."""
+        if len(keys) == 1:
+            return self.get(keys[0])
+        return np.sort(np.concatenate([self.get(key) for key in keys] + [self.positions[:0]]))
+
+
+class MgrsBurstLut:
+    """The MGRS/burst lookup table as an Arrow table (see `encode_mgrs_burst_lut`) with hash indexes.
+
+    Rows can be looked up by `mgrs_tile_id`, `jpl_burst_id`, `track_number` and (`mgrs_tile_id`,
+    `acq_group_id_within_mgrs_tile`). Lookups run on the dictionary codes and integer columns of the table and return
+    row positions in table order; the indexes are built on first use. Strings are only decoded for the rows returned
+    by `take` (or all of them by `df`).
+    """
+
+    index_columns = ('mgrs_tile_id', 'jpl_burst_id', 'track_number', 'acq_group_id_within_mgrs_tile')
+
+    def __init__(self, lut: pa.Table | pd.DataFrame) -> None:
+        if isinstance(lut, pd.DataFrame):
+            lut = encode_mgrs_burst_lut(lut.reset_index(drop=True))
+        self.table = lut.combine_chunks()
+        self._indexes = {}
+
+    def __len__(self) -> int:
+        return self.table.num_rows
+
+    def get_codes(self, column: str) -> np.ndarray:
+        """Get the dictionary codes (or values for integer columns) of a column without copying them."""
+        values = self.table.column(column).chunk(0)
+        if pa.types.is_dictionary(values.type):
+            values = values.indices
+        return values.to_numpy(zero_copy_only=True)
+
+    def decode(self, column: str, codes: np.ndarray) -> list:
+        """Get the values of dictionary codes (e.g. from `get_codes`) of a column."""
+        dictionary = self.table.column(column).chunk(0).dictionary
+        return dictionary.take(pa.array(codes, type=pa.int64())).to_pylist()
+
+    @cached_property
+    def df(self) -> pd.DataFrame:
+        """The full table with string ids."""
+        return self.take(np.arange(len(self)))
+
+    def get_index(self, column: str) -> HashIndex:
+        """Get the index of a column; the `acq_group_id_within_mgrs_tile` index is keyed by (mgrs_tile_id, id)."""
+        if column not in self.index_columns:
+            raise ValueError(f'No index for {column}. Must be one of: {", ".join(self.index_columns)}.')
+        if column not in self._indexes:
+            if column == 'acq_group_id_within_mgrs_tile':
+                # Keyed by integers combining the mgrs_tile_id code with the acq_group_id_within_mgrs_tile
+                tile_codes = self.get_index('mgrs_tile_id').row_codes.astype(np.int64)
+                acq_group_ids = self.get_codes('acq_group_id_within_mgrs_tile')
+                self._n_acq_group_ids = int(acq_group_ids.max()) + 1 if acq_group_ids.size else 1
+                self._indexes[column] = HashIndex(tile_codes * self._n_acq_group_ids + acq_group_ids)
+            elif pa.types.is_dictionary(self.table.schema.field(column).type):
+                dictionary = self.table.column(column).chunk(0).dictionary.to_pylist()
+                self._indexes[column] = HashIndex.from_codes(self.get_codes(column), dictionary)
+            else:
+                self._indexes[column] = HashIndex(self.get_codes(column))
+        return self._indexes[column]
+
+    def _get_acq_group_keys(self, acq_group_ids: list[tuple[str, int]]) -> list[int]:
+        index = self.get_index('acq_group_id_within_mgrs_tile')
+        tile_codes = self.get_index('mgrs_tile_id').codes
+        # Ids outside [0, n) would collide with the keys of the neighbouring tiles
+        keys = [
+            tile_codes[mgrs_tile_id] * self._n_acq_group_ids + acq_group_id
+            for (mgrs_tile_id, acq_group_id) in acq_group_ids
+            if mgrs_tile_id in tile_codes and 0 <= acq_group_id < self._n_acq_group_ids
+        ]
+        return [key for key in keys if key in index]
+
+    def get_positions(
+        self,
+        mgrs_tile_ids: list[str] | None = None,
+        jpl_burst_ids: list[str] | None = None,
+        track_numbers: list[int] | None = None,
+        acq_group_ids: list[tuple[str, int]] | None = None,
+    ) -> np.ndarray:
+        """Get the positions of the rows matching all of the provided keys in table order.
+
+        Parameters
+        ----------
+        mgrs_tile_ids : list[str], optional
+        jpl_burst_ids : list[str], optional
+        track_numbers : list[int], optional
+        acq_group_ids : list[tuple[str, int]], optional
+            Pairs of (mgrs_tile_id, acq_group_id_within_mgrs_tile).
+
+        Returns
+        -------
+        np.ndarray
+            Row positions into `df`; all rows if no keys are provided.
+        """
+        lookups = [
+            ('mgrs_tile_id', mgrs_tile_ids),
+            ('jpl_burst_id', jpl_burst_ids),
+            ('track_number', track_numbers),
+            ('acq_group_id_within_mgrs_tile', acq_group_ids),
+        ]
+        increment('lut_lookups_total', table='mgrs_burst_lut')
+        positions = None
+        for column, keys in lookups:
+            if keys is None:
+                continue
+            if isinstance(keys, str | int | tuple):
+                keys = [keys]
+            keys = list(keys)
+            if column == 'acq_group_id_within_mgrs_tile':
+                keys = self._get_acq_group_keys(keys)
+            positions_for_keys = self.get_index(column).get_many(keys)
+            if positions is None:
+                positions = positions_for_keys
+            else:
+                positions = np.intersect1d(positions, positions_for_keys, assume_unique=True)
+        if positions is None:
+            positions = np.arange(len(self))
+        return positions
+
+    def take(self, positions: np.ndarray) -> pd.DataFrame:
+        """Get the rows of the table at the positions with string ids and int64 integers (`burst_mgrs_lut_schema`)."""
+        table = self.table.take(pa.array(positions, type=pa.int64()))
+        columns = [
+            values.cast(pa.string() if pa.types.is_dictionary(values.type) else pa.int64()) for values in table.columns
+        ]
+        return pa.table(columns, names=table.column_names).to_pandas()
+
+
+@lru_cache
+def get_mgrs_burst_lut_index() -> MgrsBurstLut:
+    """Get the MGRS/burst lookup table memory-mapped once per process with its hash indexes."""
+    return MgrsBurstLut(read_mgrs_burst_lut_table())
 
 
 def get_lut_by_mgrs_tile_ids(mgrs_tile_ids: str | list[str]) -> gpd.GeoDataFrame:
     if isinstance(mgrs_tile_ids, str):
         mgrs_tile_ids = [mgrs_tile_ids]
-    parquet_path = get_mgrs_burst_lut_path()
-    filters = [('mgrs_tile_id', 'in', mgrs_tile_ids)]
-    df_mgrs_burst_lut = pd.read_parquet(parquet_path, filters=filters)
+    lut = get_mgrs_burst_lut_index()
+    df_mgrs_burst_lut = lut.take(lut.get_positions(mgrs_tile_ids=mgrs_tile_ids))
     if df_mgrs_burst_lut.empty:
         mgrs_tile_ids_str = ', '.join(map(str, mgrs_tile_ids))
         raise ValueError(f'No LUT data found for MGRS tile ids {mgrs_tile_ids_str}.')
-    burst_mgrs_lut_schema.validate(df_mgrs_burst_lut)
-    df_mgrs_burst_lut = reorder_columns(df_mgrs_burst_lut, burst_mgrs_lut_schema)
-    return df_mgrs_burst_lut.reset_index(drop=True)
+    return df_mgrs_burst_lut
 
 
 @lru_cache
 def get_mgrs_table() -> gpd.GeoDataFrame:
     path = get_mgrs_data_path()
-    df_mgrs = gpd.read_parquet(path)
-    mgrs_tile_schema.validate(df_mgrs)
+    with timer('lut_read_seconds', table='mgrs'):
+        df_mgrs = gpd.read_parquet(path)
+    validate_df(df_mgrs, mgrs_tile_schema)
     df_mgrs = reorder_columns(df_mgrs, mgrs_tile_schema)
     return df_mgrs
 
@@ -88,71 +449,154 @@ def get_mgrs_tile_table_by_ids(mgrs_tile_ids: list[str]) -> gpd.GeoDataFrame:
     return df_mgrs_subset
 
 
+@lru_cache
+def get_mgrs_strtree() -> shapely.STRtree:
+    """Get the STRtree over the MGRS tile geometries (tree indices are row positions in `get_mgrs_table()`)."""
+    df_mgrs = get_mgrs_table()
+    return shapely.STRtree(df_mgrs.geometry.values)
+
+
+def get_mgrs_tile_ids_overlapping_geometries(geometries: list | np.ndarray | gpd.GeoSeries) -> pd.DataFrame:
+    """Find the MGRS tiles intersecting each of many geometries with one STRtree query.
+
+    Parameters
+    ----------
+    geometries : list | np.ndarray | gpd.GeoSeries
+        Shapely geometries in EPSG:4326.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns `geometry_index` (position of the geometry in the input) and `mgrs_tile_id`, with one row per
+        intersecting (geometry, MGRS tile) pair sorted by `geometry_index` and then by the MGRS table order. Geometries
+        that do not intersect any tile have no rows.
+    """
+    geometries = np.asarray(geometries, dtype=object)
+    geometry_index, tile_index = get_mgrs_strtree().query(geometries, predicate='intersects')
+    order = np.lexsort((tile_index, geometry_index))
+    mgrs_tile_ids = get_mgrs_table()['mgrs_tile_id'].to_numpy()
+    return pd.DataFrame(
+        {'geometry_index': geometry_index[order], 'mgrs_tile_id': mgrs_tile_ids[tile_index[order]]},
+    )
+
+
 def get_mgrs_tiles_overlapping_geometry(geometry: Polygon | Point) -> gpd.GeoDataFrame:
     df_mgrs = get_mgrs_table()
-    ind = df_mgrs.intersects(geometry)
-    if not ind.any():
+    tile_index = np.sort(get_mgrs_strtree().query(geometry, predicate='intersects'))
+    if tile_index.size == 0:
+        # Imported here as the exceptions module imports requests
+        from dist_s1_enumerator.exceptions import NoMGRSCoverage
+
         raise NoMGRSCoverage(
             'We only have MGRS tiles that overlap with DIST-HLS products (this is slightly less than Sentinel-2). '
         )
-    df_mgrs_overlapping = df_mgrs[ind].reset_index(drop=True)
-    mgrs_tile_schema.validate(df_mgrs_overlapping)
+    df_mgrs_overlapping = df_mgrs.take(tile_index).reset_index(drop=True)
+    validate_df(df_mgrs_overlapping, mgrs_tile_schema)
     df_mgrs_overlapping = reorder_columns(df_mgrs_overlapping, mgrs_tile_schema)
     return df_mgrs_overlapping
 
 
-def get_burst_ids_in_mgrs_tiles(mgrs_tile_ids: list[str] | str, track_numbers: list[int] = None) -> list[str]:
-    """Get all the burst ids in the provided MGRS tiles.
+def _get_pass_positions(
+    lut: MgrsBurstLut, mgrs_tile_ids: list[str], track_numbers: list[int] | None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Get the LUT rows of MGRS tiles (and of the pass of the tracks in each tile) with the index of their tile.
 
-    If track numbers are provided gets all the burst ids for the provided pass associated with the tracks
-    for each MGRS tile. Throws an error if there are multiple acq_group_id_within_mgrs_tile for a single MGRS tile.
+    Rows are ordered by the position of their tile in `mgrs_tile_ids` (which has no duplicates) and then in table
+    order. All tiles are joined at once on the integer codes of the table.
     """
-    df_mgrs_burst_luts = get_lut_by_mgrs_tile_ids(mgrs_tile_ids)
-    if isinstance(mgrs_tile_ids, str):
-        mgrs_tile_ids = [mgrs_tile_ids]
+    increment('lut_lookups_total', table='mgrs_burst_lut')
+    tile_index = lut.get_index('mgrs_tile_id')
+    positions = tile_index.get_many(mgrs_tile_ids)
+    if positions.size == 0:
+        mgrs_tile_ids_str = ', '.join(map(str, mgrs_tile_ids))
+        raise ValueError(f'No LUT data found for MGRS tile ids {mgrs_tile_ids_str}.')
+    if (track_numbers is not None) and (len(track_numbers) > 2):
+        raise ValueError(
+            'More than 2 track numbers provided. When track numbers are provided, we select data from a single '
+            'pass so this is an invalid input.'
+        )
+    # Index of the tile of each row in mgrs_tile_ids
+    tile_ranks = np.full(len(tile_index.codes), -1, dtype=np.int64)
+    requested_codes = np.array([tile_index.codes.get(mgrs_tile_id, -1) for mgrs_tile_id in mgrs_tile_ids])
+    tile_ranks[requested_codes[requested_codes >= 0]] = np.flatnonzero(requested_codes >= 0)
+    row_tile_ranks = tile_ranks[tile_index.row_codes[positions]]
+
     if track_numbers is not None:
-        if len(track_numbers) > 2:
-            raise ValueError(
-                'More than 2 track numbers provided. When track numbers are provided, we select data from a single '
-                'pass so this is an invalid input.'
-            )
-        tile_data = []
-        for mgrs_tile_id in mgrs_tile_ids:
-            ind_temp = (df_mgrs_burst_luts.mgrs_tile_id == mgrs_tile_id) & (
-                df_mgrs_burst_luts.track_number.isin(track_numbers)
-            )
-            df_lut_temp = df_mgrs_burst_luts[ind_temp].reset_index(drop=True)
-            if df_lut_temp.empty:
+        acq_group_ids = lut.get_codes('acq_group_id_within_mgrs_tile')[positions].astype(np.int64)
+        row_track_numbers = lut.get_codes('track_number')[positions]
+        in_tracks = np.isin(row_track_numbers, track_numbers)
+        # Distinct (tile, acq_group_id_within_mgrs_tile) pairs of the tracks
+        n_acq_group_ids = int(acq_group_ids.max()) + 1
+        pass_keys = np.unique(row_tile_ranks[in_tracks] * n_acq_group_ids + acq_group_ids[in_tracks])
+        n_passes = np.bincount(pass_keys // n_acq_group_ids, minlength=len(mgrs_tile_ids))
+
+        invalid_tiles = np.flatnonzero(n_passes != 1)
+        if invalid_tiles.size:
+            k = invalid_tiles[0]
+            track_numbers_str = ', '.join(map(str, track_numbers))
+            if n_passes[k] == 0:
                 mgrs_tile_ids_str = ', '.join(map(str, mgrs_tile_ids))
-                track_numbers_str = ', '.join(map(str, track_numbers))
-                available_track_numbers = (
-                    df_mgrs_burst_luts[df_mgrs_burst_luts.mgrs_tile_id == mgrs_tile_id].track_number.unique().tolist()
-                )
+                available_track_numbers = pd.unique(row_track_numbers[row_tile_ranks == k]).tolist()
                 available_track_numbers_str = ', '.join(map(str, available_track_numbers))
                 raise ValueError(
                     f'Mismatch - no LUT data found for MGRS tile ids {mgrs_tile_ids_str} '
                     f'and track numbers {track_numbers_str}. '
                     f'Available track numbers for tile {mgrs_tile_ids_str} are {available_track_numbers_str}.'
                 )
-            acq_ids = df_lut_temp.acq_group_id_within_mgrs_tile.unique().tolist()
-            if len(acq_ids) != 1:
-                track_numbers_str = ', '.join(map(str, track_numbers))
-                raise ValueError(
-                    f'Multiple acq_group_id_within_mgrs_tile found for mgrs_tile_id {mgrs_tile_id} and '
-                    f'track_numbers {track_numbers_str}.'
-                )
-            acq_id = acq_ids[0]
-            df_lut_pass = df_mgrs_burst_luts[df_mgrs_burst_luts.acq_group_id_within_mgrs_tile == acq_id].reset_index(
-                drop=True
+            raise ValueError(
+                f'Multiple acq_group_id_within_mgrs_tile found for mgrs_tile_id {mgrs_tile_ids[k]} and '
+                f'track_numbers {track_numbers_str}.'
             )
-            tile_data.append(df_lut_pass)
-        df_mgrs_burst_luts = pd.concat(tile_data, axis=0)
-        # Remove duplicates if sequential track numbers are provided.
-        df_mgrs_burst_luts = df_mgrs_burst_luts.drop_duplicates().reset_index(drop=True)
+        # All the bursts of the pass of each tile (including the other track of a pass crossing the equator)
+        in_pass = np.isin(row_tile_ranks * n_acq_group_ids + acq_group_ids, pass_keys)
+        positions = positions[in_pass]
+        row_tile_ranks = row_tile_ranks[in_pass]
+        order = np.argsort(row_tile_ranks, kind='stable')
+        positions = positions[order]
+        row_tile_ranks = row_tile_ranks[order]
 
-    df_mgrs_burst_luts = df_mgrs_burst_luts.drop_duplicates(subset=['jpl_burst_id', 'mgrs_tile_id'])
-    burst_ids = df_mgrs_burst_luts.jpl_burst_id.unique().tolist()
-    return burst_ids
+    return positions, row_tile_ranks
+
+
+def get_burst_ids_in_mgrs_tiles(mgrs_tile_ids: list[str] | str, track_numbers: list[int] = None) -> list[str]:
+    """Get all the burst ids in the provided MGRS tiles.
+
+    If track numbers are provided gets all the burst ids for the provided pass associated with the tracks
+    for each MGRS tile. Throws an error if there are multiple acq_group_id_within_mgrs_tile for a single MGRS tile.
+    """
+    if isinstance(mgrs_tile_ids, str):
+        mgrs_tile_ids = [mgrs_tile_ids]
+    mgrs_tile_ids = list(dict.fromkeys(mgrs_tile_ids))
+    lut = get_mgrs_burst_lut_index()
+    positions, _ = _get_pass_positions(lut, mgrs_tile_ids, track_numbers)
+    burst_codes = pd.unique(lut.get_codes('jpl_burst_id')[positions])
+    return lut.decode('jpl_burst_id', burst_codes)
+
+
+def get_burst_ids_by_mgrs_tile(
+    mgrs_tile_ids: list[str] | str, track_numbers: list[int] | None = None
+) -> dict[str, list[str]]:
+    """Get the burst ids of each MGRS tile (as in `get_burst_ids_in_mgrs_tiles`) in a single lookup.
+
+    Tiles are in the order of `mgrs_tile_ids` and tiles not in the lookup table have no burst ids. Errors are the same
+    as in `get_burst_ids_in_mgrs_tiles`.
+    """
+    if isinstance(mgrs_tile_ids, str):
+        mgrs_tile_ids = [mgrs_tile_ids]
+    mgrs_tile_ids = list(dict.fromkeys(mgrs_tile_ids))
+    lut = get_mgrs_burst_lut_index()
+    positions, row_tile_ranks = _get_pass_positions(lut, mgrs_tile_ids, track_numbers)
+    # Sort by tile keeping the table order within each tile, then keep the first row of each (tile, burst)
+    order = np.argsort(row_tile_ranks, kind='stable')
+    row_tile_ranks = row_tile_ranks[order]
+    burst_codes = lut.get_codes('jpl_burst_id')[positions[order]].astype(np.int64)
+    _, first_rows = np.unique(row_tile_ranks * (int(burst_codes.max()) + 1) + burst_codes, return_index=True)
+    first_rows.sort()
+    burst_ids = lut.decode('jpl_burst_id', burst_codes[first_rows])
+    tile_offsets = np.searchsorted(row_tile_ranks[first_rows], np.arange(len(mgrs_tile_ids) + 1))
+    return {
+        mgrs_tile_id: burst_ids[tile_offsets[k] : tile_offsets[k + 1]] for k, mgrs_tile_id in enumerate(mgrs_tile_ids)
+    }
 
 
 def get_burst_table_from_mgrs_tiles(mgrs_tile_ids: str | list[str]) -> list:
@@ -165,6 +609,6 @@ def get_burst_table_from_mgrs_tiles(mgrs_tile_ids: str | list[str]) -> list:
         how='left',
         on='jpl_burst_id',
     )
-    burst_schema.validate(df_burst)
+    validate_df(df_burst, burst_schema)
     df_burst = reorder_columns(df_burst, burst_schema)
     return df_burst.reset_index(drop=True)
@@ -0,0 +1,160 @@
+import asyncio
+import concurrent.futures
+from pathlib import Path
+
+import aiohttp
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+from tqdm.auto import tqdm
+
+from dist_s1_enumerator.exceptions import IncompleteDownloadError
+from dist_s1_enumerator.metrics import record_retry
+from dist_s1_enumerator.rtc_s1_io import (
+    DownloadedBytes,
+    finalize_download,
+    get_head_size,
+    get_partial_download_path,
+    get_total_size,
+    read_verified_size,
+    record_downloaded_bytes,
+    write_verified_size,
+)
+
+
+def create_async_download_session(
+    max_connections: int = 256, max_connections_per_host: int = 64
+) -> aiohttp.ClientSession:
+    """Create an aiohttp session for downloads; must be called from within a running event loop.
+
+    Args:
+        max_connections: Total number of open connections
+        max_connections_per_host: Number of open connections to a single host
+    """
+    connector = aiohttp.TCPConnector(limit=max_connections, limit_per_host=max_connections_per_host)
+    # Same (per read) timeouts as the requests session
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=30)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout, headers={'User-Agent': 'dist-s1-enumerator/1.0'})
+
+
+async def is_complete_download_async(url: str, out_path: Path, session: aiohttp.ClientSession) -> bool:
+    """Asynchronous version of `is_complete_download`."""
+    out_size = out_path.stat().st_size
+    verified_size = read_verified_size(out_path)
+    if verified_size is not None:
+        return verified_size == out_size
+    try:
+        async with session.head(url, allow_redirects=True) as r:
+            r.raise_for_status()
+            expected_size = get_head_size(r.headers, r.status)
+    except (TimeoutError, aiohttp.ClientError):
+        expected_size = None
+    if (expected_size is not None) and (expected_size != out_size):
+        return False
+    write_verified_size(out_path, out_size)
+    return True
+
+
+@retry(
+    retry=retry_if_exception_type((TimeoutError, aiohttp.ClientError, IncompleteDownloadError)),
+    stop=stop_after_attempt(5),
+    wait=wait_exponential(multiplier=1, min=1, max=10),
+    before_sleep=record_retry('download_retries_total'),
+    reraise=True,
+)
+async def localize_one_rtc_async(
+    url: str, out_path: Path, session: aiohttp.ClientSession, downloaded_bytes: DownloadedBytes | None = None
+) -> Path:
+    """Asynchronous version of `localize_one_rtc` (same partial downloads, size sidecars and retries)."""
+    if out_path.exists():
+        if await is_complete_download_async(url, out_path, session):
+            return out_path
+        out_path.unlink()
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    part_path = get_partial_download_path(out_path)
+    resume_from = part_path.stat().st_size if part_path.exists() else 0
+    headers = {'Range': f'bytes={resume_from}-'} if resume_from > 0 else {}
+
+    async with session.get(url, headers=headers) as r:
+        if r.status == 416:
+            expected_size = get_total_size(r.headers, r.status)
+            if expected_size != resume_from:
+                part_path.unlink()
+                raise IncompleteDownloadError(f'Could not resume the download of {url}; restarting.')
+        else:
+            r.raise_for_status()
+            expected_size = get_total_size(r.headers, r.status)
+            mode = 'ab' if r.status == 206 else 'wb'
+            # RTC-S1 files are small so the (buffered) writes do not hold up the event loop
+            n_bytes = 0
+            try:
+                with part_path.open(mode) as f:
+                    async for chunk in r.content.iter_chunked(65536):
+                        f.write(chunk)
+                        n_bytes += len(chunk)
+            finally:
+                record_downloaded_bytes(n_bytes, downloaded_bytes)
+
+    return finalize_download(url, out_path, expected_size)
+
+
+async def localize_rtc_files_async(
+    urls: list[str],
+    out_paths: list[Path],
+    max_concurrency: int = 256,
+    max_connections_per_host: int = 64,
+    tqdm_enabled: bool = True,
+    downloaded_bytes: DownloadedBytes | None = None,
+) -> list[Path]:
+    """Download files concurrently with up to `max_concurrency` streams in a single event loop."""
+    semaphore = asyncio.Semaphore(max_concurrency)
+    async with create_async_download_session(max_concurrency, max_connections_per_host) as session:
+
+        async def localize_one_rtc_bounded(url: str, out_path: Path) -> Path:
+            async with semaphore:
+                return await localize_one_rtc_async(url, out_path, session, downloaded_bytes)
+
+        tasks = [
+            asyncio.ensure_future(localize_one_rtc_bounded(url, out_path)) for url, out_path in zip(urls, out_paths)
+        ]
+        try:
+            with tqdm(
+                total=len(tasks), disable=not tqdm_enabled, desc='Downloading RTC-S1 burst data', dynamic_ncols=True
+            ) as pbar:
+                for task in asyncio.as_completed(tasks):
+                    await task
+                    pbar.update(1)
+        finally:
+            # Stop the remaining downloads if one fails after exhausting its retries
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    return [task.result() for task in tasks]
+
+
+def localize_rtc_files(
+    urls: list[str],
+    out_paths: list[Path],
+    max_concurrency: int = 256,
+    max_connections_per_host: int = 64,
+    tqdm_enabled: bool = True,
+    downloaded_bytes: DownloadedBytes | None = None,
+) -> list[Path]:
+    """Run `localize_rtc_files_async` to completion from synchronous code.
+
+    When called from a running event loop (e.g. a Jupyter notebook), the downloads run in a new event loop on a
+    separate thread.
+    """
+    coro = localize_rtc_files_async(
+        urls,
+        out_paths,
+        max_concurrency=max_concurrency,
+        max_connections_per_host=max_connections_per_host,
+        tqdm_enabled=tqdm_enabled,
+        downloaded_bytes=downloaded_bytes,
+    )
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
@@ -0,0 +1,154 @@
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from uuid import uuid4
+
+import geopandas as gpd
+import pandas as pd
+
+from dist_s1_enumerator.tabular_models import reorder_columns, rtc_s1_resp_schema, validate_df
+
+
+def get_track_number_from_burst_id(burst_id: str) -> int:
+    # JPL burst ids are of the form 'T064-135515-IW1'
+    return int(burst_id.split('-')[0][1:])
+
+
+class RtcS1MetadataCatalog:
+    """On-disk catalog of RTC-S1 metadata (rows of `rtc_s1_resp_schema`) keyed by `jpl_burst_id` and `acq_dt`.
+
+    The catalog is a directory of parquet files partitioned by track number, i.e. `<catalog_dir>/T064/part-*.parquet`.
+    Each sync appends a new part file per track with acquisitions newer than the latest acquisition already in the
+    catalog for each burst (its high-water mark), so repeated syncs only fetch new data from the search API.
+    """
+
+    def __init__(self, catalog_dir: Path | str) -> None:
+        self.catalog_dir = Path(catalog_dir)
+        self.catalog_dir.mkdir(parents=True, exist_ok=True)
+
+    def get_partition_dir(self, track_number: int) -> Path:
+        """Get the directory storing the RTC-S1 metadata of a track."""
+        return self.catalog_dir / f'T{track_number:03d}'
+
+    def get_partition_dirs(self, burst_ids: list[str]) -> list[Path]:
+        """Get the non-empty track directories that can contain the burst ids."""
+        track_numbers = sorted({get_track_number_from_burst_id(burst_id) for burst_id in burst_ids})
+        partition_dirs = [self.get_partition_dir(track_number) for track_number in track_numbers]
+        return [partition_dir for partition_dir in partition_dirs if any(partition_dir.glob('*.parquet'))]
+
+    def get_high_water_marks(self, burst_ids: list[str]) -> pd.Series:
+        """Get the latest acq_dt in the catalog for each burst id; bursts not in the catalog are omitted."""
+        filters = [('jpl_burst_id', 'in', burst_ids)]
+        dfs = [
+            pd.read_parquet(partition_dir, columns=['jpl_burst_id', 'acq_dt'], filters=filters)
+            for partition_dir in self.get_partition_dirs(burst_ids)
+        ]
+        if not dfs:
+            return pd.Series(dtype='datetime64[ns, UTC]', name='acq_dt')
+        df = pd.concat(dfs, axis=0)
+        return df.groupby('jpl_burst_id')['acq_dt'].max()
+
+    def write(self, df_rtc: gpd.GeoDataFrame) -> None:
+        """Append RTC-S1 metadata to the catalog (one new part file per track number)."""
+        if df_rtc.empty:
+            return
+        validate_df(df_rtc, rtc_s1_resp_schema)
+        df_rtc = reorder_columns(df_rtc, rtc_s1_resp_schema)
+        for track_number, df_track in df_rtc.groupby('track_number'):
+            partition_dir = self.get_partition_dir(int(track_number))
+            partition_dir.mkdir(parents=True, exist_ok=True)
+            # Write to a hidden file first so readers never see a partially written part file
+            part_name = f'part-{uuid4().hex}.parquet'
+            tmp_path = partition_dir / f'.{part_name}.tmp'
+            df_track.sort_values(by=['jpl_burst_id', 'acq_dt']).reset_index(drop=True).to_parquet(tmp_path)
+            tmp_path.replace(partition_dir / part_name)
+
+    def sync(
+        self,
+        burst_ids: list[str],
+        search_fn: Callable[..., gpd.GeoDataFrame] | None = None,
+    ) -> gpd.GeoDataFrame:
+        """Fetch and store the acquisitions newer than each burst's high-water mark.
+
+        Bursts without any data in the catalog are fetched over their full history. Bursts already in the catalog are
+        fetched in a single search starting at the earliest of their high-water marks and rows at or before a burst's
+        own high-water mark are dropped.
+
+        Parameters
+        ----------
+        burst_ids : list[str]
+            JPL burst ids to sync.
+        search_fn : Callable[..., gpd.GeoDataFrame], optional
+            Function with the signature of `get_rtc_s1_ts_metadata_by_burst_ids`, by default that function.
+
+        Returns
+        -------
+        gpd.GeoDataFrame
+            The new RTC-S1 metadata added to the catalog.
+        """
+        if search_fn is None:
+            from dist_s1_enumerator.asf import get_rtc_s1_ts_metadata_by_burst_ids as search_fn
+
+        if isinstance(burst_ids, str):
+            burst_ids = [burst_ids]
+        burst_ids = list(dict.fromkeys(burst_ids))
+        high_water_marks = self.get_high_water_marks(burst_ids)
+
+        new_burst_ids = [burst_id for burst_id in burst_ids if burst_id not in high_water_marks.index]
+        synced_burst_ids = [burst_id for burst_id in burst_ids if burst_id in high_water_marks.index]
+
+        dfs = []
+        if new_burst_ids:
+            dfs.append(search_fn(new_burst_ids))
+        if synced_burst_ids:
+            df_resp = search_fn(synced_burst_ids, start_acq_dt=high_water_marks[synced_burst_ids].min())
+            if not df_resp.empty:
+                ind_new = df_resp['acq_dt'] > df_resp['jpl_burst_id'].map(high_water_marks)
+                dfs.append(df_resp[ind_new])
+
+        dfs = [df for df in dfs if not df.empty]
+        if not dfs:
+            return gpd.GeoDataFrame(columns=rtc_s1_resp_schema.columns.keys())
+        df_new = pd.concat(dfs, axis=0).drop_duplicates(subset=['opera_id']).reset_index(drop=True)
+        self.write(df_new)
+        return df_new
+
+    def read(
+        self,
+        burst_ids: list[str],
+        start_acq_dt: str | datetime | pd.Timestamp | None = None,
+        stop_acq_dt: str | datetime | pd.Timestamp | None = None,
+        polarizations: str | None = None,
+    ) -> gpd.GeoDataFrame:
+        """Read RTC-S1 metadata from the catalog in the same format as `get_rtc_s1_ts_metadata_by_burst_ids`."""
+        if isinstance(burst_ids, str):
+            burst_ids = [burst_ids]
+        filters = [('jpl_burst_id', 'in', burst_ids)]
+        if start_acq_dt is not None:
+            filters.append(('acq_dt', '>=', pd.to_datetime(start_acq_dt, utc=True)))
+        if stop_acq_dt is not None:
+            filters.append(('acq_dt', '<=', pd.to_datetime(stop_acq_dt, utc=True)))
+
+        dfs = [gpd.read_parquet(partition_dir, filters=filters) for partition_dir in self.get_partition_dirs(burst_ids)]
+        dfs = [df for df in dfs if not df.empty]
+        if not dfs:
+            return gpd.GeoDataFrame(columns=rtc_s1_resp_schema.columns.keys())
+        df_rtc = pd.concat(dfs, axis=0).drop_duplicates(subset=['opera_id'])
+        if polarizations is not None:
+            df_rtc = df_rtc[df_rtc['polarizations'] == polarizations]
+        df_rtc = df_rtc.sort_values(by=['jpl_burst_id', 'acq_dt'], ascending=True).reset_index(drop=True)
+
+        validate_df(df_rtc, rtc_s1_resp_schema)
+        df_rtc = reorder_columns(df_rtc, rtc_s1_resp_schema)
+        return df_rtc
+
+    def compact(self) -> None:
+        """Rewrite each track partition as a single part file sorted by jpl_burst_id and acq_dt."""
+        for partition_dir in sorted(self.catalog_dir.glob('T*')):
+            part_paths = sorted(partition_dir.glob('part-*.parquet'))
+            if len(part_paths) < 2:
+                continue
+            df_track = gpd.read_parquet(partition_dir).drop_duplicates(subset=['opera_id'])
+            self.write(df_track)
+            for part_path in part_paths:
+                part_path.unlink()
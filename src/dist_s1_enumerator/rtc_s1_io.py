@@ -1,15 +1,20 @@
 import concurrent.futures
+import os
+import threading
+import time
+from collections.abc import Mapping
 from pathlib import Path
 
 import geopandas as gpd
 import requests
-from pandera.pandas import check_input
 from rasterio.errors import RasterioIOError
 from requests.exceptions import HTTPError, RequestException, Timeout
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 from tqdm.auto import tqdm
 
-from dist_s1_enumerator.tabular_models import rtc_s1_schema
+from dist_s1_enumerator.exceptions import IncompleteDownloadError
+from dist_s1_enumerator.metrics import increment, is_recording, observe, record_retry, set_gauge
+from dist_s1_enumerator.tabular_models import rtc_s1_schema, validate_input
 
 
 def generate_rtc_s1_local_paths(
@@ -77,65 +82,302 @@ def create_download_session(max_workers: int = 5) -> requests.Session:
     return session
 
 
+def get_partial_download_path(out_path: Path) -> Path:
+    return out_path.with_name(f'{out_path.name}.part')
+
+
+def get_size_sidecar_path(out_path: Path) -> Path:
+    return out_path.with_name(f'{out_path.name}.size')
+
+
+def read_verified_size(out_path: Path) -> int | None:
+    """Read the size recorded in the sidecar of a completed download (None if there is no sidecar)."""
+    sidecar_path = get_size_sidecar_path(out_path)
+    try:
+        return int(sidecar_path.read_text().strip())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def write_verified_size(out_path: Path, size: int) -> None:
+    sidecar_path = get_size_sidecar_path(out_path)
+    tmp_path = sidecar_path.with_name(f'{sidecar_path.name}.tmp')
+    tmp_path.write_text(str(size))
+    tmp_path.replace(sidecar_path)
+
+
+def get_total_size(headers: Mapping[str, str], status_code: int) -> int | None:
+    """Get the size of the whole file from the headers of a (partial) response - None if it is not reported."""
+    content_range = headers.get('Content-Range')
+    if content_range is not None:
+        # e.g. 'bytes 100-199/200' or 'bytes */200'
+        total = content_range.rsplit('/', 1)[-1]
+        return int(total) if total.isdigit() else None
+    if status_code == 200 and 'Content-Length' in headers:
+        return int(headers['Content-Length'])
+    return None
+
+
+def get_head_size(headers: Mapping[str, str], status_code: int) -> int | None:
+    """Get the size of a file from the headers of a HEAD response - None if it is not reported.
+
+    A HEAD request following redirects can end on an HTML page (e.g. a login page) whose size is not the file's.
+    """
+    if headers.get('Content-Type', '').startswith('text/html'):
+        return None
+    return get_total_size(headers, status_code)
+
+
+def is_complete_download(url: str, out_path: Path, session: requests.Session) -> bool:
+    """Check an existing file against its size sidecar or, if there is none, against the server's Content-Length."""
+    out_size = out_path.stat().st_size
+    verified_size = read_verified_size(out_path)
+    if verified_size is not None:
+        return verified_size == out_size
+    # Files localized before the size sidecars existed are trusted (as before) and adopted with a sidecar if the server
+    # cannot be asked, so the HEAD request is made once per file
+    try:
+        with session.head(url, allow_redirects=True, timeout=30) as r:
+            r.raise_for_status()
+            expected_size = get_head_size(r.headers, r.status_code)
+    except RequestException:
+        # e.g. presigned urls only allowing GET requests
+        expected_size = None
+    if (expected_size is not None) and (expected_size != out_size):
+        return False
+    write_verified_size(out_path, out_size)
+    return True
+
+
+class DownloadedBytes:
+    """Number of bytes downloaded by one `localize_rtc_s1_ts` call (shared by its download threads or tasks)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def add(self, n_bytes: int) -> None:
+        """Add the bytes received by a download."""
+        with self._lock:
+            self.value += n_bytes
+
+
+def record_downloaded_bytes(n_bytes: int, downloaded_bytes: DownloadedBytes | None = None) -> None:
+    increment('download_bytes_total', n_bytes)
+    if downloaded_bytes is not None:
+        downloaded_bytes.add(n_bytes)
+
+
+def finalize_download(url: str, out_path: Path, expected_size: int | None) -> Path:
+    """Rename a partial download to out_path (and record its size) if it has the size reported by the server."""
+    part_path = get_partial_download_path(out_path)
+    size = part_path.stat().st_size
+    if (expected_size is not None) and (size != expected_size):
+        if size > expected_size:
+            part_path.unlink()
+        raise IncompleteDownloadError(f'Downloaded {size} of {expected_size} bytes of {url}.')
+    part_path.replace(out_path)
+    write_verified_size(out_path, size)
+    increment('download_files_total')
+    return out_path
+
+
 @retry(
     retry=retry_if_exception_type((ConnectionError, HTTPError, RasterioIOError, Timeout, RequestException)),
     stop=stop_after_attempt(5),
     wait=wait_exponential(multiplier=1, min=1, max=10),
+    before_sleep=record_retry('download_retries_total'),
     reraise=True,
 )
-def localize_one_rtc(url: str, out_path: Path, session: requests.Session | None = None) -> Path:
-    """Download a single RTC file with retry logic."""
-    if out_path.exists():
-        return out_path
+def localize_one_rtc(
+    url: str,
+    out_path: Path,
+    session: requests.Session | None = None,
+    downloaded_bytes: DownloadedBytes | None = None,
+) -> Path:
+    """Download a single RTC file with retry logic.
 
+    The download is written to `<out_path>.part` and resumed from its current size with HTTP range requests, so
+    retries (and later calls after a crash) do not fetch completed bytes again. Once its size matches the size reported
+    by the server, it is renamed to `out_path` and the size is recorded in the `<out_path>.size` sidecar. An existing
+    `out_path` is only considered complete if its size matches the sidecar (or the server if there is no sidecar).
+    The bytes received (including those of failed attempts) are added to `downloaded_bytes` if provided.
+    """
     if session is None:
         session = create_download_session()
 
-    try:
-        with session.get(url, stream=True, timeout=30) as r:
+    if out_path.exists():
+        if is_complete_download(url, out_path, session):
+            return out_path
+        out_path.unlink()
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    part_path = get_partial_download_path(out_path)
+    resume_from = part_path.stat().st_size if part_path.exists() else 0
+    headers = {'Range': f'bytes={resume_from}-'} if resume_from > 0 else {}
+
+    with session.get(url, stream=True, timeout=30, headers=headers) as r:
+        if r.status_code == 416:
+            # The partial download may already be complete (e.g. interrupted before the rename)
+            expected_size = get_total_size(r.headers, r.status_code)
+            if expected_size != resume_from:
+                part_path.unlink()
+                raise IncompleteDownloadError(f'Could not resume the download of {url}; restarting.')
+        else:
             r.raise_for_status()
-            out_path.parent.mkdir(parents=True, exist_ok=True)
-            with out_path.open('wb') as f:
-                for chunk in r.iter_content(chunk_size=16384):
-                    if chunk:  # filter out keep-alive chunks
-                        f.write(chunk)
-    except Exception:
-        # Clean up partial file on failure
-        if out_path.exists():
-            out_path.unlink()
-        raise
+            expected_size = get_total_size(r.headers, r.status_code)
+            # 206 - the server honors the range; 200 - it sends the whole file
+            mode = 'ab' if r.status_code == 206 else 'wb'
+            n_bytes = 0
+            try:
+                with part_path.open(mode) as f:
+                    for chunk in r.iter_content(chunk_size=16384):
+                        if chunk:  # filter out keep-alive chunks
+                            f.write(chunk)
+                            n_bytes += len(chunk)
+            finally:
+                record_downloaded_bytes(n_bytes, downloaded_bytes)
+
+    return finalize_download(url, out_path, expected_size)
+
+
+def get_blob_paths(urls: list[str], blob_dir: Path | str) -> list[Path]:
+    """Get the paths of the RTC-S1 files in the blob store, which are keyed by OPERA file name."""
+    blob_dir = Path(blob_dir)
+    return [blob_dir / url.split('/')[-1] for url in urls]
+
+
+def link_to_blob(blob_path: Path, out_path: Path, link_mode: str = 'hardlink') -> Path:
+    """Expose a file of the blob store at out_path with a hardlink (or a symlink if hardlinks are not possible)."""
+    if link_mode not in ['hardlink', 'symlink']:
+        raise ValueError(f'Invalid link_mode: {link_mode}. Must be one of: hardlink, symlink.')
+    if out_path.exists() and out_path.samefile(blob_path):
+        return out_path
+    if out_path.exists() or out_path.is_symlink():
+        # A file that is no longer the blob (e.g. a truncated legacy file replaced in the blob store by a new
+        # download) or a broken symlink (e.g. the blob store was moved)
+        out_path.unlink()
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    if link_mode == 'hardlink':
+        try:
+            os.link(blob_path, out_path)
+        except OSError:
+            # e.g. the blob store and data_dir are on different file systems
+            out_path.symlink_to(blob_path.resolve())
+    else:
+        out_path.symlink_to(blob_path.resolve())
     return out_path
 
 
-@check_input(rtc_s1_schema, 0)
+@validate_input(rtc_s1_schema)
 def localize_rtc_s1_ts(
     df_rtc_ts: gpd.GeoDataFrame,
     data_dir: Path | str,
-    max_workers: int = 5,
+    max_workers: int | None = None,
     tqdm_enabled: bool = True,
+    blob_dir: Path | str | None = None,
+    link_mode: str = 'hardlink',
+    engine: str = 'threads',
+    max_connections_per_host: int = 64,
 ) -> gpd.GeoDataFrame:
+    """Download the RTC-S1 copol and crosspol files into `data_dir/<mgrs_tile_id>/<track_token>/<date>/`.
+
+    A burst can lie in several MGRS tiles, so each file is downloaded once into a blob store keyed by OPERA file name
+    and then linked into the directory of each MGRS tile.
+
+    Parameters
+    ----------
+    df_rtc_ts : gpd.GeoDataFrame
+        RTC-S1 metadata (`rtc_s1_schema`).
+    data_dir : Path | str
+        Directory to store the data in.
+    max_workers : int, optional
+        Number of concurrent downloads, by default 5 threads for the 'threads' engine and 256 streams for the 'asyncio'
+        engine.
+    tqdm_enabled : bool, optional
+        Whether to show a progress bar, by default True.
+    blob_dir : Path | str, optional
+        Directory of the blob store, by default `data_dir/blobs`.
+    link_mode : str, optional
+        'hardlink' (default, falls back to a symlink when a hardlink cannot be created) or 'symlink'.
+    engine : str, optional
+        'threads' (default) downloads with a thread pool sharing a `requests.Session`. 'asyncio' downloads with
+        `aiohttp` in a single event loop, which scales to hundreds of concurrent downloads of the small RTC-S1 files.
+    max_connections_per_host : int, optional
+        Maximum number of open connections to a single host for the 'asyncio' engine, by default 64.
+
+    Returns
+    -------
+    gpd.GeoDataFrame
+        `df_rtc_ts` with the local paths in `loc_path_copol` and `loc_path_crosspol`.
+    """
+    if link_mode not in ['hardlink', 'symlink']:
+        raise ValueError(f'Invalid link_mode: {link_mode}. Must be one of: hardlink, symlink.')
+    if engine not in ['threads', 'asyncio']:
+        raise ValueError(f'Invalid engine: {engine}. Must be one of: threads, asyncio.')
     df_out = append_local_paths(df_rtc_ts, data_dir)
-    urls = df_out['url_copol'].tolist() + df_out['url_crosspol'].tolist()
-    out_paths = df_out['loc_path_copol'].tolist() + df_out['loc_path_crosspol'].tolist()
-
-    # Create shared session for connection pooling, sized for concurrent workers
-    session = create_download_session(max_workers)
-
-    def localize_one_rtc_with_session(data: tuple) -> Path:
-        url, out_path = data
-        return localize_one_rtc(url, out_path, session)
-
-    disable_tqdm = not tqdm_enabled
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        _ = list(
-            tqdm(
-                executor.map(localize_one_rtc_with_session, zip(urls, out_paths)),
-                total=len(urls),
-                disable=disable_tqdm,
-                desc='Downloading RTC-S1 burst data',
-                dynamic_ncols=True,
-            )
+    blob_dir = Path(data_dir) / 'blobs' if blob_dir is None else Path(blob_dir)
+    blob_dir.mkdir(parents=True, exist_ok=True)
+
+    all_urls = df_out['url_copol'].tolist() + df_out['url_crosspol'].tolist()
+    all_out_paths = df_out['loc_path_copol'].tolist() + df_out['loc_path_crosspol'].tolist()
+    all_blob_paths = get_blob_paths(all_urls, blob_dir)
+
+    # Each blob is downloaded once - if it is missing but was localized before (without the blob store), adopt that file
+    blob_sources = {}
+    for url, out_path, blob_path in zip(all_urls, all_out_paths, all_blob_paths):
+        blob_sources.setdefault(blob_path, url)
+        if not blob_path.exists() and out_path.exists() and not out_path.is_symlink():
+            try:
+                os.link(out_path, blob_path)
+            except OSError:
+                pass
+    urls = list(blob_sources.values())
+    out_paths = list(blob_sources.keys())
+
+    # Counted per call rather than from the process-wide download_bytes_total counter, which concurrent calls share
+    downloaded_bytes = DownloadedBytes()
+    start = time.perf_counter()
+    if engine == 'asyncio':
+        # aiohttp is only needed (and imported) for the asyncio engine
+        from dist_s1_enumerator.rtc_s1_async_io import localize_rtc_files
+
+        localize_rtc_files(
+            urls,
+            out_paths,
+            max_concurrency=max_workers or 256,
+            max_connections_per_host=max_connections_per_host,
+            tqdm_enabled=tqdm_enabled,
+            downloaded_bytes=downloaded_bytes,
         )
+    else:
+        max_workers = max_workers or 5
+        # Create shared session for connection pooling, sized for concurrent workers
+        session = create_download_session(max_workers)
+
+        def localize_one_rtc_with_session(data: tuple) -> Path:
+            url, out_path = data
+            return localize_one_rtc(url, out_path, session, downloaded_bytes)
+
+        disable_tqdm = not tqdm_enabled
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            _ = list(
+                tqdm(
+                    executor.map(localize_one_rtc_with_session, zip(urls, out_paths)),
+                    total=len(urls),
+                    disable=disable_tqdm,
+                    desc='Downloading RTC-S1 burst data',
+                    dynamic_ncols=True,
+                )
+            )
+    elapsed = time.perf_counter() - start
+    observe('localize_seconds', elapsed)
+    if is_recording() and elapsed > 0:
+        set_gauge('download_throughput_bytes_per_second', downloaded_bytes.value / elapsed)
+
+    for out_path, blob_path in zip(all_out_paths, all_blob_paths):
+        link_to_blob(blob_path, out_path, link_mode=link_mode)
+
     # For serialization
     df_out['loc_path_copol'] = df_out['loc_path_copol'].astype(str)
     df_out['loc_path_crosspol'] = df_out['loc_path_crosspol'].astype(str)
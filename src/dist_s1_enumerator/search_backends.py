@@ -0,0 +1,332 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import asf_search as asf
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from asf_search.exceptions import ASFSearch5xxError
+from shapely.geometry import mapping
+
+from dist_s1_enumerator.metrics import increment, timer
+from dist_s1_enumerator.rtc_s1_catalog import get_track_number_from_burst_id
+from dist_s1_enumerator.tabular_models import rtc_s1_resp_schema
+
+
+# Number of results per page of CMR searches made by asf_search
+CMR_PAGE_SIZE = 250
+
+
+class SearchBackend(ABC):
+    """Interface of the RTC-S1 product searches made by `search_rtc_s1_products`.
+
+    `search` gets all the products of burst ids (in ASF syntax, e.g. `T064_135515_IW1`) acquired between two
+    (inclusive) dates. Products have the interface of `asf_search` products: a `properties` dict with at least
+    `sceneName`, `startTime`, `pathNumber`, `polarization`, `url` and `additionalUrls` and a `geojson()` method
+    returning a GeoJSON feature. Transient failures raise `ASFSearchError`, `CMRError` or `RequestException`, which
+    are retried by `search_rtc_s1_products`.
+    """
+
+    @abstractmethod
+    def search(self, burst_ids: list[str], start_acq_dt: datetime | None, stop_acq_dt: datetime | None) -> list:
+        """Get the products of the burst ids acquired between the dates (in any order; None for no bound)."""
+
+
+class ASFSearchBackend(SearchBackend):
+    """Search the ASF DAAC with `asf_search.geo_search` (the default backend)."""
+
+    def search(self, burst_ids: list[str], start_acq_dt: datetime | None, stop_acq_dt: datetime | None) -> list:
+        """Search ASF, raising `ASFSearchError` if the results are incomplete."""
+        resp = asf.geo_search(
+            operaBurstID=burst_ids,
+            processingLevel='RTC',
+            start=start_acq_dt,
+            end=stop_acq_dt,
+        )
+        resp.raise_if_incomplete()
+        return list(resp)
+
+
+class RtcS1Product:
+    """An RTC-S1 product with the `properties` and `geojson()` of an `asf_search` product."""
+
+    def __init__(self, properties: dict, geometry: object) -> None:
+        self.properties = properties
+        self.geometry = geometry
+
+    def geojson(self) -> dict:
+        """Return the product as a GeoJSON feature."""
+        return {'type': 'Feature', 'geometry': mapping(self.geometry), 'properties': self.properties}
+
+
+def get_product_properties(df_rtc: gpd.GeoDataFrame) -> list[dict]:
+    """Format rows of `rtc_s1_resp_schema` as the `properties` of `asf_search` products.
+
+    The urls of the copol and crosspol GeoTIFFs are completed by an HDF5 url as in ASF's responses.
+    """
+    asf_burst_ids = df_rtc['jpl_burst_id'].str.upper().str.replace('-', '_')
+    return pd.DataFrame(
+        {
+            'sceneName': df_rtc['opera_id'],
+            'operaBurstID': asf_burst_ids,
+            'startTime': df_rtc['acq_dt'].dt.tz_convert('UTC').dt.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'pathNumber': df_rtc['track_number'].astype(int),
+            'polarization': df_rtc['polarizations'].str.split('+'),
+            'url': df_rtc['url_copol'],
+            'additionalUrls': [
+                [url_crosspol, url_copol.replace('.tif', '.h5')]
+                for url_crosspol, url_copol in zip(df_rtc['url_crosspol'], df_rtc['url_copol'])
+            ],
+        }
+    ).to_dict(orient='records')
+
+
+class FakeSearchBackend(SearchBackend):
+    """In-process stand-in for the ASF search over recorded or synthetic RTC-S1 metadata.
+
+    The products are made from rows of `rtc_s1_resp_schema` (e.g. the parquet fixtures in `tests/data`; other columns
+    are ignored) with `get_product_properties`. Searches
+    are answered offline, optionally with simulated latency, paging and errors, so the chunking, caching and
+    concurrency of the search layer can be tested and load-tested without network.
+
+    Parameters
+    ----------
+    df_rtc_ts : gpd.GeoDataFrame
+        RTC-S1 metadata; rows are deduplicated by `opera_id`.
+    latency_seconds : float, optional
+        Time taken by every search.
+    page_latency_seconds : float, optional
+        Additional time taken by every page of results (at least one page per search).
+    page_size : int, optional
+        Number of results per page, by default 250 (as in CMR searches made by `asf_search`).
+    error_rate : float, optional
+        Probability that a search fails with `ASFSearch5xxError` (after its latency).
+    fail_first : int, optional
+        Number of searches failing with `ASFSearch5xxError` before any other search succeeds.
+    seed : int, optional
+        Seed of the random errors.
+
+    Attributes
+    ----------
+    calls : list[dict]
+        The `burst_ids`, `start_acq_dt`, `stop_acq_dt`, number of results (`n_products`, None if the search failed)
+        and `n_pages` of every search.
+    max_concurrent_searches : int
+        Largest number of searches that were running at the same time.
+    """
+
+    def __init__(
+        self,
+        df_rtc_ts: gpd.GeoDataFrame,
+        latency_seconds: float = 0.0,
+        page_latency_seconds: float = 0.0,
+        page_size: int = CMR_PAGE_SIZE,
+        error_rate: float = 0.0,
+        fail_first: int = 0,
+        seed: int | None = None,
+    ) -> None:
+        if page_size < 1:
+            raise ValueError('page_size must be a positive integer.')
+        if not 0 <= error_rate <= 1:
+            raise ValueError('error_rate must be between 0 and 1.')
+        df = df_rtc_ts.drop_duplicates(subset=['opera_id']).sort_values(by='acq_dt', kind='stable')
+        self.df_rtc_ts = df.reset_index(drop=True)
+        self.latency_seconds = latency_seconds
+        self.page_latency_seconds = page_latency_seconds
+        self.page_size = page_size
+        self.error_rate = error_rate
+        self.fail_first = fail_first
+        self.calls = []
+        self.max_concurrent_searches = 0
+
+        self._acq_dts = self.df_rtc_ts['acq_dt'].dt.tz_convert('UTC').dt.tz_localize(None).to_numpy()
+        asf_burst_ids = self.df_rtc_ts['jpl_burst_id'].str.upper().str.replace('-', '_')
+        # Product properties are formatted column-wise once rather than per search
+        self._properties = get_product_properties(self.df_rtc_ts)
+        self._geometries = self.df_rtc_ts.geometry.to_numpy()
+        # Positions of the products of each burst (in acquisition order)
+        self._positions = {
+            burst_id: np.asarray(positions)
+            for burst_id, positions in asf_burst_ids.groupby(asf_burst_ids).indices.items()
+        }
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+        self._n_concurrent_searches = 0
+
+    def get_product(self, position: int) -> RtcS1Product:
+        """Make the product of a row of `df_rtc_ts`."""
+        # Copied so that callers modifying a product do not change later responses
+        properties = dict(self._properties[position])
+        properties['polarization'] = list(properties['polarization'])
+        properties['additionalUrls'] = list(properties['additionalUrls'])
+        return RtcS1Product(properties, self._geometries[position])
+
+    def get_positions(
+        self, burst_ids: list[str], start_acq_dt: datetime | None, stop_acq_dt: datetime | None
+    ) -> np.ndarray:
+        """Get the rows of `df_rtc_ts` answering a search (in acquisition order)."""
+        positions = [self._positions.get(burst_id.upper().replace('-', '_')) for burst_id in burst_ids]
+        positions = [p for p in positions if p is not None]
+        if not positions:
+            return np.empty(0, dtype=np.int64)
+        positions = np.sort(np.concatenate(positions))
+        start, stop = (
+            None if dt is None else pd.to_datetime(dt, utc=True).tz_localize(None).to_datetime64()
+            for dt in (start_acq_dt, stop_acq_dt)
+        )
+        # ASF accepts swapped start and stop dates
+        if (start is not None) and (stop is not None) and (start > stop):
+            start, stop = stop, start
+        acq_dts = self._acq_dts[positions]
+        ind = np.ones(positions.size, dtype=bool)
+        if start is not None:
+            ind &= acq_dts >= start
+        if stop is not None:
+            ind &= acq_dts <= stop
+        return positions[ind]
+
+    def search(self, burst_ids: list[str], start_acq_dt: datetime | None, stop_acq_dt: datetime | None) -> list:
+        """Answer a search like `ASFSearchBackend` after the simulated latency (raising the simulated errors)."""
+        with self._lock:
+            self._n_concurrent_searches += 1
+            self.max_concurrent_searches = max(self.max_concurrent_searches, self._n_concurrent_searches)
+            fails = len(self.calls) < self.fail_first or self._rng.random() < self.error_rate
+            call = {'burst_ids': list(burst_ids), 'start_acq_dt': start_acq_dt, 'stop_acq_dt': stop_acq_dt}
+            self.calls.append(call)
+        try:
+            positions = self.get_positions(burst_ids, start_acq_dt, stop_acq_dt)
+            n_pages = max(1, -(-len(positions) // self.page_size))
+            call.update(n_products=None if fails else len(positions), n_pages=n_pages)
+            delay = self.latency_seconds + n_pages * self.page_latency_seconds
+            if delay > 0:
+                time.sleep(delay)
+            if fails:
+                raise ASFSearch5xxError('Simulated search failure')
+            return [self.get_product(position) for position in positions]
+        finally:
+            with self._lock:
+                self._n_concurrent_searches -= 1
+
+
+class ParquetDatasetBackend(SearchBackend):
+    """Read RTC-S1 metadata from a (partitioned) parquet dataset mirroring the ASF search results.
+
+    The dataset is opened once with `pyarrow.dataset` and must have the required columns of `rtc_s1_resp_schema`
+    (other columns are ignored; the geometry is WKB in EPSG:4326 as written by `GeoDataFrame.to_parquet`), e.g. a
+    directory written by `RtcS1MetadataCatalog` or a hive-partitioned dataset such as
+    `track_number=64/part-0.parquet`. Reads push the filters `jpl_burst_id IN (...)`, `track_number IN (...)` and
+    `start_acq_dt <= acq_dt <= stop_acq_dt` down to the dataset so that only the matching partitions and row groups
+    are read, which is most effective when files are sorted by `jpl_burst_id` and `acq_dt`.
+    `get_rtc_s1_ts_metadata_by_burst_ids` reads RTC-S1 metadata tables from this backend directly (without making
+    products or splitting searches). Files added to the dataset after the backend is created are not read.
+
+    Parameters
+    ----------
+    source : str | Path | list
+        Directory, file or list of files of the dataset.
+    partitioning : str | list[str] | ds.Partitioning, optional
+        Partitioning of the directories, by default hive partitioning (`key=value` directories; other directory names
+        are ignored). Partition fields must be columns of `rtc_s1_resp_schema` (e.g. `track_number`).
+    filesystem : pyarrow.fs.FileSystem, optional
+        Filesystem of the dataset (e.g. S3), by default inferred from `source`.
+    """
+
+    def __init__(
+        self,
+        source: str | Path | list,
+        partitioning: str | list[str] | ds.Partitioning | None = 'hive',
+        filesystem: object | None = None,
+    ) -> None:
+        if isinstance(source, Path):
+            source = str(source)
+        self.dataset = ds.dataset(source, format='parquet', partitioning=partitioning, filesystem=filesystem)
+        missing_columns = [
+            column
+            for column, schema_column in rtc_s1_resp_schema.columns.items()
+            if schema_column.required and column not in self.dataset.schema.names
+        ]
+        if missing_columns:
+            raise ValueError(f'The parquet dataset is missing the RTC-S1 metadata columns: {missing_columns}')
+        self.columns = [
+            column for column, schema_column in rtc_s1_resp_schema.columns.items() if schema_column.required
+        ]
+
+    def get_filter(
+        self, burst_ids: list[str], start_acq_dt: datetime | None, stop_acq_dt: datetime | None
+    ) -> ds.Expression:
+        """Get the dataset filter of a search (burst ids in either JPL or ASF syntax)."""
+        jpl_burst_ids = sorted({burst_id.upper().replace('_', '-') for burst_id in burst_ids})
+        track_numbers = sorted({get_track_number_from_burst_id(burst_id) for burst_id in jpl_burst_ids})
+        expression = pc.field('jpl_burst_id').isin(jpl_burst_ids) & pc.field('track_number').isin(track_numbers)
+        start, stop = (None if dt is None else pd.to_datetime(dt, utc=True) for dt in (start_acq_dt, stop_acq_dt))
+        if (start is not None) and (stop is not None) and (start > stop):
+            start, stop = stop, start
+        if start is not None:
+            expression &= pc.field('acq_dt') >= start
+        if stop is not None:
+            expression &= pc.field('acq_dt') <= stop
+        return expression
+
+    def read(
+        self, burst_ids: list[str], start_acq_dt: datetime | None = None, stop_acq_dt: datetime | None = None
+    ) -> gpd.GeoDataFrame:
+        """Read the RTC-S1 metadata of burst ids acquired between the dates (in any order; None for no bound).
+
+        Rows are deduplicated by `opera_id` but neither sorted nor validated.
+        """
+        increment('parquet_dataset_reads_total')
+        with timer('parquet_dataset_read_seconds'):
+            table = self.dataset.to_table(
+                columns=self.columns, filter=self.get_filter(burst_ids, start_acq_dt, stop_acq_dt)
+            )
+            geometry = gpd.GeoSeries.from_wkb(table.column('geometry').to_numpy(zero_copy_only=False), crs='EPSG:4326')
+            df = table.drop_columns(['geometry']).replace_schema_metadata(None).to_pandas()
+            # Partition fields are inferred as int32
+            df = df.astype({'track_number': 'int64', 'pass_id': 'int64'})
+            df_rtc = gpd.GeoDataFrame(df, geometry=geometry.values, crs='EPSG:4326')
+            df_rtc = df_rtc.drop_duplicates(subset=['opera_id']).reset_index(drop=True)
+        increment('parquet_dataset_rows_total', df_rtc.shape[0])
+        return df_rtc
+
+    def search(self, burst_ids: list[str], start_acq_dt: datetime | None, stop_acq_dt: datetime | None) -> list:
+        """Read the RTC-S1 metadata as products (in acquisition order) for callers of `search_rtc_s1_products`."""
+        df_rtc = self.read(burst_ids, start_acq_dt, stop_acq_dt).sort_values(by='acq_dt', kind='stable')
+        return [
+            RtcS1Product(properties, geometry)
+            for properties, geometry in zip(get_product_properties(df_rtc), df_rtc.geometry)
+        ]
+
+
+# The backend is process-wide (like the metrics registry) because searches are made from worker threads
+_search_backend = ASFSearchBackend()
+
+
+def get_search_backend() -> SearchBackend:
+    """Get the backend of the searches not given a backend explicitly."""
+    return _search_backend
+
+
+def set_search_backend(backend: SearchBackend | None) -> None:
+    """Set the default search backend (the ASF backend if None)."""
+    global _search_backend
+    if backend is not None and not isinstance(backend, SearchBackend):
+        raise TypeError(f'Invalid search backend: {backend!r}. Must be a SearchBackend.')
+    _search_backend = backend if backend is not None else ASFSearchBackend()
+
+
+@contextmanager
+def search_backend(backend: SearchBackend) -> Iterator[SearchBackend]:
+    """Make the searches of a block with `backend`, e.g. `with search_backend(FakeSearchBackend(df)): ...`."""
+    previous_backend = _search_backend
+    set_search_backend(backend)
+    try:
+        yield backend
+    finally:
+        set_search_backend(previous_backend)
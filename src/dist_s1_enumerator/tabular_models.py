@@ -1,7 +1,18 @@
+import os
+import weakref
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from inspect import signature
+
 import geopandas as gpd
+import pandas as pd
 from pandera.engines.pandas_engine import DateTime
 from pandera.pandas import Column, DataFrameSchema
 
+from dist_s1_enumerator.metrics import timer
+
 
 burst_schema = DataFrameSchema(
     {
@@ -81,9 +92,145 @@ burst_mgrs_lut_schema = DataFrameSchema(
 )
 
 
+# Names of the schemas in metrics
+SCHEMA_NAMES = {
+    id(burst_schema): 'burst_schema',
+    id(mgrs_tile_schema): 'mgrs_tile_schema',
+    id(rtc_s1_resp_schema): 'rtc_s1_resp_schema',
+    id(rtc_s1_schema): 'rtc_s1_schema',
+    id(dist_s1_input_schema): 'dist_s1_input_schema',
+    id(dist_s1_loc_input_schema): 'dist_s1_loc_input_schema',
+    id(burst_mgrs_lut_schema): 'burst_mgrs_lut_schema',
+}
+
+# A frame satisfying a schema satisfies the schemas it extends
+IMPLIED_SCHEMAS = {
+    id(rtc_s1_schema): [rtc_s1_resp_schema],
+    id(dist_s1_input_schema): [rtc_s1_schema, rtc_s1_resp_schema],
+    id(dist_s1_loc_input_schema): [dist_s1_input_schema, rtc_s1_schema, rtc_s1_resp_schema],
+}
+
+VALIDATION_MODES = ('full', 'schema', 'sample', 'off')
+VALIDATION_SAMPLE_SIZE = 1_000
+
+# The process-wide mode (also used by worker threads, which start from an empty context) and the overrides of
+# `validation_mode` blocks
+_default_validation_mode = os.environ.get('DIST_S1_ENUMERATOR_VALIDATION_MODE', 'full').lower()
+_validation_mode = ContextVar('validation_mode', default=None)
+# id of a frame -> (weak reference to the frame, ids of the schemas it was fully validated against)
+_validated_frames = {}
+
+
+def get_validation_mode() -> str:
+    """Get the current validation mode (see `set_validation_mode`)."""
+    mode = _validation_mode.get()
+    return mode if mode is not None else _default_validation_mode
+
+
+def set_validation_mode(mode: str) -> None:
+    """Set how tables are validated against their schemas in the process (outside of `validation_mode` blocks).
+
+    The modes are:
+
+    - 'full' (default): validate every row.
+    - 'schema': validate the column names and dtypes only (no per-row checks).
+    - 'sample': validate the column names and dtypes and the rows of a random sample of `VALIDATION_SAMPLE_SIZE` rows.
+    - 'off': no validation.
+
+    The default can also be set with the `DIST_S1_ENUMERATOR_VALIDATION_MODE` environment variable. In the 'schema'
+    and 'sample' modes, frames that were fully validated by the library (and are passed back to it as the same object)
+    are not validated again; the 'full' mode validates every frame, including frames modified in place by a caller.
+    """
+    if mode not in VALIDATION_MODES:
+        raise ValueError(f'Invalid validation mode: {mode}. Must be one of: {", ".join(VALIDATION_MODES)}.')
+    global _default_validation_mode
+    _default_validation_mode = mode
+
+
+@contextmanager
+def validation_mode(mode: str) -> Iterator[None]:
+    """Temporarily set the validation mode of the current context, e.g. `with validation_mode('schema'): ...`.
+
+    Threads started by the library in the block use the mode too.
+    """
+    if mode not in VALIDATION_MODES:
+        raise ValueError(f'Invalid validation mode: {mode}. Must be one of: {", ".join(VALIDATION_MODES)}.')
+    token = _validation_mode.set(mode)
+    try:
+        yield
+    finally:
+        _validation_mode.reset(token)
+
+
+def is_validated(df: pd.DataFrame, schema: DataFrameSchema) -> bool:
+    """Check if this frame (the same object) was fully validated against the schema."""
+    entry = _validated_frames.get(id(df))
+    return entry is not None and entry[0]() is df and id(schema) in entry[1]
+
+
+def mark_validated(df: pd.DataFrame, schema: DataFrameSchema) -> None:
+    """Record that a frame was fully validated against a schema (and so the schemas it implies)."""
+    key = id(df)
+    entry = _validated_frames.get(key)
+    if entry is None or entry[0]() is not df:
+        # The entry is removed when the frame is garbage collected
+        entry = (weakref.ref(df, lambda _, key=key: _validated_frames.pop(key, None)), set())
+        _validated_frames[key] = entry
+    entry[1].add(id(schema))
+    entry[1].update(id(implied_schema) for implied_schema in IMPLIED_SCHEMAS.get(id(schema), []))
+
+
+def validate_df(df: pd.DataFrame, schema: DataFrameSchema) -> pd.DataFrame:
+    """Validate a frame against a schema according to the validation mode.
+
+    Returns the validated frame (with the coercions of the schema in the 'full' mode) or `df` if it is not fully
+    validated.
+    """
+    mode = get_validation_mode()
+    if mode == 'off':
+        return df
+    # Frames can be modified in place after validation, so only the relaxed modes trust earlier validations
+    if mode != 'full' and is_validated(df, schema):
+        return df
+    with timer('validation_seconds', schema=SCHEMA_NAMES.get(id(schema), 'other'), mode=mode):
+        if mode == 'schema':
+            schema.validate(df.iloc[:0])
+            return df
+        if mode == 'sample' and df.shape[0] > VALIDATION_SAMPLE_SIZE:
+            schema.validate(df.sample(n=VALIDATION_SAMPLE_SIZE, random_state=0))
+            return df
+        df_validated = schema.validate(df)
+    mark_validated(df, schema)
+    mark_validated(df_validated, schema)
+    return df_validated
+
+
+def validate_input(schema: DataFrameSchema, obj_getter: int | str = 0) -> Callable:
+    """Validate a frame argument (by position or name) with `validate_df`; drop-in for pandera's `check_input`."""
+
+    def decorator(fn: Callable) -> Callable:
+        fn_signature = signature(fn)
+        arg_name = list(fn_signature.parameters)[obj_getter] if isinstance(obj_getter, int) else obj_getter
+
+        @wraps(fn)
+        def wrapper(*args: object, **kwargs: object) -> object:
+            bound_args = fn_signature.bind(*args, **kwargs)
+            bound_args.arguments[arg_name] = validate_df(bound_args.arguments[arg_name], schema)
+            return fn(*bound_args.args, **bound_args.kwargs)
+
+        return wrapper
+
+    return decorator
+
+
 def reorder_columns(df: gpd.GeoDataFrame, schema: DataFrameSchema) -> gpd.GeoDataFrame:
     if not df.empty:
-        df = df[[col for col in schema.columns.keys() if col in df.columns]]
+        df_reordered = df[[col for col in schema.columns.keys() if col in df.columns]]
+        # Selecting the columns of a validated frame keeps it valid
+        entry = _validated_frames.get(id(df))
+        if entry is not None and entry[0]() is df and id(schema) in entry[1]:
+            mark_validated(df_reordered, schema)
+        df = df_reordered
     else:
         df = gpd.GeoDataFrame(columns=schema.columns.keys())
         if 'geometry' in schema.columns.keys():
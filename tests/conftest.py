@@ -28,3 +28,31 @@ def test_dir() -> Path:
     test_dir = Path(__file__).parent
     test_dir = test_dir.resolve()
     return test_dir
+
+
+@pytest.fixture(scope='session')
+def burst_table_path(tmp_path_factory: pytest.TempPathFactory) -> Generator[Path, None, None]:
+    """Fixture to provide the burst geometry table, built from synthetic footprints if it is not available.
+
+    The synthetic table is written to a temporary `DIST_S1_ENUMERATOR_CACHE_DIR` and has the bursts of a few MGRS tiles.
+    """
+    import geopandas as gpd
+    from shapely.geometry import box
+
+    from dist_s1_enumerator.mgrs_burst_data import build_burst_table, get_burst_data_path, get_burst_ids_in_mgrs_tiles
+
+    parquet_path = get_burst_data_path()
+    if parquet_path.exists():
+        yield parquet_path
+        return
+
+    cache_dir = tmp_path_factory.mktemp('cache')
+    burst_ids = get_burst_ids_in_mgrs_tiles(['11SLT', '15RXN', '22NFF'])
+    df_source = gpd.GeoDataFrame(
+        {'jpl_burst_id': burst_ids}, geometry=[box(k, 0, k + 1, 1) for k in range(len(burst_ids))], crs='EPSG:4326'
+    )
+    source_path = cache_dir / 'burst_footprints.parquet'
+    df_source.to_parquet(source_path)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv('DIST_S1_ENUMERATOR_CACHE_DIR', str(cache_dir))
+        yield build_burst_table(source_path)
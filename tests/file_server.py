@@ -0,0 +1,84 @@
+"""Local HTTP stand-in for the ASF datapool used by the download tests and benchmarks."""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import geopandas as gpd
+
+
+class FileServer:
+    """Local HTTP stand-in for the ASF datapool that supports range requests and dropped connections."""
+
+    def __init__(self) -> None:
+        self.files = {}
+        # Number of bytes sent before the connection of the next GET request of a path is dropped
+        self.drop_after = {}
+        self.requests = []
+        # Seconds to wait before responding to a GET request (e.g. to mimic the latency of the datapool)
+        self.latency = 0.0
+        # Responses to the HEAD requests of a path other than the file's headers: a status code (e.g. 403 for presigned
+        # urls only allowing GET requests) or an HTML page (e.g. a login page at the end of redirects)
+        self.head_responses = {}
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: object) -> None:
+                pass
+
+            def do_HEAD(self) -> None:
+                server.requests.append(('HEAD', self.path, None))
+                response = server.head_responses.get(self.path)
+                if isinstance(response, int):
+                    self.send_response(response)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                if isinstance(response, bytes):
+                    self.send_header('Content-Type', 'text/html')
+                    self.send_header('Content-Length', str(len(response)))
+                else:
+                    self.send_header('Content-Length', str(len(server.files[self.path])))
+                self.end_headers()
+
+            def do_GET(self) -> None:
+                range_header = self.headers.get('Range')
+                server.requests.append(('GET', self.path, range_header))
+                time.sleep(server.latency)
+                data = server.files[self.path]
+                start = int(range_header.split('=')[1].split('-')[0]) if range_header else 0
+                if start >= len(data) and range_header:
+                    self.send_response(416)
+                    self.send_header('Content-Range', f'bytes */{len(data)}')
+                    self.end_headers()
+                    return
+                self.send_response(206 if range_header else 200)
+                if range_header:
+                    self.send_header('Content-Range', f'bytes {start}-{len(data) - 1}/{len(data)}')
+                self.send_header('Content-Length', str(len(data) - start))
+                self.end_headers()
+                n_bytes = server.drop_after.pop(self.path, len(data) - start)
+                self.wfile.write(data[start : start + n_bytes])
+                self.close_connection = True
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.httpd.server_address[1]}'
+
+    def __enter__(self) -> 'FileServer':
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def serve_rtc_files(df_rtc: gpd.GeoDataFrame, file_server: FileServer) -> gpd.GeoDataFrame:
+    """Serve fake RTC-S1 files from the local file server and point the urls of df_rtc to them."""
+    df_served = df_rtc.copy()
+    for polarization_token in ['copol', 'crosspol']:
+        file_names = df_rtc[f'url_{polarization_token}'].str.split('/').str[-1]
+        for file_name in file_names:
+            file_server.files[f'/{file_name}'] = file_name.encode() * 100
+        df_served[f'url_{polarization_token}'] = f'{file_server.url}/' + file_names
+    return df_served
@@ -1,6 +1,85 @@
-import pytest
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
 
-from dist_s1_enumerator.asf import append_pass_data, convert_asf_url_to_cumulus, get_rtc_s1_ts_metadata_by_burst_ids
+import geopandas as gpd
+import pandas as pd
+import pytest
+from asf_search import ASFSearchResults
+from asf_search.exceptions import ASFSearch5xxError
+from pandas.testing import assert_frame_equal
+from pytest_mock import MockerFixture
+from shapely.geometry import MultiPolygon, Polygon, mapping
+from tenacity import wait_none
+
+from dist_s1_enumerator.asf import (
+    append_pass_data,
+    convert_asf_url_to_cumulus,
+    convert_asf_urls_to_cumulus,
+    extract_pass_id,
+    extract_pass_ids,
+    format_polarization,
+    format_polarizations,
+    get_geometries_from_geojson,
+    get_rtc_s1_ts_metadata_by_burst_ids,
+    get_search_chunks,
+    search_rtc_s1_products,
+)
+from dist_s1_enumerator.metrics import collect_metrics
+from dist_s1_enumerator.tabular_models import rtc_s1_resp_schema
+
+
+class FakeASFProduct:
+    def __init__(self, properties: dict, geometry: dict) -> None:
+        self.properties = properties
+        self.geometry = geometry
+
+    def geojson(self) -> dict:
+        """Return the product as a GeoJSON feature."""
+        return {'type': 'Feature', 'geometry': self.geometry, 'properties': self.properties}
+
+
+@pytest.fixture
+def asf_products(test_dir: Path) -> list[FakeASFProduct]:
+    parquet_path = test_dir / 'data' / 'rtc_s1_ts_metadata' / 'mgrs15RXN__track63.parquet'
+    df_rtc = gpd.read_parquet(parquet_path).drop_duplicates(subset=['opera_id']).reset_index(drop=True)
+    return [
+        FakeASFProduct(
+            {
+                'sceneName': row.opera_id,
+                'startTime': row.acq_dt.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'pathNumber': row.track_number,
+                'polarization': row.polarizations.split('+'),
+                'url': row.url_copol,
+                'additionalUrls': [row.url_crosspol, row.url_copol.replace('.tif', '.h5')],
+            },
+            mapping(row.geometry),
+        )
+        for row in df_rtc.itertuples()
+    ]
+
+
+def get_fake_geo_search(products: list[FakeASFProduct], calls: list[dict]) -> Callable[..., ASFSearchResults]:
+    """Make an offline stand-in for asf_search.geo_search over the RTC-S1 products."""
+
+    def fake_geo_search(
+        operaBurstID: list[str], processingLevel: str, start: datetime | None = None, end: datetime | None = None
+    ) -> ASFSearchResults:
+        calls.append({'burst_ids': operaBurstID, 'start': start, 'end': end})
+        burst_ids = [burst_id.replace('_', '-') for burst_id in operaBurstID]
+        resp = ASFSearchResults(
+            [
+                product
+                for product in products
+                if product.properties['sceneName'].split('_')[3] in burst_ids
+                and (start is None or pd.Timestamp(product.properties['startTime']) >= start)
+                and (end is None or pd.Timestamp(product.properties['startTime']) <= end)
+            ]
+        )
+        resp.searchComplete = True
+        return resp
+
+    return fake_geo_search
 
 
 @pytest.mark.integration
@@ -56,3 +135,118 @@ def test_convert_asf_url_to_cumulus_already_cumulus(pol_token: str) -> None:
     result = convert_asf_url_to_cumulus(cumulus_url)
 
     assert result == cumulus_url
+
+
+def test_get_search_chunks() -> None:
+    burst_ids = [f'T063_{k:06d}_IW1' for k in range(5)]
+    start_acq_dt = datetime(2022, 1, 1)
+    stop_acq_dt = datetime(2022, 1, 25)
+
+    chunks = get_search_chunks(burst_ids, start_acq_dt, stop_acq_dt, max_bursts_per_search=2, max_days_per_search=10)
+    assert len(chunks) == 3 * 3
+    assert [chunk[0] for chunk in chunks[::3]] == [burst_ids[:2], burst_ids[2:4], burst_ids[4:]]
+    assert [(chunk[1].day, chunk[2].day) for chunk in chunks[:3]] == [(1, 11), (11, 21), (21, 25)]
+
+    chunks = get_search_chunks(burst_ids, None, None, max_bursts_per_search=None)
+    assert chunks == [(burst_ids, None, None)]
+
+    with pytest.raises(ValueError, match='max_days_per_search'):
+        get_search_chunks(burst_ids, None, None, max_days_per_search=0)
+
+
+def test_get_rtc_s1_ts_metadata_by_burst_ids_with_chunked_searches(
+    asf_products: list[FakeASFProduct], mocker: MockerFixture
+) -> None:
+    calls = []
+    mocker.patch('dist_s1_enumerator.asf.asf.geo_search', side_effect=get_fake_geo_search(asf_products, calls))
+    burst_ids = sorted({product.properties['sceneName'].split('_')[3] for product in asf_products})
+    start_acq_dt, stop_acq_dt = '2021-06-01', '2024-01-01'
+
+    df_single = get_rtc_s1_ts_metadata_by_burst_ids(
+        burst_ids, start_acq_dt=start_acq_dt, stop_acq_dt=stop_acq_dt, max_bursts_per_search=None
+    )
+    assert len(calls) == 1
+    assert not df_single.empty
+
+    calls.clear()
+    df_chunked = get_rtc_s1_ts_metadata_by_burst_ids(
+        burst_ids,
+        start_acq_dt=start_acq_dt,
+        stop_acq_dt=stop_acq_dt,
+        max_bursts_per_search=3,
+        max_days_per_search=90,
+        max_workers=3,
+    )
+    assert len(calls) > 1
+    assert all(len(call['burst_ids']) <= 3 for call in calls)
+    assert_frame_equal(df_chunked, df_single)
+    assert df_single.url_copol.str.startswith('https://cumulus.asf.earthdatacloud.nasa.gov/').all()
+
+
+@pytest.mark.parametrize('max_bursts_per_search', [100, None])
+def test_get_rtc_s1_ts_metadata_by_burst_ids_without_burst_ids(
+    max_bursts_per_search: int | None, mocker: MockerFixture
+) -> None:
+    mock_geo_search = mocker.patch('dist_s1_enumerator.asf.asf.geo_search')
+    with pytest.warns(UserWarning, match='No results'):
+        df_rtc = get_rtc_s1_ts_metadata_by_burst_ids([], max_bursts_per_search=max_bursts_per_search)
+    assert df_rtc.empty
+    assert df_rtc.columns.tolist() == list(rtc_s1_resp_schema.columns.keys())
+    assert mock_geo_search.call_count == 0
+
+
+def test_search_rtc_s1_products_retries(asf_products: list[FakeASFProduct], mocker: MockerFixture) -> None:
+    calls = []
+    fake_geo_search = get_fake_geo_search(asf_products, calls)
+    incomplete_resp = ASFSearchResults([])
+    mock_geo_search = mocker.patch(
+        'dist_s1_enumerator.asf.asf.geo_search',
+        side_effect=[ASFSearch5xxError('CMR is down'), incomplete_resp, fake_geo_search(['T063_133337_IW3'], 'RTC')],
+    )
+    mocker.patch.object(search_rtc_s1_products.retry, 'wait', wait_none())
+
+    with collect_metrics() as metrics:
+        resp = search_rtc_s1_products(['T063_133337_IW3'])
+    assert mock_geo_search.call_count == 3
+    assert len(resp) > 0
+    assert metrics.get_counter('asf_searches_total') == 3
+    assert metrics.get_counter('asf_search_retries_total') == 2
+    assert metrics.get_counter('asf_search_results_total') == len(resp)
+    assert metrics.timers[('asf_search_seconds', ())][0] == 3
+
+    mocker.patch('dist_s1_enumerator.asf.asf.geo_search', side_effect=ASFSearch5xxError('CMR is down'))
+    with pytest.raises(ASFSearch5xxError):
+        search_rtc_s1_products(['T063_133337_IW3'])
+
+
+def test_vectorized_parsing_matches_scalar_functions() -> None:
+    granule = 'OPERA_L2_RTC-S1_T001-000189-IW2_20211028T180924Z_20250703T015334Z_S1A_30_v1.0'
+    urls = pd.Series(
+        [
+            f'https://datapool.asf.alaska.edu/RTC/OPERA-S1/{granule}_VV.tif',
+            f'https://cumulus.asf.earthdatacloud.nasa.gov/OPERA/OPERA_L2_RTC-S1/{granule}/{granule}_VH.tif',
+            f'https://datapool.asf.alaska.edu/RTC/OPERA-S1/{granule}_mask.tif',
+            f'https://datapool.asf.alaska.edu/RTC/OPERA-S1/extra/{granule}_HH.tif',
+        ]
+    )
+    assert convert_asf_urls_to_cumulus(urls).tolist() == urls.map(convert_asf_url_to_cumulus).tolist()
+    with pytest.warns(UserWarning, match='is not a valid ASF datapool'):
+        assert convert_asf_urls_to_cumulus(pd.Series(['https://example.com/a_VV.tif'])).tolist() == [
+            'https://example.com/a_VV.tif'
+        ]
+
+    pols = pd.Series([['VV', 'VH'], ['VH', 'VV'], 'HH+HV', ['HH', 'HV'], ['VV'], 'VV'])
+    assert format_polarizations(pols).tolist() == pols.map(format_polarization).tolist()
+
+    acq_dts = pd.Series(
+        pd.to_datetime(
+            ['2014-01-01T00:00:00', '2014-01-06T23:59:59', '2014-01-07T00:00:00', '2025-06-01T12:00:00'], utc=True
+        )
+    )
+    assert extract_pass_ids(acq_dts).tolist() == acq_dts.map(extract_pass_id).tolist()
+
+    square = Polygon([(0, 0), (1, 0), (1, 1), (0, 1)])
+    triangle = Polygon([(0, 0), (2, 0), (0, 2)])
+    multipolygon = MultiPolygon([square, Polygon([(179, 0), (180, 0), (180, 1)])])
+    geometries = get_geometries_from_geojson([mapping(square), mapping(multipolygon), mapping(triangle)])
+    assert [geom.equals(expected) for geom, expected in zip(geometries, [square, multipolygon, triangle])] == [True] * 3
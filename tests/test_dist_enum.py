@@ -1,4 +1,5 @@
 import random
+from datetime import datetime
 from pathlib import Path
 
 import geopandas as gpd
@@ -8,10 +9,19 @@ from pandas.testing import assert_frame_equal
 from pandera.pandas import check_input
 from pytest_mock import MockerFixture
 
-from dist_s1_enumerator.dist_enum import enumerate_dist_s1_products, enumerate_one_dist_s1_product
+from dist_s1_enumerator.dist_enum import (
+    DistS1ProductIndex,
+    enumerate_dist_s1_products,
+    enumerate_dist_s1_products_from_requests,
+    enumerate_one_dist_s1_product,
+    get_last_pass_ids,
+    get_merged_searches,
+    iter_dist_s1_products,
+)
 from dist_s1_enumerator.mgrs_burst_data import get_burst_ids_in_mgrs_tiles
 from dist_s1_enumerator.param_models import LookbackStrategyParams
-from dist_s1_enumerator.tabular_models import rtc_s1_resp_schema, rtc_s1_schema
+from dist_s1_enumerator.search_backends import SearchBackend
+from dist_s1_enumerator.tabular_models import dist_s1_input_schema, reorder_columns, rtc_s1_resp_schema, rtc_s1_schema
 
 
 def read_rtc_s1_ts(
@@ -367,3 +377,409 @@ def test_dist_enum_one_with_multi_window_with_asf_daac_single_polarization() ->
             max_pre_imgs_per_burst=(3, 4),
             delta_window_days=365,
         )
+
+
+def enumerate_products_by_pass(
+    df_rtc_ts: gpd.GeoDataFrame, mgrs_tile_ids: list[str], params: LookbackStrategyParams
+) -> gpd.GeoDataFrame:
+    """Enumerate products pass by pass with pandas operations as a reference."""
+    if params.lookback_strategy == 'immediate_lookback':
+        windows = [(params.delta_lookback_days, params.max_pre_imgs_per_burst)]
+    else:
+        windows = list(zip(params.delta_lookback_days, params.max_pre_imgs_per_burst))
+    delta_window = pd.Timedelta(params.delta_window_days, unit='D')
+    products = []
+    for mgrs_tile_id in mgrs_tile_ids:
+        df_tile = df_rtc_ts[df_rtc_ts.mgrs_tile_id == mgrs_tile_id]
+        for group_id in df_tile.acq_group_id_within_mgrs_tile.unique():
+            df_group = df_tile[df_tile.acq_group_id_within_mgrs_tile == group_id]
+            for pass_id in sorted(df_group.pass_id.unique(), reverse=True):
+                df_post = df_group[df_group.pass_id == pass_id].assign(input_category='post')
+                post_date = df_post.acq_dt.min()
+                df_keys = df_post[['jpl_burst_id', 'polarizations']].drop_duplicates()
+                df_pre_list = []
+                for delta_lookback_day, max_pre_imgs in windows:
+                    window_stop = post_date - pd.Timedelta(delta_lookback_day, unit='D')
+                    ind = (df_group.acq_dt < window_stop) & (df_group.acq_dt >= window_stop - delta_window)
+                    df_pre = pd.merge(df_group[ind], df_keys, on=['jpl_burst_id', 'polarizations'], how='inner')
+                    df_pre = df_pre.sort_values(by='acq_dt', kind='stable')
+                    df_pre_list.append(df_pre.groupby('jpl_burst_id').tail(max_pre_imgs).assign(input_category='pre'))
+                df_product = pd.concat(df_pre_list + [df_post], ignore_index=True)
+                pre_counts = df_product[df_product.input_category == 'pre'].groupby('jpl_burst_id').size()
+                burst_ids = pre_counts[pre_counts >= params.min_pre_imgs_per_burst].index
+                df_product = df_product[df_product.jpl_burst_id.isin(burst_ids)]
+                if not df_product.empty:
+                    products.append(df_product.assign(product_id=len(products)))
+    df_prods = pd.concat(products, ignore_index=True)
+    return df_prods.sort_values(by=['product_id', 'acq_dt', 'opera_id'], kind='stable').reset_index(drop=True)
+
+
+@pytest.mark.parametrize(
+    'mgrs_tile_ids,track_numbers,lookback_strategy,delta_lookback_days,delta_window_days,'
+    'max_pre_imgs_per_burst,min_pre_imgs_per_burst',
+    [
+        (['15RXN'], [63], 'immediate_lookback', 0, 365, 10, 2),
+        (['11SLT', '11SLU', '11SMT'], None, 'multi_window', 365, 60, (4, 3, 3), 1),
+        # Overlapping windows so that pre-images can be selected in multiple windows
+        (['22WFD'], None, 'multi_window', (200, 100), 150, (5, 3), 2),
+    ],
+)
+def test_enumerate_dist_s1_products_matches_per_pass_selection(
+    mgrs_tile_ids: list[str],
+    track_numbers: list[int] | None,
+    lookback_strategy: str,
+    delta_lookback_days: int | tuple[int, ...],
+    delta_window_days: int,
+    max_pre_imgs_per_burst: int | tuple[int, ...],
+    min_pre_imgs_per_burst: int,
+) -> None:
+    df_rtc_s1_ts = read_rtc_s1_ts(mgrs_tile_ids, track_numbers=track_numbers)
+    params = LookbackStrategyParams(
+        lookback_strategy=lookback_strategy,
+        delta_lookback_days=delta_lookback_days,
+        delta_window_days=delta_window_days,
+        max_pre_imgs_per_burst=max_pre_imgs_per_burst,
+        min_pre_imgs_per_burst=min_pre_imgs_per_burst,
+    )
+    df_products = enumerate_dist_s1_products(
+        df_rtc_s1_ts,
+        mgrs_tile_ids,
+        lookback_strategy=lookback_strategy,
+        delta_lookback_days=delta_lookback_days,
+        delta_window_days=delta_window_days,
+        max_pre_imgs_per_burst=max_pre_imgs_per_burst,
+        min_pre_imgs_per_burst=min_pre_imgs_per_burst,
+        tqdm_enabled=False,
+    )
+    df_expected = reorder_columns(enumerate_products_by_pass(df_rtc_s1_ts, mgrs_tile_ids, params), dist_s1_input_schema)
+
+    # Ties in acq_dt are ordered by input row order; the reference orders them by opera_id
+    df_products = df_products.sort_values(by=['product_id', 'acq_dt', 'opera_id'], kind='stable').reset_index(drop=True)
+    assert_frame_equal(df_products, df_expected)
+
+
+def test_enumerate_dist_s1_products_with_two_polarizations_in_one_pass() -> None:
+    df_rtc_s1_ts = read_rtc_s1_ts(['15RXN'], track_numbers=[63])
+    df_rtc_s1_ts = df_rtc_s1_ts.sort_values(by='acq_dt').reset_index(drop=True)
+
+    # Duplicate a burst in the latest pass with HH+HV data acquired 2 minutes later
+    burst_id = df_rtc_s1_ts.jpl_burst_id.iloc[0]
+    latest_pass_id = df_rtc_s1_ts.pass_id.max()
+    ind_burst = df_rtc_s1_ts.jpl_burst_id == burst_id
+    df_extra = df_rtc_s1_ts[ind_burst & (df_rtc_s1_ts.pass_id == latest_pass_id)].copy()
+    df_extra['acq_dt'] = df_extra['acq_dt'] + pd.Timedelta(minutes=2)
+    df_extra['opera_id'] = df_extra['opera_id'] + '_HH'
+    # ... and HH+HV copies of its most recent pre-images so the pre-image selection spans both polarizations
+    df_extra_pre = df_rtc_s1_ts[ind_burst].iloc[-4:-1].copy()
+    df_extra_pre['acq_dt'] = df_extra_pre['acq_dt'] + pd.Timedelta(minutes=2)
+    df_extra_pre['opera_id'] = df_extra_pre['opera_id'] + '_HH'
+    df_extra = pd.concat([df_extra, df_extra_pre])
+    df_extra['polarizations'] = 'HH+HV'
+    df_rtc_s1_ts = pd.concat([df_rtc_s1_ts, df_extra], ignore_index=True)
+
+    params = LookbackStrategyParams(
+        lookback_strategy='immediate_lookback',
+        delta_lookback_days=0,
+        delta_window_days=365,
+        max_pre_imgs_per_burst=4,
+        min_pre_imgs_per_burst=1,
+    )
+    df_products = enumerate_dist_s1_products(
+        df_rtc_s1_ts,
+        ['15RXN'],
+        lookback_strategy='immediate_lookback',
+        delta_lookback_days=0,
+        delta_window_days=365,
+        max_pre_imgs_per_burst=4,
+        min_pre_imgs_per_burst=1,
+        tqdm_enabled=False,
+    )
+    df_expected = reorder_columns(enumerate_products_by_pass(df_rtc_s1_ts, ['15RXN'], params), dist_s1_input_schema)
+    df_products = df_products.sort_values(by=['product_id', 'acq_dt', 'opera_id'], kind='stable').reset_index(drop=True)
+    assert_frame_equal(df_products, df_expected)
+
+    df_latest = df_products[(df_products.product_id == 0) & (df_products.jpl_burst_id == burst_id)]
+    df_latest_pre = df_latest[df_latest.input_category == 'pre']
+    assert df_latest_pre.shape[0] == 4
+    assert sorted(df_latest_pre.polarizations.unique().tolist()) == ['HH+HV', 'VV+VH']
+
+
+def test_enumerate_dist_s1_products_with_worker_processes() -> None:
+    mgrs_tile_ids = ['11SLT', '11SLU', '11SMT']
+    df_rtc_s1_ts = read_rtc_s1_ts(mgrs_tile_ids)
+
+    df_products_serial = enumerate_dist_s1_products(df_rtc_s1_ts, mgrs_tile_ids, tqdm_enabled=False)
+    df_products_parallel = enumerate_dist_s1_products(df_rtc_s1_ts, mgrs_tile_ids, tqdm_enabled=False, n_workers=2)
+    assert_frame_equal(df_products_serial, df_products_parallel)
+
+    with pytest.raises(ValueError, match='n_workers must be a positive integer'):
+        enumerate_dist_s1_products(df_rtc_s1_ts, mgrs_tile_ids, n_workers=0)
+
+
+def test_enumerate_dist_s1_products_incrementally() -> None:
+    mgrs_tile_ids = ['11SLT', '11SLU', '11SMT']
+    df_rtc_s1_ts = read_rtc_s1_ts(mgrs_tile_ids)
+    df_products = enumerate_dist_s1_products(df_rtc_s1_ts, mgrs_tile_ids, tqdm_enabled=False)
+
+    # Previous run with the data available before the cutoff
+    cutoff = pd.Timestamp('2024-06-01', tz='UTC')
+    df_rtc_s1_ts_old = df_rtc_s1_ts[df_rtc_s1_ts.acq_dt < cutoff].reset_index(drop=True)
+    df_products_old = enumerate_dist_s1_products(df_rtc_s1_ts_old, mgrs_tile_ids, tqdm_enabled=False)
+    df_last_pass_ids = get_last_pass_ids(df_products_old)
+    assert df_last_pass_ids.columns.tolist() == ['mgrs_tile_id', 'acq_group_id_within_mgrs_tile', 'pass_id']
+
+    # The products of a full enumeration with a newer post-image pass
+    df_post = df_products[df_products.input_category == 'post']
+    df_post = df_post.merge(
+        df_last_pass_ids, on=['mgrs_tile_id', 'acq_group_id_within_mgrs_tile'], suffixes=('', '_last')
+    )
+    new_product_ids = df_post.product_id[df_post.pass_id > df_post.pass_id_last].unique()
+    df_expected = df_products[df_products.product_id.isin(new_product_ids)].reset_index(drop=True)
+    assert 0 < new_product_ids.shape[0] < df_products.product_id.nunique()
+
+    # Only the pre-image windows of the new passes are needed
+    max_lookback = pd.Timedelta(days=3 * 365 + 60)
+    df_rtc_s1_ts_recent = df_rtc_s1_ts[df_rtc_s1_ts.acq_dt >= cutoff - max_lookback - pd.Timedelta(days=6)]
+    for df_ts in [df_rtc_s1_ts, df_rtc_s1_ts_recent.reset_index(drop=True)]:
+        df_new = enumerate_dist_s1_products(df_ts, mgrs_tile_ids, tqdm_enabled=False, last_pass_ids=df_last_pass_ids)
+        assert df_new.product_id.unique().tolist() == list(range(new_product_ids.shape[0]))
+        assert_frame_equal(df_new.drop(columns='product_id'), df_expected.drop(columns='product_id'))
+
+    # Nothing new
+    df_last_pass_ids = get_last_pass_ids(df_new, df_last_pass_ids)
+    assert enumerate_dist_s1_products(
+        df_rtc_s1_ts, mgrs_tile_ids, tqdm_enabled=False, last_pass_ids=df_last_pass_ids
+    ).empty
+
+
+def test_enumerate_dist_s1_products_with_post_acq_dt_range() -> None:
+    mgrs_tile_ids = ['11SLT', '11SLU', '11SMT']
+    df_rtc_s1_ts = read_rtc_s1_ts(mgrs_tile_ids)
+    df_products = enumerate_dist_s1_products(df_rtc_s1_ts, mgrs_tile_ids, tqdm_enabled=False)
+
+    start_post_acq_dt = pd.Timestamp('2024-03-01', tz='UTC')
+    stop_post_acq_dt = pd.Timestamp('2024-09-01', tz='UTC')
+    df_post = df_products[df_products.input_category == 'post']
+    df_post_dates = df_post.groupby('product_id').acq_dt.agg(['min', 'max'])
+    ind = (df_post_dates['max'] >= start_post_acq_dt) & (df_post_dates['min'] <= stop_post_acq_dt)
+    df_expected = df_products[df_products.product_id.isin(df_post_dates.index[ind])].reset_index(drop=True)
+    assert 0 < ind.sum() < df_products.product_id.nunique()
+
+    df_products_in_range = enumerate_dist_s1_products(
+        df_rtc_s1_ts,
+        mgrs_tile_ids,
+        tqdm_enabled=False,
+        start_post_acq_dt='2024-03-01',
+        stop_post_acq_dt=stop_post_acq_dt,
+    )
+    assert df_products_in_range.product_id.nunique() == ind.sum()
+    assert_frame_equal(df_products_in_range.drop(columns='product_id'), df_expected.drop(columns='product_id'))
+
+
+def test_enumerate_dist_s1_products_compact() -> None:
+    mgrs_tile_ids = ['11SLT', '11SLU', '11SMT']
+    df_rtc_s1_ts = read_rtc_s1_ts(mgrs_tile_ids)
+    df_products = enumerate_dist_s1_products(df_rtc_s1_ts, mgrs_tile_ids, tqdm_enabled=False)
+
+    product_index = enumerate_dist_s1_products(df_rtc_s1_ts, mgrs_tile_ids, tqdm_enabled=False, compact=True)
+    assert isinstance(product_index, DistS1ProductIndex)
+    assert len(product_index) == df_products.product_id.nunique()
+    # Each RTC-S1 row is stored once
+    assert not product_index.df_rtc.opera_id.duplicated().any()
+    assert product_index.df_rtc.shape[0] < df_products.shape[0]
+    assert_frame_equal(product_index.to_geodataframe(), df_products)
+
+    for product_id in [0, 17, len(product_index) - 1]:
+        df_product = df_products[df_products.product_id == product_id].reset_index(drop=True)
+        assert_frame_equal(product_index.get_product(product_id), df_product)
+
+    df_memberships = product_index.memberships
+    assert df_memberships.columns.tolist() == ['product_id', 'row_index', 'input_category', 'window_index']
+    assert df_memberships.input_category.tolist() == df_products.input_category.tolist()
+
+    with pytest.raises(ValueError, match='product_id must be between'):
+        product_index.get_product(len(product_index))
+
+    empty_index = enumerate_dist_s1_products(df_rtc_s1_ts, ['01ABC'], tqdm_enabled=False, compact=True)
+    assert len(empty_index) == 0
+    assert empty_index.to_geodataframe().empty
+
+
+@pytest.mark.parametrize('n_workers', [1, 2])
+def test_iter_dist_s1_products(n_workers: int) -> None:
+    mgrs_tile_ids = ['11SLT', '11SLU', '11SMT']
+    df_rtc_s1_ts = read_rtc_s1_ts(mgrs_tile_ids)
+    df_products = enumerate_dist_s1_products(df_rtc_s1_ts, mgrs_tile_ids, tqdm_enabled=False)
+
+    products = list(iter_dist_s1_products(df_rtc_s1_ts, mgrs_tile_ids, tqdm_enabled=False, n_workers=n_workers))
+    assert len(products) == df_products.product_id.nunique()
+    assert all(df_product.product_id.nunique() == 1 for df_product in products)
+    assert_frame_equal(pd.concat(products, axis=0).reset_index(drop=True), df_products)
+
+    tiles = list(
+        iter_dist_s1_products(
+            df_rtc_s1_ts, mgrs_tile_ids, tqdm_enabled=False, n_workers=n_workers, yield_by='mgrs_tile'
+        )
+    )
+    assert [df_tile.mgrs_tile_id.unique().tolist() for df_tile in tiles] == [[tile_id] for tile_id in mgrs_tile_ids]
+    assert_frame_equal(pd.concat(tiles, axis=0).reset_index(drop=True), df_products)
+
+    # Arguments are validated before iterating
+    with pytest.raises(ValueError, match='Invalid yield_by'):
+        iter_dist_s1_products(df_rtc_s1_ts, mgrs_tile_ids, yield_by='track')
+
+
+@pytest.mark.parametrize(
+    'lookback_strategy, delta_lookback_days, delta_window_days, max_pre_imgs_per_burst',
+    [
+        ('multi_window', (730, 365), 60, (3, 4)),
+        ('immediate_lookback', 0, 90, 5),
+    ],
+)
+@pytest.mark.parametrize('post_date', ['2024-03-15', '2025-06-02'])
+def test_enumerate_one_dist_s1_product_with_single_search(
+    lookback_strategy: str,
+    delta_lookback_days: int | tuple[int, ...],
+    delta_window_days: int,
+    max_pre_imgs_per_burst: int | tuple[int, ...],
+    post_date: str,
+    mocker: MockerFixture,
+) -> None:
+    df_rtc_s1_ts = read_rtc_s1_ts(['15RXN'], track_numbers=[63])
+    df_rtc_resp = reorder_columns(df_rtc_s1_ts, rtc_s1_resp_schema)
+
+    def search_rtc_s1_metadata(
+        burst_ids: list[str],
+        start_acq_dt: datetime | None = None,
+        stop_acq_dt: datetime | None = None,
+        polarizations: str | None = None,
+        backend: SearchBackend | None = None,
+    ) -> gpd.GeoDataFrame:
+        start_acq_dt, stop_acq_dt = sorted(pd.to_datetime([start_acq_dt, stop_acq_dt], utc=True))
+        ind = df_rtc_resp.jpl_burst_id.isin(burst_ids)
+        ind &= (df_rtc_resp.acq_dt >= start_acq_dt) & (df_rtc_resp.acq_dt <= stop_acq_dt)
+        return df_rtc_resp[ind].reset_index(drop=True)
+
+    mock_search = mocker.patch(
+        'dist_s1_enumerator.asf.get_rtc_s1_ts_metadata_by_burst_ids', side_effect=search_rtc_s1_metadata
+    )
+    kwargs = {
+        'lookback_strategy': lookback_strategy,
+        'delta_lookback_days': delta_lookback_days,
+        'delta_window_days': delta_window_days,
+        'max_pre_imgs_per_burst': max_pre_imgs_per_burst,
+    }
+
+    df_product = enumerate_one_dist_s1_product('15RXN', 63, post_date, **kwargs)
+    n_searches = mock_search.call_count
+    assert n_searches == 1 + (len(delta_lookback_days) if lookback_strategy == 'multi_window' else 1)
+
+    mock_search.reset_mock()
+    df_product_single_search = enumerate_one_dist_s1_product('15RXN', 63, post_date, single_search=True, **kwargs)
+    assert mock_search.call_count == 1
+    assert not df_product.empty
+    assert_frame_equal(df_product_single_search, df_product)
+
+
+@pytest.mark.parametrize(
+    'lookback_strategy, delta_lookback_days, delta_window_days, max_pre_imgs_per_burst',
+    [
+        ('multi_window', (730, 365), 60, (3, 4)),
+        ('immediate_lookback', 0, 90, 5),
+    ],
+)
+def test_enumerate_dist_s1_products_from_requests(
+    lookback_strategy: str,
+    delta_lookback_days: int | tuple[int, ...],
+    delta_window_days: int,
+    max_pre_imgs_per_burst: int | tuple[int, ...],
+    mocker: MockerFixture,
+) -> None:
+    df_rtc_s1_ts = pd.concat(
+        [read_rtc_s1_ts(['15RXN'], track_numbers=[63]), read_rtc_s1_ts(['11SLT', '11SLU', '11SMT'])],
+        ignore_index=True,
+    )
+    df_rtc_resp = reorder_columns(df_rtc_s1_ts.drop_duplicates(subset=['opera_id']), rtc_s1_resp_schema)
+
+    def search_rtc_s1_metadata(
+        burst_ids: list[str],
+        start_acq_dt: datetime | None = None,
+        stop_acq_dt: datetime | None = None,
+        polarizations: str | None = None,
+        backend: SearchBackend | None = None,
+    ) -> gpd.GeoDataFrame:
+        start_acq_dt, stop_acq_dt = sorted(pd.to_datetime([start_acq_dt, stop_acq_dt], utc=True))
+        ind = df_rtc_resp.jpl_burst_id.isin(burst_ids)
+        ind &= (df_rtc_resp.acq_dt >= start_acq_dt) & (df_rtc_resp.acq_dt <= stop_acq_dt)
+        return df_rtc_resp[ind].reset_index(drop=True)
+
+    mock_search = mocker.patch(
+        'dist_s1_enumerator.asf.get_rtc_s1_ts_metadata_by_burst_ids', side_effect=search_rtc_s1_metadata
+    )
+    kwargs = {
+        'lookback_strategy': lookback_strategy,
+        'delta_lookback_days': delta_lookback_days,
+        'delta_window_days': delta_window_days,
+        'max_pre_imgs_per_burst': max_pre_imgs_per_burst,
+    }
+
+    product_requests = [
+        ('15RXN', 63, '2024-03-15'),
+        ('11SLT', 64, '2024-11-22'),
+        ('15RXN', 63, '2025-06-02'),
+        ('11SLT', 64, '2024-12-04'),
+    ]
+    df_products = enumerate_dist_s1_products_from_requests(product_requests, tqdm_enabled=False, **kwargs)
+    # One search per MGRS tile and track number rather than 2 or more per request (except for the 15RXN requests,
+    # whose date ranges do not overlap with a 90 day lookback)
+    assert mock_search.call_count == (2 if lookback_strategy == 'multi_window' else 3)
+    assert df_products.product_id.unique().tolist() == [0, 1, 2, 3]
+
+    for product_id, (mgrs_tile_id, track_number, post_date) in enumerate(product_requests):
+        df_product_expected = enumerate_one_dist_s1_product(
+            mgrs_tile_id, track_number, post_date, single_search=True, tqdm_enabled=False, **kwargs
+        )
+        df_product = df_products[df_products.product_id == product_id].reset_index(drop=True)
+        assert_frame_equal(df_product.drop(columns=['product_id']), df_product_expected)
+
+    # No post-images within a day of 2024-11-28 (12 day repeat pass)
+    product_requests.append(('11SLT', 64, '2024-11-28'))
+    with pytest.raises(ValueError, match='No RTC-S1 post-images found'):
+        enumerate_dist_s1_products_from_requests(product_requests, tqdm_enabled=False, **kwargs)
+    with pytest.warns(UserWarning, match='Skipping product request 4'):
+        df_products_with_skipped = enumerate_dist_s1_products_from_requests(
+            pd.DataFrame(product_requests, columns=['mgrs_tile_id', 'track_number', 'post_date']),
+            errors='warn',
+            tqdm_enabled=False,
+            **kwargs,
+        )
+    assert_frame_equal(df_products_with_skipped, df_products)
+
+
+def test_get_merged_searches() -> None:
+    params = LookbackStrategyParams(
+        lookback_strategy='immediate_lookback',
+        max_pre_imgs_per_burst=5,
+        delta_lookback_days=0,
+        min_pre_imgs_per_burst=1,
+        delta_window_days=60,
+    )
+    df_requests = pd.DataFrame(
+        {
+            'mgrs_tile_id': ['15RXN', '15RXN', '11SLT', '15RXN'],
+            'track_number': [63, 63, 64, 63],
+            'post_date': pd.to_datetime(['2024-03-15', '2022-01-01', '2024-03-15', '2024-04-01'], utc=True),
+        }
+    )
+    df_searches, search_indices = get_merged_searches(df_requests, params, post_date_buffer_days=1)
+
+    # The 2024 requests over 15RXN overlap and share a search
+    assert df_searches[['mgrs_tile_id', 'track_number']].values.tolist() == [
+        ['15RXN', 63],
+        ['15RXN', 63],
+        ['11SLT', 64],
+    ]
+    assert search_indices.tolist() == [1, 0, 2, 1]
+    buffer = pd.Timedelta(days=61, seconds=300)
+    assert df_searches.start_acq_dt[1] == pd.Timestamp('2024-03-15', tz='UTC') - buffer
+    assert df_searches.stop_acq_dt[1] == pd.Timestamp('2024-04-02', tz='UTC')
@@ -1,7 +1,10 @@
 from pathlib import Path
 
 import geopandas as gpd
+import pandas as pd
+from pytest_mock import MockerFixture
 
+from dist_s1_enumerator.dist_enum import enumerate_dist_s1_products, get_last_pass_ids
 from dist_s1_enumerator.dist_enum_inputs import enumerate_dist_s1_workflow_inputs
 
 
@@ -241,3 +244,91 @@ def test_enumerate_dist_s1_workflow_inputs_for_time_series(test_dir: Path) -> No
     )
 
     assert workflow_inputs == expected_output
+
+
+def test_enumerate_dist_s1_workflow_inputs_bounds_the_search(test_dir: Path, mocker: MockerFixture) -> None:
+    df_ts = gpd.read_parquet(test_dir / 'data' / 'rtc_s1_ts_metadata' / 'chile_19HBD.parquet')
+    kwargs = {
+        'mgrs_tile_ids': '19HBD',
+        'start_acq_dt': '2023-11-01',
+        'stop_acq_dt': '2024-01-01',
+        'lookback_strategy': 'multi_window',
+        'delta_lookback_days': 365,
+        'delta_window_days': 60,
+        'max_pre_imgs_per_burst': 5,
+    }
+    expected_output = enumerate_dist_s1_workflow_inputs(**kwargs, df_ts=df_ts)
+
+    calls = []
+
+    def fake_search(
+        mgrs_tile_ids: list[str],
+        track_numbers: list[int] | None = None,
+        start_acq_dt: pd.Timestamp | None = None,
+        stop_acq_dt: pd.Timestamp | None = None,
+        catalog: object = None,
+    ) -> gpd.GeoDataFrame:
+        calls.append((start_acq_dt, stop_acq_dt))
+        ind = (df_ts.acq_dt >= start_acq_dt) & (df_ts.acq_dt <= stop_acq_dt)
+        return df_ts[ind].reset_index(drop=True)
+
+    mocker.patch('dist_s1_enumerator.dist_enum_inputs.get_rtc_s1_ts_metadata_from_mgrs_tiles', side_effect=fake_search)
+    workflow_inputs = enumerate_dist_s1_workflow_inputs(**kwargs)
+    assert workflow_inputs == expected_output
+
+    # The earliest pre-image window starts 3 * 365 + 60 days before the post-image pass
+    assert calls == [
+        (
+            pd.Timestamp('2023-11-01', tz='UTC') - pd.Timedelta(days=3 * 365 + 60 + 1),
+            pd.Timestamp('2024-01-02', tz='UTC'),
+        )
+    ]
+
+
+def test_enumerate_dist_s1_workflow_inputs_incremental_search(test_dir: Path, mocker: MockerFixture) -> None:
+    df_ts = gpd.read_parquet(test_dir / 'data' / 'rtc_s1_ts_metadata' / 'chile_19HBD.parquet')
+    # The acquisition group of track 18 is the only one whose id matches the lookup table
+    df_ts = df_ts[df_ts.track_number == 18].reset_index(drop=True)
+    params = {
+        'lookback_strategy': 'multi_window',
+        'delta_lookback_days': 365,
+        'delta_window_days': 60,
+        'max_pre_imgs_per_burst': 5,
+    }
+    # State of a run that enumerated the products up to 2023-11-01
+    df_products = enumerate_dist_s1_products(
+        df_ts, ['19HBD'], stop_post_acq_dt='2023-11-01', tqdm_enabled=False, **params
+    )
+    last_pass_ids = get_last_pass_ids(df_products)
+    kwargs = {'mgrs_tile_ids': '19HBD', 'track_numbers': 18, **params}
+    expected_output = enumerate_dist_s1_workflow_inputs(**kwargs, df_ts=df_ts, last_pass_ids=last_pass_ids)
+    assert len(expected_output) > 0
+
+    calls = []
+
+    def fake_search(
+        mgrs_tile_ids: list[str],
+        track_numbers: list[int] | None = None,
+        start_acq_dt: pd.Timestamp | None = None,
+        stop_acq_dt: pd.Timestamp | None = None,
+        catalog: object = None,
+    ) -> gpd.GeoDataFrame:
+        calls.append((start_acq_dt, stop_acq_dt))
+        if start_acq_dt is None:
+            return df_ts
+        return df_ts[df_ts.acq_dt >= start_acq_dt].reset_index(drop=True)
+
+    mocker.patch('dist_s1_enumerator.dist_enum_inputs.get_rtc_s1_ts_metadata_from_mgrs_tiles', side_effect=fake_search)
+    workflow_inputs = enumerate_dist_s1_workflow_inputs(**kwargs, last_pass_ids=last_pass_ids)
+    assert workflow_inputs == expected_output
+
+    # The search starts at the earliest pre-image window of the first pass after the oldest last pass
+    first_new_pass_start = pd.Timestamp('2014-01-01', tz='UTC') + pd.Timedelta(
+        days=6 * (last_pass_ids.pass_id.min() + 1)
+    )
+    assert calls == [(first_new_pass_start - pd.Timedelta(days=3 * 365 + 60 + 1), None)]
+
+    # Without a last pass for every acquisition group, the full history is searched
+    calls.clear()
+    enumerate_dist_s1_workflow_inputs(**kwargs, last_pass_ids=last_pass_ids.head(0))
+    assert calls == [(None, None)]
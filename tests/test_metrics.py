@@ -0,0 +1,113 @@
+import json
+from pathlib import Path
+
+import geopandas as gpd
+import pytest
+
+from dist_s1_enumerator.dist_enum import enumerate_dist_s1_products
+from dist_s1_enumerator.metrics import (
+    MetricEvent,
+    MetricsRegistry,
+    add_metrics_hook,
+    collect_metrics,
+    get_metrics,
+    increment,
+    observe,
+    remove_metrics_hook,
+    set_gauge,
+    timer,
+)
+from dist_s1_enumerator.mgrs_burst_data import get_burst_ids_in_mgrs_tiles
+
+
+def test_metrics_registry_exports() -> None:
+    assert get_metrics() is None
+    with collect_metrics() as metrics:
+        assert get_metrics() is metrics
+        increment('asf_searches_total')
+        increment('asf_searches_total', 2)
+        increment('lut_lookups_total', table='mgrs_burst_lut')
+        set_gauge('download_throughput_bytes_per_second', 1e6)
+        observe('enumeration_seconds', 0.5, mgrs_tile_id='11SLT')
+        observe('enumeration_seconds', 1.5, mgrs_tile_id='11SLT')
+        with pytest.raises(ValueError), timer('asf_search_seconds'):
+            raise ValueError('Timed blocks raising an exception are recorded')
+    assert get_metrics() is None
+    # Nothing is recorded once disabled
+    increment('asf_searches_total')
+
+    assert metrics.get_counter('asf_searches_total') == 3
+    assert metrics.get_counter('lut_lookups_total', table='mgrs_burst_lut') == 1
+    assert metrics.get_counter('lut_lookups_total') == 0
+    assert metrics.timers[('enumeration_seconds', (('mgrs_tile_id', '11SLT'),))] == (2, 2.0, 1.5)
+    assert metrics.timers[('asf_search_seconds', ())][0] == 1
+
+    records = json.loads(metrics.to_json())
+    assert {'name': 'asf_searches_total', 'labels': {}, 'value': 3} in records['counters']
+    assert {
+        'name': 'enumeration_seconds',
+        'labels': {'mgrs_tile_id': '11SLT'},
+        'count': 2,
+        'total_seconds': 2.0,
+        'max_seconds': 1.5,
+    } in records['timers']
+
+    lines = metrics.to_prometheus().splitlines()
+    assert '# TYPE dist_s1_enumerator_asf_searches_total counter' in lines
+    assert 'dist_s1_enumerator_asf_searches_total 3' in lines
+    assert 'dist_s1_enumerator_lut_lookups_total{table="mgrs_burst_lut"} 1' in lines
+    assert '# TYPE dist_s1_enumerator_download_throughput_bytes_per_second gauge' in lines
+    assert '# TYPE dist_s1_enumerator_enumeration_seconds summary' in lines
+    assert 'dist_s1_enumerator_enumeration_seconds_count{mgrs_tile_id="11SLT"} 2' in lines
+    assert 'dist_s1_enumerator_enumeration_seconds_sum{mgrs_tile_id="11SLT"} 2' in lines
+
+    metrics.reset()
+    assert metrics.to_dict() == {'counters': [], 'gauges': [], 'timers': []}
+    assert MetricsRegistry().to_prometheus() == '\n'
+
+
+def test_metrics_hooks() -> None:
+    # The LUT is read (and validated) once per process
+    get_burst_ids_in_mgrs_tiles(['11SLT'])
+    events = []
+    add_metrics_hook(events.append)
+    try:
+        get_burst_ids_in_mgrs_tiles(['11SLT'])
+    finally:
+        remove_metrics_hook(events.append)
+    get_burst_ids_in_mgrs_tiles(['11SLT'])
+
+    assert events == [MetricEvent('counter', 'lut_lookups_total', 1, {'table': 'mgrs_burst_lut'})]
+
+
+def test_failing_metrics_hook() -> None:
+    def failing_hook(event: MetricEvent) -> None:
+        raise ConnectionError('exporter unreachable')
+
+    add_metrics_hook(failing_hook)
+    try:
+        with collect_metrics() as metrics:
+            with pytest.warns(RuntimeWarning, match='exporter unreachable'):
+                with timer('enumeration_seconds'):
+                    increment('asf_searches_total')
+    finally:
+        remove_metrics_hook(failing_hook)
+
+    assert metrics.get_counter('asf_searches_total') == 1
+    assert metrics.timers[('enumeration_seconds', ())][0] == 1
+
+
+def test_enumeration_metrics(test_dir: Path) -> None:
+    mgrs_tile_ids = ['11SLT', '11SLU', '11SMT']
+    parquet_path = test_dir / 'data' / 'rtc_s1_ts_metadata' / 'mgrs11SLT_11SLU_11SMT.parquet'
+    df_rtc_ts = gpd.read_parquet(parquet_path).drop_duplicates(subset=['opera_id']).reset_index(drop=True)
+
+    with collect_metrics() as metrics:
+        df_products = enumerate_dist_s1_products(df_rtc_ts, mgrs_tile_ids, tqdm_enabled=False)
+
+    assert metrics.get_counter('products_enumerated_total') == df_products.product_id.nunique()
+    timed_tiles = {dict(labels)['mgrs_tile_id'] for (name, labels) in metrics.timers if name == 'enumeration_seconds'}
+    assert timed_tiles == set(mgrs_tile_ids)
+    validation_timers = [dict(labels) for (name, labels) in metrics.timers if name == 'validation_seconds']
+    assert {'schema': 'rtc_s1_schema', 'mode': 'full'} in validation_timers
+    assert {'schema': 'dist_s1_input_schema', 'mode': 'full'} in validation_timers
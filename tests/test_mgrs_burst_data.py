@@ -1,17 +1,33 @@
 import pathlib
 from pathlib import Path
 
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
-from shapely.geometry import LineString, MultiPolygon, Point, Polygon
+from pandas.testing import assert_frame_equal
+from pytest_mock import MockerFixture
+from shapely.geometry import LineString, MultiPolygon, Point, Polygon, box
 
 from dist_s1_enumerator.constants import BLACKLISTED_MGRS_TILE_IDS, MAX_BURSTS_IN_MGRS_TILE
 from dist_s1_enumerator.exceptions import NoMGRSCoverage
 from dist_s1_enumerator.mgrs_burst_data import (
+    MgrsBurstLut,
+    build_burst_table,
+    build_mgrs_burst_lut_arrow,
+    get_burst_data_path,
+    get_burst_ids_by_mgrs_tile,
     get_burst_ids_in_mgrs_tiles,
     get_burst_table,
+    get_burst_table_from_mgrs_tiles,
     get_lut_by_mgrs_tile_ids,
     get_mgrs_burst_lut,
+    get_mgrs_burst_lut_index,
+    get_mgrs_burst_lut_path,
     get_mgrs_table,
+    get_mgrs_tile_ids_overlapping_geometries,
     get_mgrs_tiles_overlapping_geometry,
 )
 
@@ -27,12 +43,19 @@ def test_burst_lookup_by_mgrs_tile_id(mgrs_tile_id: str) -> None:
     assert n <= MAX_BURSTS_IN_MGRS_TILE
 
 
-@pytest.mark.parametrize('burst_id', get_burst_table()['jpl_burst_id'].sample(10).tolist())
-def test_burst_lookup_by_id(burst_id: str) -> None:
-    df_burst = get_burst_table(burst_id)
-    assert df_burst.columns.tolist() == ['jpl_burst_id', 'geometry']
-    assert not df_burst.empty
-    assert df_burst.shape[0] == 1
+# The burst geometry table is not shipped with the package - tests of its contents need a table built from the
+# OPERA burst database, the others use the (possibly synthetic) table of the `burst_table_path` fixture
+requires_burst_table = pytest.mark.skipif(
+    not get_burst_data_path().exists(), reason='No burst geometry table (see `build_burst_table`)'
+)
+
+
+def test_burst_lookup_by_id(burst_table_path: Path) -> None:
+    for burst_id in get_burst_table()['jpl_burst_id'].sample(10).tolist():
+        df_burst = get_burst_table(burst_id)
+        assert df_burst.columns.tolist() == ['jpl_burst_id', 'geometry']
+        assert not df_burst.empty
+        assert df_burst.shape[0] == 1
 
 
 # Adds some problemeatic tiles including one near the equator (`22NFF`)
@@ -122,7 +145,7 @@ def test_no_mgrs_coverage() -> None:
         get_mgrs_tiles_overlapping_geometry(Point(-35, 35))
 
 
-def test_empty_errors() -> None:
+def test_empty_errors(burst_table_path: Path) -> None:
     with pytest.raises(ValueError, match='No burst data found for foo'):
         _ = get_burst_table('foo')
 
@@ -146,6 +169,37 @@ def test_mgrs_tile_track_mismatch() -> None:
         _ = get_burst_ids_in_mgrs_tiles('15RXN', track_numbers=[1])
 
 
+def test_get_burst_ids_by_mgrs_tile() -> None:
+    mgrs_tile_ids = ['22NFF', '01VCK', '15RXN', '22NFF']
+    burst_ids_by_tile = get_burst_ids_by_mgrs_tile(mgrs_tile_ids)
+    assert list(burst_ids_by_tile) == ['22NFF', '01VCK', '15RXN']
+    for mgrs_tile_id, burst_ids in burst_ids_by_tile.items():
+        assert burst_ids == get_burst_ids_in_mgrs_tiles(mgrs_tile_id)
+    assert get_burst_ids_in_mgrs_tiles(mgrs_tile_ids) == list(
+        dict.fromkeys(get_burst_ids_in_mgrs_tiles(['01VCK', '15RXN', '22NFF']))
+    )
+
+    # Both tracks of the pass crossing the equator
+    burst_ids_by_tile = get_burst_ids_by_mgrs_tile(['22NFF'], track_numbers=[148])
+    assert burst_ids_by_tile['22NFF'] == get_burst_ids_in_mgrs_tiles('22NFF', track_numbers=[148, 149])
+
+    # Track 42 is in acq_group_id_within_mgrs_tile 0 of 11SKV and 1 of 11SKU: each tile keeps its own pass
+    burst_ids_by_tile = get_burst_ids_by_mgrs_tile(['11SKV', '11SKU'], track_numbers=[42])
+    assert burst_ids_by_tile == {
+        mgrs_tile_id: get_burst_ids_in_mgrs_tiles(mgrs_tile_id, track_numbers=[42])
+        for mgrs_tile_id in ['11SKV', '11SKU']
+    }
+    burst_ids = get_burst_ids_in_mgrs_tiles(['11SKV', '11SKU'], track_numbers=[42])
+    assert burst_ids == list(dict.fromkeys(burst_ids_by_tile['11SKV'] + burst_ids_by_tile['11SKU']))
+
+    with pytest.raises(ValueError, match='Mismatch - no LUT data found for MGRS tile ids 15RXN, 22NFF'):
+        get_burst_ids_by_mgrs_tile(['15RXN', '22NFF'], track_numbers=[63])
+    with pytest.raises(ValueError, match='Multiple acq_group_id_within_mgrs_tile found for mgrs_tile_id 22NFF'):
+        get_burst_ids_by_mgrs_tile(['22NFF'], track_numbers=[148, 170])
+    with pytest.raises(ValueError, match='No LUT data found for MGRS tile ids foo'):
+        get_burst_ids_by_mgrs_tile(['foo'])
+
+
 def test_blacklist_mgrs_tiles(test_dir: Path) -> None:
     hls_txt_file = test_dir / 'data' / 'dist_hls_tiles.txt'
     with pathlib.Path(hls_txt_file).open('r') as f:
@@ -158,6 +212,7 @@ def test_blacklist_mgrs_tiles(test_dir: Path) -> None:
     assert set(BLACKLISTED_MGRS_TILE_IDS) == set(expected_blacklist_tiles)
 
 
+@requires_burst_table
 def test_all_bursts_in_lut() -> None:
     df_bursts = get_burst_table()
     df_mgrs_lut = get_mgrs_burst_lut()
@@ -167,6 +222,7 @@ def test_all_bursts_in_lut() -> None:
     assert len(burst_ids_not_in_lut) == 0
 
 
+@requires_burst_table
 def test_antimeridian_crossing() -> None:
     df_mgrs = get_mgrs_table()
     df_burst = get_burst_table()
@@ -182,3 +238,128 @@ def test_antimeridian_crossing() -> None:
             df_antimerid_not = df[~ind_anti].reset_index(drop=True)
             any_multis = (df_antimerid_not.geometry.map(lambda geo: isinstance(geo, MultiPolygon))).sum()
             assert any_multis == 0
+
+
+def test_mgrs_burst_lut_index() -> None:
+    df_lut = get_mgrs_burst_lut()
+    lut = get_mgrs_burst_lut_index()
+    assert get_mgrs_burst_lut_index() is lut
+
+    ind = df_lut.mgrs_tile_id.isin(['22NFF', '15RXN'])
+    assert_frame_equal(
+        lut.take(lut.get_positions(mgrs_tile_ids=['22NFF', '15RXN'])), df_lut[ind].reset_index(drop=True)
+    )
+    assert_frame_equal(get_lut_by_mgrs_tile_ids(['15RXN', '22NFF']), df_lut[ind].reset_index(drop=True))
+
+    ind = (df_lut.mgrs_tile_id == '22NFF') & (df_lut.track_number == 148)
+    positions = lut.get_positions(mgrs_tile_ids='22NFF', track_numbers=[148])
+    assert np.array_equal(positions, np.flatnonzero(ind))
+
+    ind = (df_lut.mgrs_tile_id == '22NFF') & (df_lut.acq_group_id_within_mgrs_tile == 1)
+    assert np.array_equal(lut.get_positions(acq_group_ids=[('22NFF', 1)]), np.flatnonzero(ind))
+
+    ind = df_lut.jpl_burst_id == 'T001-000696-IW1'
+    assert np.array_equal(lut.get_positions(jpl_burst_ids=['T001-000696-IW1']), np.flatnonzero(ind))
+
+    assert lut.get_positions(mgrs_tile_ids=['foo'], acq_group_ids=[('foo', 0)]).size == 0
+    # Out of range ids do not match the groups of the neighbouring tiles (01FBE and 01FBF have groups 0 to 3)
+    n_acq_group_ids = int(df_lut.acq_group_id_within_mgrs_tile.max()) + 1
+    assert lut.get_positions(acq_group_ids=[('01FBF', 0)]).size > 0
+    assert lut.get_positions(acq_group_ids=[('01FBE', n_acq_group_ids)]).size == 0
+    assert lut.get_positions(acq_group_ids=[('01FBF', -n_acq_group_ids), ('01FBF', -1)]).size == 0
+    with pytest.raises(ValueError, match='No index for orbit_pass'):
+        lut.get_index('orbit_pass')
+
+
+def test_mgrs_burst_lut_arrow(tmp_path: Path) -> None:
+    arrow_path = build_mgrs_burst_lut_arrow(tmp_path / 'mgrs_burst_lookup_table.arrow')
+    assert list(tmp_path.iterdir()) == [arrow_path]
+
+    # Reading the memory-mapped file does not allocate the columns
+    allocated_bytes = pa.total_allocated_bytes()
+    table = pa.ipc.open_file(pa.memory_map(str(arrow_path), 'r')).read_all()
+    assert pa.total_allocated_bytes() == allocated_bytes
+    assert table.schema.field('mgrs_tile_id').type == pa.dictionary(pa.int16(), pa.string())
+    assert table.schema.field('jpl_burst_id').type == pa.dictionary(pa.int32(), pa.string())
+    assert table.schema.field('acq_group_id_within_mgrs_tile').type == pa.int8()
+
+    lut = MgrsBurstLut(table)
+    df_lut = pd.read_parquet(get_mgrs_burst_lut_path())
+    assert_frame_equal(lut.df, df_lut[lut.df.columns])
+    # The dictionaries are sorted so codes order like the ids
+    mgrs_tile_ids = table.column('mgrs_tile_id').chunk(0).dictionary.to_pylist()
+    assert mgrs_tile_ids == sorted(mgrs_tile_ids)
+    assert np.array_equal(
+        lut.get_positions(mgrs_tile_ids=['22NFF']), np.flatnonzero(df_lut.mgrs_tile_id.to_numpy() == '22NFF')
+    )
+    assert_frame_equal(MgrsBurstLut(df_lut).take(np.arange(10)), lut.take(np.arange(10)))
+
+
+def test_build_burst_table(tmp_path: Path, mocker: MockerFixture) -> None:
+    # Footprints in the format of the OPERA burst database, including a burst that is not in the lookup table
+    burst_ids = get_burst_ids_in_mgrs_tiles(['22NFF', '11SLT']) + ['T999-999999-IW1']
+    df_source = gpd.GeoDataFrame(
+        {'burst_id_jpl': [burst_id.lower().replace('-', '_') for burst_id in burst_ids]},
+        geometry=[box(k, 0, k + 1, 1) for k in range(len(burst_ids))],
+        crs='EPSG:4326',
+    ).iloc[::-1]
+    source_path = tmp_path / 'burst_footprints.geojson'
+    df_source.to_file(source_path)
+
+    parquet_path = build_burst_table(source_path, tmp_path / 'jpl_burst_geo.parquet', row_group_size=8)
+    assert sorted(tmp_path.iterdir()) == [source_path, parquet_path]
+    df_bursts = gpd.read_parquet(parquet_path)
+    assert df_bursts.columns.tolist() == ['jpl_burst_id', 'track_number', 'geometry']
+    assert df_bursts.jpl_burst_id.tolist() == sorted(burst_ids[:-1])
+    # Row groups are sorted by track number so a track only spans a few of them
+    metadata = pq.ParquetFile(parquet_path).metadata
+    track_number_column = df_bursts.columns.get_loc('track_number')
+    track_ranges = [
+        (
+            metadata.row_group(k).column(track_number_column).statistics.min,
+            metadata.row_group(k).column(track_number_column).statistics.max,
+        )
+        for k in range(metadata.num_row_groups)
+    ]
+    assert metadata.num_row_groups > 1
+    assert track_ranges == sorted(track_ranges)
+
+    mocker.patch('dist_s1_enumerator.mgrs_burst_data.get_burst_data_path', return_value=parquet_path)
+    burst_ids_11slt = get_burst_ids_in_mgrs_tiles('11SLT')
+    df_burst = get_burst_table(burst_ids_11slt)
+    assert df_burst.columns.tolist() == ['jpl_burst_id', 'geometry']
+    assert df_burst.crs == 'EPSG:4326'
+    df_expected = df_bursts[df_bursts.jpl_burst_id.isin(burst_ids_11slt)].drop(columns=['track_number'])
+    assert_frame_equal(df_burst, df_expected.reset_index(drop=True))
+    assert_frame_equal(get_burst_table(burst_ids_11slt[:3]), df_expected.head(3).reset_index(drop=True))
+    assert_frame_equal(get_burst_table(), df_bursts.drop(columns=['track_number']))
+
+    df_burst_tile = get_burst_table_from_mgrs_tiles('11SLT')
+    assert sorted(df_burst_tile.jpl_burst_id) == sorted(burst_ids_11slt)
+    assert (df_burst_tile.mgrs_tile_id == '11SLT').all()
+
+    with pytest.raises(ValueError, match='No burst data found for T999-999999-IW1, foo'):
+        get_burst_table(['T999-999999-IW1', 'foo'])
+    mocker.patch('dist_s1_enumerator.mgrs_burst_data.get_burst_data_path', return_value=tmp_path / 'missing.parquet')
+    with pytest.raises(FileNotFoundError, match='build_burst_table'):
+        get_burst_table(burst_ids_11slt)
+
+
+def test_get_mgrs_tile_ids_overlapping_geometries() -> None:
+    df_mgrs = get_mgrs_table()
+    # Wax Lake, an AOI near the antimeridian, a point in the Atlantic Ocean and an AOI near the equator
+    geometries = [Point(-91.45, 29.5), box(179.5, 60, 180, 61), Point(-35, 35), box(-51, 1, -50, 1.5)]
+
+    df_pairs = get_mgrs_tile_ids_overlapping_geometries(geometries)
+    assert df_pairs.columns.tolist() == ['geometry_index', 'mgrs_tile_id']
+    expected_pairs = [
+        (k, mgrs_tile_id)
+        for (k, geometry) in enumerate(geometries)
+        for mgrs_tile_id in df_mgrs.mgrs_tile_id[df_mgrs.intersects(geometry)]
+    ]
+    assert list(zip(df_pairs.geometry_index.tolist(), df_pairs.mgrs_tile_id.tolist())) == expected_pairs
+    assert df_pairs[df_pairs.geometry_index == 0].mgrs_tile_id.tolist() == ['15RXN']
+    assert 2 not in df_pairs.geometry_index.tolist()
+
+    df_mgrs_overlapping = get_mgrs_tiles_overlapping_geometry(geometries[3])
+    assert df_mgrs_overlapping.mgrs_tile_id.tolist() == df_pairs[df_pairs.geometry_index == 3].mgrs_tile_id.tolist()
@@ -1,9 +1,63 @@
 from __future__ import annotations
 
 import importlib.metadata
+import json
+import subprocess
+import sys
+
+import pytest
 
 import dist_s1_enumerator as package
 
 
 def test_version() -> None:
     assert importlib.metadata.version('dist_s1_enumerator') == package.__version__
+
+
+HEAVY_MODULES = [
+    'aiohttp',
+    'asf_search',
+    'geopandas',
+    'pandera',
+    'pydantic',
+    'rasterio',
+    'requests',
+    'tenacity',
+    'tqdm',
+]
+
+
+def get_import_stats(statement: str) -> dict:
+    """Run an import statement in a fresh interpreter and get its duration and the heavy modules it loads."""
+    code = f"""
+import json, sys, time, warnings
+warnings.simplefilter('ignore')
+start = time.perf_counter()
+{statement}
+duration = time.perf_counter() - start
+print(json.dumps({{'duration': duration, 'modules': [name for name in {HEAVY_MODULES} if name in sys.modules]}}))
+"""
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_time() -> None:
+    stats = get_import_stats('import dist_s1_enumerator')
+    assert stats['modules'] == []
+    # Importing all the dependencies takes seconds
+    assert stats['duration'] < 0.5
+
+    stats = get_import_stats('from dist_s1_enumerator import get_mgrs_table')
+    assert 'asf_search' not in stats['modules']
+    assert 'rasterio' not in stats['modules']
+
+    stats = get_import_stats('from dist_s1_enumerator import enumerate_dist_s1_products')
+    assert 'asf_search' not in stats['modules']
+
+
+def test_lazy_attributes() -> None:
+    for name in package.__all__:
+        assert getattr(package, name) is not None
+    assert set(package.__all__) <= set(dir(package))
+    with pytest.raises(AttributeError, match='has no attribute'):
+        package.not_a_function  # noqa: B018
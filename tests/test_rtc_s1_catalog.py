@@ -0,0 +1,114 @@
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+
+import geopandas as gpd
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+from pytest_mock import MockerFixture
+
+from dist_s1_enumerator.asf import get_rtc_s1_ts_metadata_from_mgrs_tiles
+from dist_s1_enumerator.rtc_s1_catalog import RtcS1MetadataCatalog
+from dist_s1_enumerator.tabular_models import reorder_columns, rtc_s1_resp_schema
+
+
+@pytest.fixture
+def df_rtc_resp(test_dir: Path) -> gpd.GeoDataFrame:
+    parquet_path = test_dir / 'data' / 'rtc_s1_ts_metadata' / 'mgrs15RXN__track63.parquet'
+    df_rtc = gpd.read_parquet(parquet_path).drop_duplicates(subset=['opera_id'])
+    df_rtc = reorder_columns(df_rtc, rtc_s1_resp_schema)
+    return df_rtc.sort_values(by=['jpl_burst_id', 'acq_dt']).reset_index(drop=True)
+
+
+def get_fake_search(
+    df_rtc_resp: gpd.GeoDataFrame, now: pd.Timestamp, calls: list[dict]
+) -> Callable[..., gpd.GeoDataFrame]:
+    """Make an offline stand-in for get_rtc_s1_ts_metadata_by_burst_ids with data acquired before `now`."""
+
+    def fake_search(
+        burst_ids: list[str],
+        start_acq_dt: str | datetime | pd.Timestamp | None = None,
+        stop_acq_dt: str | datetime | pd.Timestamp | None = None,
+        polarizations: str | None = None,
+    ) -> gpd.GeoDataFrame:
+        calls.append({'burst_ids': burst_ids, 'start_acq_dt': start_acq_dt, 'stop_acq_dt': stop_acq_dt})
+        ind = df_rtc_resp.jpl_burst_id.isin(burst_ids) & (df_rtc_resp.acq_dt < now)
+        if start_acq_dt is not None:
+            ind &= df_rtc_resp.acq_dt >= pd.to_datetime(start_acq_dt, utc=True)
+        if stop_acq_dt is not None:
+            ind &= df_rtc_resp.acq_dt <= pd.to_datetime(stop_acq_dt, utc=True)
+        return df_rtc_resp[ind].reset_index(drop=True)
+
+    return fake_search
+
+
+def test_catalog_incremental_sync(df_rtc_resp: gpd.GeoDataFrame, tmp_path: Path) -> None:
+    catalog = RtcS1MetadataCatalog(tmp_path / 'catalog')
+    burst_ids = df_rtc_resp.jpl_burst_id.unique().tolist()
+
+    calls = []
+    first_sync = pd.Timestamp('2023-01-01', tz='UTC')
+    df_new = catalog.sync(burst_ids, search_fn=get_fake_search(df_rtc_resp, first_sync, calls))
+    assert len(calls) == 1
+    assert calls[0]['start_acq_dt'] is None
+    assert df_new.shape[0] == (df_rtc_resp.acq_dt < first_sync).sum()
+
+    # The second sync only requests acquisitions after the high-water marks
+    calls = []
+    second_sync = pd.Timestamp('2030-01-01', tz='UTC')
+    df_new = catalog.sync(burst_ids, search_fn=get_fake_search(df_rtc_resp, second_sync, calls))
+    assert len(calls) == 1
+    assert calls[0]['start_acq_dt'] < first_sync
+    assert (df_new.acq_dt >= first_sync).all()
+    assert df_new.shape[0] == (df_rtc_resp.acq_dt >= first_sync).sum()
+
+    # Nothing new
+    calls = []
+    df_new = catalog.sync(burst_ids, search_fn=get_fake_search(df_rtc_resp, second_sync, calls))
+    assert df_new.empty
+
+    df_catalog = catalog.read(burst_ids)
+    assert_frame_equal(df_catalog, df_rtc_resp)
+
+    catalog.compact()
+    assert len(list(catalog.get_partition_dir(63).glob('*.parquet'))) == 1
+    assert_frame_equal(catalog.read(burst_ids), df_rtc_resp)
+
+
+def test_catalog_read_filters(df_rtc_resp: gpd.GeoDataFrame, tmp_path: Path) -> None:
+    catalog = RtcS1MetadataCatalog(tmp_path / 'catalog')
+    catalog.write(df_rtc_resp)
+
+    burst_ids = df_rtc_resp.jpl_burst_id.unique().tolist()[:2]
+    start_acq_dt = pd.Timestamp('2022-01-01', tz='UTC')
+    stop_acq_dt = pd.Timestamp('2022-06-01', tz='UTC')
+    df_catalog = catalog.read(burst_ids, start_acq_dt=start_acq_dt, stop_acq_dt=stop_acq_dt)
+
+    ind = (
+        df_rtc_resp.jpl_burst_id.isin(burst_ids)
+        & (df_rtc_resp.acq_dt >= start_acq_dt)
+        & (df_rtc_resp.acq_dt <= stop_acq_dt)
+    )
+    assert not df_catalog.empty
+    assert_frame_equal(df_catalog, df_rtc_resp[ind].reset_index(drop=True))
+
+    assert catalog.read(['T001-000001-IW1']).empty
+
+
+def test_get_rtc_s1_ts_metadata_from_mgrs_tiles_with_catalog(
+    df_rtc_resp: gpd.GeoDataFrame, tmp_path: Path, mocker: MockerFixture
+) -> None:
+    calls = []
+    fake_search = get_fake_search(df_rtc_resp, pd.Timestamp('2030-01-01', tz='UTC'), calls)
+    mocker.patch('dist_s1_enumerator.asf.get_rtc_s1_ts_metadata_by_burst_ids', side_effect=fake_search)
+
+    catalog = RtcS1MetadataCatalog(tmp_path / 'catalog')
+    df_from_search = get_rtc_s1_ts_metadata_from_mgrs_tiles(['15RXN'], track_numbers=[63])
+    df_from_catalog = get_rtc_s1_ts_metadata_from_mgrs_tiles(['15RXN'], track_numbers=[63], catalog=catalog)
+    assert_frame_equal(df_from_catalog, df_from_search)
+
+    # Only the initial sync searches the full history
+    df_from_catalog = get_rtc_s1_ts_metadata_from_mgrs_tiles(['15RXN'], track_numbers=[63], catalog=catalog)
+    assert [call['start_acq_dt'] is None for call in calls] == [True, True, False]
+    assert_frame_equal(df_from_catalog, df_from_search)
@@ -1,9 +1,50 @@
+import asyncio
+import concurrent.futures
+import threading
+from collections.abc import Generator
 from pathlib import Path
 
+import geopandas as gpd
+import pandas as pd
 import pytest
+from pytest_mock import MockerFixture
+from tenacity import wait_none
 
 from dist_s1_enumerator.asf import append_pass_data, get_rtc_s1_ts_metadata_by_burst_ids
-from dist_s1_enumerator.rtc_s1_io import generate_rtc_s1_local_paths, localize_rtc_s1_ts
+from dist_s1_enumerator.metrics import MetricEvent, add_metrics_hook, collect_metrics, remove_metrics_hook
+from dist_s1_enumerator.rtc_s1_async_io import create_async_download_session, localize_one_rtc_async
+from dist_s1_enumerator.rtc_s1_io import (
+    append_local_paths,
+    generate_rtc_s1_local_paths,
+    get_partial_download_path,
+    get_size_sidecar_path,
+    localize_one_rtc,
+    localize_rtc_s1_ts,
+)
+from dist_s1_enumerator.tabular_models import reorder_columns, rtc_s1_schema
+from file_server import FileServer, serve_rtc_files
+
+
+@pytest.fixture
+def df_rtc_in_two_tiles(test_dir: Path) -> gpd.GeoDataFrame:
+    """RTC-S1 metadata of 3 products where each burst lies in 2 MGRS tiles."""
+    parquet_path = test_dir / 'data' / 'rtc_s1_ts_metadata' / 'mgrs15RXN__track63.parquet'
+    df_rtc = gpd.read_parquet(parquet_path).drop_duplicates(subset=['opera_id']).head(3)
+    df_rtc_other_tile = df_rtc.assign(mgrs_tile_id='15RYN')
+    df_rtc = pd.concat([df_rtc, df_rtc_other_tile], axis=0).reset_index(drop=True)
+    return reorder_columns(df_rtc, rtc_s1_schema)
+
+
+@pytest.fixture
+def file_server() -> Generator[FileServer, None, None]:
+    with FileServer() as server:
+        yield server
+
+
+def fake_localize_one_rtc(url: str, out_path: Path, session: object = None, downloaded_bytes: object = None) -> Path:
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(url)
+    return out_path
 
 
 def test_generate_rtc_s1_dst_paths() -> None:
@@ -58,3 +99,206 @@ def test_lookup_and_download_rtc(burst_id: str, mgrs_tile_id: str, tmpdir: Path)
     # Check that the data was downloaded and a directory was created for the track number
     track_number = int(burst_id.split('-')[0][1:])
     assert (Path(tmpdir) / mgrs_tile_id / str(track_number)).exists()
+
+
+@pytest.mark.parametrize('link_mode', ['hardlink', 'symlink'])
+def test_localize_rtc_s1_ts_downloads_each_file_once(
+    df_rtc_in_two_tiles: gpd.GeoDataFrame, link_mode: str, tmp_path: Path, mocker: MockerFixture
+) -> None:
+    mock_localize = mocker.patch('dist_s1_enumerator.rtc_s1_io.localize_one_rtc', side_effect=fake_localize_one_rtc)
+
+    df_loc = localize_rtc_s1_ts(df_rtc_in_two_tiles, tmp_path, tqdm_enabled=False, link_mode=link_mode)
+    assert mock_localize.call_count == 3 * 2
+    assert all(call.args[1].parent == tmp_path / 'blobs' for call in mock_localize.call_args_list)
+
+    for polarization_token in ['copol', 'crosspol']:
+        loc_paths = [Path(path) for path in df_loc[f'loc_path_{polarization_token}']]
+        assert all(path.parent.parent.parent.name in ['15RXN', '15RYN'] for path in loc_paths)
+        assert [path.read_text() for path in loc_paths] == df_loc[f'url_{polarization_token}'].tolist()
+        if link_mode == 'hardlink':
+            assert all(path.stat().st_nlink == 3 for path in loc_paths)
+        else:
+            assert all(path.is_symlink() for path in loc_paths)
+
+    # Nothing is downloaded again
+    mock_localize.reset_mock()
+    localize_rtc_s1_ts(df_rtc_in_two_tiles, tmp_path, tqdm_enabled=False, link_mode=link_mode)
+    assert all(call.args[1].exists() for call in mock_localize.call_args_list)
+
+
+def test_localize_one_rtc_resumes_dropped_download(
+    file_server: FileServer, tmp_path: Path, mocker: MockerFixture
+) -> None:
+    mocker.patch.object(localize_one_rtc.retry, 'wait', wait_none())
+    data = bytes(range(256)) * 1000
+    file_server.files['/OPERA_VV.tif'] = data
+    file_server.drop_after['/OPERA_VV.tif'] = 100_000
+    out_path = tmp_path / 'OPERA_VV.tif'
+
+    with collect_metrics() as metrics:
+        localize_one_rtc(f'{file_server.url}/OPERA_VV.tif', out_path)
+    assert out_path.read_bytes() == data
+    assert metrics.get_counter('download_retries_total') == 1
+    assert metrics.get_counter('download_files_total') == 1
+    assert get_size_sidecar_path(out_path).read_text() == str(len(data))
+    assert not get_partial_download_path(out_path).exists()
+    # The retry only requests the bytes missing from the partial download
+    assert [request[:2] for request in file_server.requests] == [('GET', '/OPERA_VV.tif')] * 2
+    assert file_server.requests[0][2] is None
+    resume_start = int(file_server.requests[1][2].removeprefix('bytes=').removesuffix('-'))
+    assert 0 < resume_start <= 100_000
+
+    # Verified files are not requested again
+    localize_one_rtc(f'{file_server.url}/OPERA_VV.tif', out_path)
+    assert len(file_server.requests) == 2
+
+
+def test_localize_one_rtc_with_existing_files(file_server: FileServer, tmp_path: Path) -> None:
+    data = b'0123456789' * 1000
+    file_server.files['/OPERA_VH.tif'] = data
+    url = f'{file_server.url}/OPERA_VH.tif'
+    out_path = tmp_path / 'OPERA_VH.tif'
+
+    # A complete partial download (e.g. interrupted before the rename) is finalized without downloading
+    get_partial_download_path(out_path).write_bytes(data)
+    localize_one_rtc(url, out_path)
+    assert out_path.read_bytes() == data
+    assert file_server.requests == [('GET', '/OPERA_VH.tif', 'bytes=10000-')]
+
+    # A truncated file without a sidecar (localized before sidecars existed) is downloaded again
+    file_server.requests.clear()
+    get_size_sidecar_path(out_path).unlink()
+    out_path.write_bytes(data[:10])
+    localize_one_rtc(url, out_path)
+    assert out_path.read_bytes() == data
+    assert file_server.requests == [('HEAD', '/OPERA_VH.tif', None), ('GET', '/OPERA_VH.tif', None)]
+
+    # A file that does not match its sidecar is downloaded again
+    file_server.requests.clear()
+    out_path.write_bytes(data[:10])
+    localize_one_rtc(url, out_path)
+    assert out_path.read_bytes() == data
+    assert file_server.requests == [('GET', '/OPERA_VH.tif', None)]
+
+
+@pytest.mark.parametrize('head_response', [403, b'<html>Log in</html>'])
+@pytest.mark.parametrize('engine', ['threads', 'asyncio'])
+def test_localize_legacy_files_when_head_requests_cannot_verify_them(
+    df_rtc_in_two_tiles: gpd.GeoDataFrame,
+    engine: str,
+    head_response: int | bytes,
+    file_server: FileServer,
+    tmp_path: Path,
+) -> None:
+    df_rtc = serve_rtc_files(df_rtc_in_two_tiles.head(1), file_server)
+    # A file localized before the size sidecars existed (with a different size than the server's HEAD response)
+    legacy_path = Path(append_local_paths(df_rtc, tmp_path)['loc_path_copol'].iloc[0])
+    legacy_path.parent.mkdir(parents=True, exist_ok=True)
+    legacy_path.write_bytes(b'legacy data')
+    file_server.head_responses[f'/{legacy_path.name}'] = head_response
+
+    localize_rtc_s1_ts(df_rtc, tmp_path, tqdm_enabled=False, engine=engine)
+    # The file is kept and adopted with a sidecar
+    assert legacy_path.read_bytes() == b'legacy data'
+    assert get_size_sidecar_path(tmp_path / 'blobs' / legacy_path.name).read_text() == str(len(b'legacy data'))
+    assert ('HEAD', f'/{legacy_path.name}', None) in file_server.requests
+
+    # So later calls do not make requests for it
+    file_server.requests.clear()
+    localize_rtc_s1_ts(df_rtc, tmp_path, tqdm_enabled=False, engine=engine)
+    assert file_server.requests == []
+
+
+def test_localize_rtc_s1_ts_replaces_truncated_legacy_files(
+    df_rtc_in_two_tiles: gpd.GeoDataFrame, file_server: FileServer, tmp_path: Path
+) -> None:
+    df_rtc = serve_rtc_files(df_rtc_in_two_tiles.head(1), file_server)
+    # A truncated file localized in the MGRS tile directory before the blob store existed
+    legacy_path = Path(append_local_paths(df_rtc, tmp_path)['loc_path_copol'].iloc[0])
+    legacy_path.parent.mkdir(parents=True, exist_ok=True)
+    legacy_path.write_bytes(b'0123456789')
+
+    df_loc = localize_rtc_s1_ts(df_rtc, tmp_path, tqdm_enabled=False)
+    loc_path = Path(df_loc['loc_path_copol'].iloc[0])
+    assert loc_path == legacy_path
+    assert loc_path.read_bytes() == file_server.files[f'/{loc_path.name}']
+    assert loc_path.samefile(tmp_path / 'blobs' / loc_path.name)
+
+
+@pytest.mark.parametrize('engine', ['threads', 'asyncio'])
+def test_localize_rtc_s1_ts_engines(
+    df_rtc_in_two_tiles: gpd.GeoDataFrame, engine: str, file_server: FileServer, tmp_path: Path
+) -> None:
+    df_rtc = serve_rtc_files(df_rtc_in_two_tiles, file_server)
+    with collect_metrics() as metrics:
+        df_loc = localize_rtc_s1_ts(df_rtc, tmp_path, tqdm_enabled=False, engine=engine, max_workers=4)
+
+    expected_loc_paths = append_local_paths(df_rtc, tmp_path)
+    for polarization_token in ['copol', 'crosspol']:
+        loc_paths = df_loc[f'loc_path_{polarization_token}']
+        assert loc_paths.tolist() == expected_loc_paths[f'loc_path_{polarization_token}'].astype(str).tolist()
+        file_names = [Path(path).name for path in loc_paths]
+        assert [Path(path).read_bytes() for path in loc_paths] == [name.encode() * 100 for name in file_names]
+    # Each file is requested once
+    assert sorted(request[1] for request in file_server.requests) == sorted(file_server.files)
+
+    assert metrics.get_counter('download_files_total') == len(file_server.files)
+    assert metrics.get_counter('download_bytes_total') == sum(len(data) for data in file_server.files.values())
+    assert metrics.gauges[('download_throughput_bytes_per_second', ())] > 0
+
+
+@pytest.mark.parametrize('engine', ['threads', 'asyncio'])
+def test_download_throughput_of_concurrent_calls(
+    df_rtc_in_two_tiles: gpd.GeoDataFrame, engine: str, file_server: FileServer, tmp_path: Path
+) -> None:
+    df_rtc = serve_rtc_files(df_rtc_in_two_tiles, file_server)
+    file_server.latency = 0.2
+    # Two calls downloading different files at the same time
+    dfs_rtc = [df_rtc.iloc[[0, 3]], df_rtc.iloc[[1, 2, 4, 5]]]
+
+    # A hook (without a registry) gets the events of the thread recording them
+    events = {}
+
+    def record_event(event: MetricEvent) -> None:
+        events.setdefault(threading.get_ident(), {})[event.name] = event.value
+
+    def localize(k: int) -> int:
+        localize_rtc_s1_ts(dfs_rtc[k], tmp_path / str(k), tqdm_enabled=False, engine=engine)
+        return threading.get_ident()
+
+    add_metrics_hook(record_event)
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            thread_ids = list(executor.map(localize, range(2)))
+    finally:
+        remove_metrics_hook(record_event)
+
+    for df, thread_id in zip(dfs_rtc, thread_ids):
+        file_names = {url.split('/')[-1] for url in df.url_copol.tolist() + df.url_crosspol.tolist()}
+        n_bytes = sum(len(file_server.files[f'/{file_name}']) for file_name in file_names)
+        thread_events = events[thread_id]
+        throughput = thread_events['download_throughput_bytes_per_second']
+        assert throughput * thread_events['localize_seconds'] == pytest.approx(n_bytes)
+
+
+def test_localize_one_rtc_async_resumes_dropped_download(
+    file_server: FileServer, tmp_path: Path, mocker: MockerFixture
+) -> None:
+    mocker.patch.object(localize_one_rtc_async.retry, 'wait', wait_none())
+    data = bytes(range(256)) * 1000
+    file_server.files['/OPERA_VV.tif'] = data
+    file_server.drop_after['/OPERA_VV.tif'] = 100_000
+    out_path = tmp_path / 'OPERA_VV.tif'
+
+    async def localize() -> Path:
+        async with create_async_download_session() as session:
+            return await localize_one_rtc_async(f'{file_server.url}/OPERA_VV.tif', out_path, session)
+
+    asyncio.run(localize())
+    assert out_path.read_bytes() == data
+    assert get_size_sidecar_path(out_path).read_text() == str(len(data))
+    assert [request[:2] for request in file_server.requests] == [('GET', '/OPERA_VV.tif')] * 2
+    assert file_server.requests[1][2].startswith('bytes=')
+
+    asyncio.run(localize())
+    assert len(file_server.requests) == 2
@@ -0,0 +1,163 @@
+from pathlib import Path
+
+import geopandas as gpd
+import pyarrow.parquet as pq
+import pytest
+from asf_search.exceptions import ASFSearch5xxError
+from pandas.testing import assert_frame_equal
+from pytest_mock import MockerFixture
+from tenacity import wait_none
+
+from dist_s1_enumerator.asf import (
+    get_rtc_s1_metadata_from_acq_group,
+    get_rtc_s1_ts_metadata_by_burst_ids,
+    search_rtc_s1_products,
+)
+from dist_s1_enumerator.metrics import collect_metrics
+from dist_s1_enumerator.rtc_s1_catalog import RtcS1MetadataCatalog
+from dist_s1_enumerator.search_backends import (
+    ASFSearchBackend,
+    FakeSearchBackend,
+    ParquetDatasetBackend,
+    SearchBackend,
+    get_search_backend,
+    search_backend,
+    set_search_backend,
+)
+from dist_s1_enumerator.tabular_models import reorder_columns, rtc_s1_resp_schema
+
+
+@pytest.fixture
+def df_rtc_ts(test_dir: Path) -> gpd.GeoDataFrame:
+    return gpd.read_parquet(test_dir / 'data' / 'rtc_s1_ts_metadata' / 'mgrs15RXN__track63.parquet')
+
+
+def test_fake_search_backend_matches_recorded_metadata(df_rtc_ts: gpd.GeoDataFrame) -> None:
+    backend = FakeSearchBackend(df_rtc_ts)
+    burst_ids = sorted(df_rtc_ts.jpl_burst_id.unique())
+    start_acq_dt, stop_acq_dt = '2021-06-01', '2024-01-01'
+
+    df_rtc = get_rtc_s1_ts_metadata_by_burst_ids(
+        burst_ids, start_acq_dt=start_acq_dt, stop_acq_dt=stop_acq_dt, max_bursts_per_search=None, backend=backend
+    )
+    assert len(backend.calls) == 1
+    assert backend.calls[0]['burst_ids'] == [burst_id.upper().replace('-', '_') for burst_id in burst_ids]
+
+    df_expected = df_rtc_ts.drop_duplicates(subset=['opera_id'])
+    df_expected = df_expected[(df_expected.acq_dt >= start_acq_dt) & (df_expected.acq_dt <= stop_acq_dt)]
+    assert sorted(df_rtc.opera_id) == sorted(df_expected.opera_id)
+    assert backend.calls[0]['n_products'] == df_rtc.shape[0]
+
+    df_chunked = get_rtc_s1_ts_metadata_by_burst_ids(
+        burst_ids,
+        start_acq_dt=start_acq_dt,
+        stop_acq_dt=stop_acq_dt,
+        max_bursts_per_search=3,
+        max_days_per_search=90,
+        backend=backend,
+    )
+    assert_frame_equal(df_chunked, df_rtc)
+
+
+def test_fake_search_backend_latency_and_concurrency(df_rtc_ts: gpd.GeoDataFrame) -> None:
+    backend = FakeSearchBackend(df_rtc_ts, latency_seconds=0.05, page_latency_seconds=0.01, page_size=10)
+    burst_ids = sorted(df_rtc_ts.jpl_burst_id.unique())
+
+    with collect_metrics() as metrics:
+        get_rtc_s1_ts_metadata_by_burst_ids(burst_ids, max_bursts_per_search=2, max_workers=4, backend=backend)
+    n_searches = -(-len(burst_ids) // 2)
+    assert len(backend.calls) == n_searches
+    assert backend.max_concurrent_searches == min(4, n_searches)
+    assert all(call['n_pages'] == max(1, -(-call['n_products'] // 10)) for call in backend.calls)
+    count, total_seconds, max_seconds = metrics.timers[('asf_search_seconds', ())]
+    assert count == n_searches
+    assert max_seconds >= 0.05 + 0.01
+
+
+def test_fake_search_backend_errors(df_rtc_ts: gpd.GeoDataFrame, mocker: MockerFixture) -> None:
+    mocker.patch.object(search_rtc_s1_products.retry, 'wait', wait_none())
+    burst_ids = ['T063_133337_IW3']
+
+    backend = FakeSearchBackend(df_rtc_ts, fail_first=2)
+    with collect_metrics() as metrics:
+        resp = search_rtc_s1_products(burst_ids, backend=backend)
+    assert len(resp) > 0
+    assert [call['n_products'] for call in backend.calls] == [None, None, len(resp)]
+    assert metrics.get_counter('asf_search_retries_total') == 2
+
+    backend = FakeSearchBackend(df_rtc_ts, error_rate=1.0)
+    with pytest.raises(ASFSearch5xxError, match='Simulated search failure'):
+        search_rtc_s1_products(burst_ids, backend=backend)
+
+    with pytest.raises(ValueError, match='error_rate'):
+        FakeSearchBackend(df_rtc_ts, error_rate=2.0)
+
+
+def test_search_backend_context_manager(df_rtc_ts: gpd.GeoDataFrame, mocker: MockerFixture) -> None:
+    mock_geo_search = mocker.patch('dist_s1_enumerator.asf.asf.geo_search')
+    backend = FakeSearchBackend(df_rtc_ts)
+
+    with search_backend(backend):
+        assert get_search_backend() is backend
+        df_rtc = get_rtc_s1_ts_metadata_by_burst_ids(['T063-133337-IW3'])
+    assert isinstance(get_search_backend(), ASFSearchBackend)
+    assert mock_geo_search.call_count == 0
+    assert len(backend.calls) == 1
+    assert (df_rtc.jpl_burst_id == 'T063-133337-IW3').all()
+
+    with pytest.raises(TypeError, match='Invalid search backend'):
+        set_search_backend('asf')
+
+
+def test_search_backend_requires_search() -> None:
+    class IncompleteBackend(SearchBackend):
+        pass
+
+    with pytest.raises(TypeError, match='search'):
+        IncompleteBackend()
+
+
+@pytest.mark.parametrize('layout', ['hive', 'catalog'])
+def test_parquet_dataset_backend(df_rtc_ts: gpd.GeoDataFrame, tmp_path: Path, layout: str) -> None:
+    df_resp = reorder_columns(df_rtc_ts.drop_duplicates(subset=['opera_id']), rtc_s1_resp_schema)
+    if layout == 'hive':
+        df_resp.to_parquet(tmp_path / 'rtc_s1.parquet')
+        pq.write_to_dataset(pq.read_table(tmp_path / 'rtc_s1.parquet'), tmp_path / 'dataset', ['track_number'])
+    else:
+        RtcS1MetadataCatalog(tmp_path / 'dataset').write(df_resp)
+    backend = ParquetDatasetBackend(tmp_path / 'dataset')
+    burst_ids = sorted(df_rtc_ts.jpl_burst_id.unique())[:5]
+
+    df_expected = get_rtc_s1_ts_metadata_by_burst_ids(
+        burst_ids, start_acq_dt='2023-01-01', stop_acq_dt='2024-01-01', backend=FakeSearchBackend(df_rtc_ts)
+    )
+    with collect_metrics() as metrics:
+        df_rtc = get_rtc_s1_ts_metadata_by_burst_ids(
+            burst_ids, start_acq_dt='2024-01-01', stop_acq_dt='2023-01-01', backend=backend
+        )
+    assert_frame_equal(df_rtc, df_expected)
+    # Rows of other bursts and dates are filtered by the dataset scan
+    assert metrics.get_counter('parquet_dataset_rows_total') == df_rtc.shape[0]
+    assert metrics.get_counter('asf_searches_total') == 0
+
+    assert len(search_rtc_s1_products(burst_ids, backend=backend)) == df_resp.jpl_burst_id.isin(burst_ids).sum()
+
+    with pytest.warns(UserWarning, match='No results'):
+        assert get_rtc_s1_ts_metadata_by_burst_ids(['T001-000001-IW1'], backend=backend).empty
+
+    df_resp.drop(columns=['url_copol']).to_parquet(tmp_path / 'incomplete.parquet')
+    with pytest.raises(ValueError, match='url_copol'):
+        ParquetDatasetBackend(tmp_path / 'incomplete.parquet')
+
+
+def test_get_rtc_s1_metadata_from_acq_group_with_parquet_dataset(df_rtc_ts: gpd.GeoDataFrame, tmp_path: Path) -> None:
+    RtcS1MetadataCatalog(tmp_path / 'catalog').write(
+        reorder_columns(df_rtc_ts.drop_duplicates(subset=['opera_id']), rtc_s1_resp_schema)
+    )
+    kwargs = {'start_acq_dt': '2023-06-01', 'stop_acq_dt': '2024-06-01', 'n_images_per_burst': 3}
+
+    df_expected = get_rtc_s1_metadata_from_acq_group(['15RXN'], [63], backend=FakeSearchBackend(df_rtc_ts), **kwargs)
+    with search_backend(ParquetDatasetBackend(tmp_path / 'catalog')):
+        df_rtc = get_rtc_s1_metadata_from_acq_group(['15RXN'], [63], **kwargs)
+    assert not df_rtc.empty
+    assert_frame_equal(df_rtc, df_expected)
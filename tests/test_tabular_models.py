@@ -0,0 +1,138 @@
+import concurrent.futures
+from pathlib import Path
+
+import geopandas as gpd
+import pytest
+from pandas.testing import assert_frame_equal
+from pandera.errors import SchemaError
+from pytest_mock import MockerFixture
+
+from dist_s1_enumerator.dist_enum import enumerate_dist_s1_products, enumerate_dist_s1_products_from_requests
+from dist_s1_enumerator.tabular_models import (
+    dist_s1_input_schema,
+    get_validation_mode,
+    rtc_s1_schema,
+    set_validation_mode,
+    validate_df,
+    validation_mode,
+)
+
+
+def read_rtc_s1_ts() -> gpd.GeoDataFrame:
+    parquet_path = Path(__file__).parent / 'data' / 'rtc_s1_ts_metadata' / 'mgrs15RXN__track63.parquet'
+    df_rtc_ts = gpd.read_parquet(parquet_path)
+    return df_rtc_ts.drop_duplicates(subset=['opera_id']).reset_index(drop=True)
+
+
+@pytest.mark.parametrize('mode', ['full', 'schema', 'sample', 'off'])
+def test_enumerate_dist_s1_products_with_validation_modes(mode: str) -> None:
+    df_rtc_ts = read_rtc_s1_ts()
+    df_products_expected = enumerate_dist_s1_products(df_rtc_ts, ['15RXN'], tqdm_enabled=False)
+
+    with validation_mode(mode):
+        assert get_validation_mode() == mode
+        df_products = enumerate_dist_s1_products(df_rtc_ts.copy(), ['15RXN'], tqdm_enabled=False)
+    assert get_validation_mode() == 'full'
+
+    assert_frame_equal(df_products, df_products_expected)
+
+
+def test_validation_modes_checks() -> None:
+    df_rtc_ts = read_rtc_s1_ts()
+
+    # Null value: only caught by the modes checking the rows
+    df_bad_rows = df_rtc_ts.copy()
+    df_bad_rows.loc[0, 'url_copol'] = None
+    with pytest.raises(SchemaError):
+        validate_df(df_bad_rows, rtc_s1_schema)
+    with validation_mode('schema'):
+        validate_df(df_bad_rows, rtc_s1_schema)
+    with validation_mode('off'):
+        validate_df(df_bad_rows, rtc_s1_schema)
+
+    # The sample covers all the rows of a small frame
+    with validation_mode('sample'), pytest.raises(SchemaError):
+        validate_df(df_bad_rows.head(100), rtc_s1_schema)
+
+    # Missing column: caught by all the modes except 'off'
+    df_missing_column = df_rtc_ts.drop(columns=['track_number'])
+    for mode in ['full', 'schema', 'sample']:
+        with validation_mode(mode), pytest.raises(SchemaError):
+            validate_df(df_missing_column, rtc_s1_schema)
+    with validation_mode('off'):
+        validate_df(df_missing_column, rtc_s1_schema)
+
+    with pytest.raises(ValueError, match='Invalid validation mode'):
+        set_validation_mode('partial')
+    with pytest.raises(ValueError, match='Invalid validation mode'), validation_mode('partial'):
+        pass
+
+
+def test_library_frames_are_not_revalidated(mocker: MockerFixture) -> None:
+    df_rtc_ts = read_rtc_s1_ts()
+    df_products = enumerate_dist_s1_products(df_rtc_ts, ['15RXN'], tqdm_enabled=False)
+
+    spy_rtc = mocker.spy(rtc_s1_schema, 'validate')
+    spy_input = mocker.spy(dist_s1_input_schema, 'validate')
+
+    with validation_mode('schema'):
+        # The enumerated products satisfy dist_s1_input_schema and so rtc_s1_schema
+        assert validate_df(df_products, dist_s1_input_schema) is df_products
+        assert validate_df(df_products, rtc_s1_schema) is df_products
+        assert spy_rtc.call_count == 0
+        assert spy_input.call_count == 0
+
+        # A modified copy is validated again
+        df_products_copy = df_products.copy()
+        validate_df(df_products_copy, rtc_s1_schema)
+        assert spy_rtc.call_count == 1
+
+        # Enumerating again skips the validation of the (already validated) input
+        enumerate_dist_s1_products(df_rtc_ts, ['15RXN'], tqdm_enabled=False)
+        assert spy_rtc.call_count == 1
+
+
+def test_full_validation_catches_frames_modified_in_place() -> None:
+    df_rtc_ts = read_rtc_s1_ts()
+    df_products = enumerate_dist_s1_products(df_rtc_ts, ['15RXN'], tqdm_enabled=False)
+    df_products.loc[0, 'url_copol'] = None
+
+    with pytest.raises(SchemaError):
+        validate_df(df_products, rtc_s1_schema)
+    with validation_mode('schema'):
+        assert validate_df(df_products, rtc_s1_schema) is df_products
+
+
+def test_validated_frames_are_released() -> None:
+    from dist_s1_enumerator import tabular_models
+
+    df = read_rtc_s1_ts()
+    validate_df(df, rtc_s1_schema)
+    assert id(df) in tabular_models._validated_frames
+    df_id = id(df)
+    del df
+    assert df_id not in tabular_models._validated_frames
+
+
+def test_validation_mode_in_worker_threads(mocker: MockerFixture) -> None:
+    # The process-wide mode applies to threads, which start from an empty context
+    set_validation_mode('schema')
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(get_validation_mode).result() == 'schema'
+    finally:
+        set_validation_mode('full')
+    assert get_validation_mode() == 'full'
+
+    # The mode of a `validation_mode` block applies to the searches the library makes from worker threads
+    modes = []
+
+    def search(*args: object, **kwargs: object) -> gpd.GeoDataFrame:
+        modes.append(get_validation_mode())
+        raise ValueError('No data')
+
+    mocker.patch('dist_s1_enumerator.asf.get_rtc_s1_resp_from_acq_group', side_effect=search)
+    product_requests = [('15RXN', 63, '2024-03-15'), ('11SLT', 64, '2024-11-22')]
+    with validation_mode('off'), pytest.warns(UserWarning, match='Skipping product request'):
+        enumerate_dist_s1_products_from_requests(product_requests, errors='warn', tqdm_enabled=False)
+    assert modes == ['off', 'off']